@@ -0,0 +1,142 @@
+"""
+gunicorn settings for snapsapi (loaded automatically from the working directory, or with `-c gunicorn.conf.py`).
+
+GUNICORN_PROFILE selects the worker model:
+- sync: one request per process. Simple, but a worker is blocked for the whole duration of
+  outgoing calls (FCM pushes, OAuth token exchange).
+- gthread (default): a few processes with a thread pool each. Threads release the GIL while
+  waiting on the network or the database, so I/O-bound requests overlap. No extra dependencies.
+- gevent: cooperative greenlets, many concurrent requests per process. Requires the `gevent`
+  extra (`poetry install -E gevent`): `gevent`, and `psycogreen` so psycopg2 yields while
+  waiting on PostgreSQL.
+- uvicorn: an asyncio event loop per process serving the ASGI application
+  (snapsapi.config.asgi:application). The async views under /async/ wait on the database and
+  the network without holding a thread; sync views still run in a thread pool. Requires the
+  `uvicorn` extra (`poetry install -E uvicorn`).
+
+The application is picked from the profile (`wsgi_app`), so start gunicorn without a positional
+app: `gunicorn -c gunicorn.conf.py`. An app given on the command line overrides it.
+
+Every value below can be overridden with its GUNICORN_* environment variable.
+Compare the profiles with `python -m snapsapi.benchmarks.loadtest` (see README).
+"""
+import multiprocessing
+import os
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def env_bool(name, default):
+    return os.getenv(name, str(default)).lower() == 'true'
+
+
+cpu_count = multiprocessing.cpu_count()
+
+PROFILES = {
+    'sync': {
+        'worker_class': 'sync',
+        'app': 'snapsapi.config.wsgi:application',
+        'workers': 2 * cpu_count + 1,
+        'threads': 1,
+        'preload_app': True,
+        'persistent_connections': True,
+    },
+    'gthread': {
+        'worker_class': 'gthread',
+        'app': 'snapsapi.config.wsgi:application',
+        'workers': cpu_count + 1,
+        'threads': 8,
+        'preload_app': True,
+        'persistent_connections': True,
+    },
+    'gevent': {
+        'worker_class': 'gevent',
+        'app': 'snapsapi.config.wsgi:application',
+        'workers': cpu_count,
+        'threads': 1,
+        # gevent patches the standard library when the worker starts; modules imported before that
+        # (by preloading the app in the master) would keep blocking sockets and locks.
+        'preload_app': False,
+        'persistent_connections': False,
+    },
+    'uvicorn': {
+        'worker_class': 'uvicorn.workers.UvicornWorker',
+        'app': 'snapsapi.config.asgi:application',
+        'workers': cpu_count,
+        'threads': 1,
+        'preload_app': True,
+        'persistent_connections': False,
+    },
+}
+
+profile_name = os.getenv('GUNICORN_PROFILE', 'gthread')
+if profile_name not in PROFILES:
+    raise RuntimeError(f'Unknown GUNICORN_PROFILE {profile_name!r}; expected one of {", ".join(PROFILES)}.')
+profile = PROFILES[profile_name]
+
+# Django keeps a connection per thread. Greenlets and the threads of ASGI requests do not outlive the
+# request, so persistent connections would pile up; they are closed after each request instead
+# (put pgbouncer in front of PostgreSQL to pool them).
+if not profile['persistent_connections']:
+    os.environ.setdefault('SNAPSAPI_DB_CONN_MAX_AGE', '0')
+
+wsgi_app = profile['app']
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8080')
+worker_class = profile['worker_class']
+workers = env_int('GUNICORN_WORKERS', profile['workers'])
+threads = env_int('GUNICORN_THREADS', profile['threads'])
+# Concurrent greenlets per gevent worker.
+worker_connections = env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+# Development only (docker-compose.yml): restart workers when the code changes.
+reload = env_bool('GUNICORN_RELOAD', False)
+# A preloaded app is imported once by the master, so reloaded workers would keep serving the old code.
+preload_app = env_bool('GUNICORN_PRELOAD', profile['preload_app']) and not reload
+
+# Requests slower than this are killed and logged; outgoing calls have shorter timeouts of their own.
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# nginx keeps upstream connections open for a few seconds between requests.
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# Recycle workers periodically to bound memory growth; the jitter keeps them from restarting together.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+# Heartbeat files in memory; a disk-backed /tmp in containers can stall workers.
+worker_tmp_dir = os.getenv('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+forwarded_allow_ips = os.getenv('GUNICORN_FORWARDED_ALLOW_IPS', '*')
+# An empty GUNICORN_ACCESSLOG disables the access log.
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+
+def on_starting(server):
+    # Metric files of a previous run would otherwise be summed into the new one.
+    directory = os.getenv('SNAPSAPI_METRICS_MULTIPROCESS_DIR')
+    if directory:
+        from snapsapi.apps.core.metrics import clear_multiprocess_dir
+        os.makedirs(directory, exist_ok=True)
+        clear_multiprocess_dir(directory)
+    server.log.info(f'Using the {profile_name} profile: {workers} workers x {threads} threads ({worker_class}).')
+
+
+def child_exit(server, worker):
+    # Fold the exited worker's metric file before a new worker can reuse its PID and overwrite it.
+    directory = os.getenv('SNAPSAPI_METRICS_MULTIPROCESS_DIR')
+    if directory:
+        from snapsapi.apps.core.metrics import fold_exited_processes
+        fold_exited_processes(directory)
+
+
+def post_fork(server, worker):
+    if worker_class != 'gevent':
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning('psycogreen is not installed; database queries will block the gevent worker.')
+    else:
+        patch_psycopg()
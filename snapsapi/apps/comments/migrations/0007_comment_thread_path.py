@@ -0,0 +1,98 @@
+# Generated by Django 4.2.16 on 2026-10-17 18:12
+
+from datetime import datetime, timedelta, UTC
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+# Same values as snapsapi.apps.comments.model_mixins
+PATH_SEGMENT_LENGTH = 16
+MAX_THREAD_DEPTH = 255 // PATH_SEGMENT_LENGTH - 1
+
+
+def build_path_segment(created_at, uid):
+    # Same format as snapsapi.apps.comments.model_mixins.build_path_segment
+    micros = (created_at - EPOCH) // timedelta(microseconds=1)
+    return f'{micros:013x}{uid.hex[:3]}'
+
+
+def backfill_thread_positions(apps, schema_editor):
+    """
+    Fills root/depth/path level by level: top-level comments first, then the replies whose
+    parent already has a path. Rows are read and written in batches of BATCH_SIZE.
+    Replies below MAX_THREAD_DEPTH, which no longer fit in `path`, are re-parented to the deepest
+    ancestor that may still have replies, as the API would have required.
+    """
+    Comment = apps.get_model('comments', 'Comment')
+
+    top_level = Comment.objects.filter(parent__isnull=True, path='').only('pk', 'created_at')
+    batch = []
+    for comment in top_level.iterator(chunk_size=BATCH_SIZE):
+        comment.root_id = comment.pk
+        comment.depth = 0
+        comment.path = build_path_segment(comment.created_at, comment.pk)
+        batch.append(comment)
+        if len(batch) >= BATCH_SIZE:
+            Comment.objects.bulk_update(batch, ['root', 'depth', 'path'])
+            batch = []
+    if batch:
+        Comment.objects.bulk_update(batch, ['root', 'depth', 'path'])
+
+    while True:
+        replies = list(
+            Comment.objects.filter(path='', parent__isnull=False).exclude(parent__path='')
+            .select_related('parent')
+            .only('pk', 'created_at', 'parent', 'parent__root', 'parent__parent', 'parent__depth', 'parent__path')
+            [:BATCH_SIZE]
+        )
+        if not replies:
+            break
+        for reply in replies:
+            parent = reply.parent
+            segment = build_path_segment(reply.created_at, reply.pk)
+            reply.root_id = parent.root_id
+            if parent.depth >= MAX_THREAD_DEPTH:
+                # The parent was placed (and clamped) already, so its own parent is at MAX_THREAD_DEPTH - 1.
+                reply.parent_id = parent.parent_id
+                reply.depth = MAX_THREAD_DEPTH
+                reply.path = parent.path[:MAX_THREAD_DEPTH * PATH_SEGMENT_LENGTH] + segment
+            else:
+                reply.depth = parent.depth + 1
+                reply.path = parent.path + segment
+        Comment.objects.bulk_update(replies, ['root', 'parent', 'depth', 'path'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0006_comment_deleted_at_comment_is_deleted_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, help_text='최상위 댓글 기준 깊이 (최상위 댓글은 0)'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, help_text='스레드 내 materialized path. 정렬하면 스레드 렌더링 순서가 됩니다.', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='root',
+            field=models.ForeignKey(blank=True, help_text='스레드의 최상위 댓글 (최상위 댓글은 자기 자신)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread', to='comments.comment'),
+        ),
+        migrations.RunPython(backfill_thread_positions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'root', 'created_at'], name='comment_post_root_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['root', 'path'], name='comment_root_path_idx'),
+        ),
+    ]
@@ -3,10 +3,27 @@ from django.db import models
 
 class CommentManager(models.Manager):
     def create_comment(self, user, post, content, parent=None):
-        comment = self.create(
+        """
+        Creates a comment and places it in its thread (root, depth, path).
+        :param user: Author
+        :param post: Post being commented on
+        :param content: Comment body
+        :param parent: Parent comment when this is a reply
+        """
+        comment = self.model(
             user=user,
             post=post,
             content=content,
             parent=parent
         )
+        comment.assign_thread_position()
+        comment.save(force_insert=True)
         return comment
+
+    def get_thread(self, root):
+        """
+        Returns a whole thread in rendering order (pre-order, oldest sibling first)
+        with one range query on the (root, path) index.
+        :param root: Top-level comment of the thread
+        """
+        return self.filter(root_id=root.pk, is_deleted=False).order_by('path')
@@ -1,18 +1,62 @@
 from typing import TYPE_CHECKING
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
+
+from django.db.models import QuerySet
 
 if TYPE_CHECKING:
     from snapsapi.apps.comments.models import Comment  # Avoiding Circular References
 
+# Each path segment is the creation time in epoch microseconds as 13 hex digits
+# (enough until 2112) followed by 3 hex digits of the uid as a tie-breaker.
+PATH_SEGMENT_LENGTH = 16
+PATH_UPPER_BOUND_CHAR = 'g'  # Sorts after every hex digit.
+# Deepest depth whose path still fits in Comment.path (max_length=255).
+MAX_THREAD_DEPTH = 255 // PATH_SEGMENT_LENGTH - 1
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def build_path_segment(created_at: datetime, uid) -> str:
+    micros = (created_at - EPOCH) // timedelta(microseconds=1)
+    return f'{micros:013x}{uid.hex[:3]}'
 
 
 class CommentMixin:
+    def assign_thread_position(self: 'Comment') -> None:
+        """
+        Sets root, depth and path from the parent comment.
+        Top-level comments are their own root.
+        """
+        created_at = self.created_at or datetime.now(UTC)
+        segment = build_path_segment(created_at, self.uid)
+        if self.parent_id is None:
+            self.root_id = self.pk
+            self.depth = 0
+            self.path = segment
+        else:
+            parent = self.parent
+            self.root_id = parent.root_id
+            self.depth = parent.depth + 1
+            self.path = parent.path + segment
+
+    def get_descendants(self: 'Comment') -> QuerySet:
+        """
+        Returns every comment below this one (excluding itself) with a single range scan
+        on the (root, path) index, ordered for thread rendering.
+        """
+        from snapsapi.apps.comments.models import Comment
+        return Comment.objects.filter(
+            root_id=self.root_id,
+            path__gt=self.path,
+            path__lt=self.path + PATH_UPPER_BOUND_CHAR,
+        ).order_by('path')
+
     def soft_delete(self: 'Comment') -> None:
         """
-        Soft-deletes the post.
+        Soft-deletes the comment together with its whole subtree.
 
         This method sets the is_deleted flag to True, records the deletion
-        timestamp, and saves the changes to the database.
+        timestamp, and saves the changes to the database. Live descendants are
+        marked deleted with one UPDATE, and the post's comments_count is adjusted for them.
         """
         if self.is_deleted:
             # Todo: error must raised, already deleted.
@@ -21,3 +65,10 @@ class CommentMixin:
         self.is_deleted = True
         self.deleted_at = datetime.now(UTC)
         self.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
+
+        deleted_descendants = self.get_descendants().filter(is_deleted=False) \
+            .update(is_deleted=True, deleted_at=self.deleted_at, updated_at=self.deleted_at)
+        if deleted_descendants:
+            from snapsapi.apps.core.counters import get_counter_service
+            from snapsapi.apps.posts.models import Post
+            get_counter_service().decr(Post, self.post_id, 'comments_count', deleted_descendants)
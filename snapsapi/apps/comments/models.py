@@ -19,6 +19,11 @@ class Comment(models.Model, mx.CommentMixin):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     content = models.TextField(max_length=255)
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    root = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='thread',
+                             help_text="스레드의 최상위 댓글 (최상위 댓글은 자기 자신)")
+    depth = models.PositiveSmallIntegerField(default=0, help_text="최상위 댓글 기준 깊이 (최상위 댓글은 0)")
+    path = models.CharField(max_length=255, blank=True, default='', editable=False,
+                            help_text="스레드 내 materialized path. 정렬하면 스레드 렌더링 순서가 됩니다.")
     likes_count = models.PositiveIntegerField(default=0)
     is_deleted = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -29,6 +34,10 @@ class Comment(models.Model, mx.CommentMixin):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['post', 'root', 'created_at'], name='comment_post_root_created_idx'),
+            models.Index(fields=['root', 'path'], name='comment_root_path_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.content[:20]}"
@@ -1,21 +1,57 @@
-from rest_framework import serializers
-from snapsapi.apps.posts.models import Post
-from snapsapi.apps.comments.models import Comment
-from snapsapi.apps.users.serializers import UserSerializer
+from urllib.parse import urlencode
 
+from django.urls import reverse
 from rest_framework import serializers
 
 from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.comments.model_mixins import MAX_THREAD_DEPTH
+from snapsapi.apps.comments.tree import COMMENT_TREE_CONTEXT_KEY, CommentTreeLoader, get_comment_tree
 from snapsapi.apps.posts.models import Post
+from snapsapi.apps.posts.viewer_state import VIEWER_STATE_CONTEXT_KEY, ViewerStateResolver
+from snapsapi.apps.users.serializers import UserSerializer
+
+
+def resolve_comment_tree(serializer: serializers.BaseSerializer, comments) -> None:
+    """
+    Loads the reply tree below the given comments once and stores it in the serializer
+    context, together with the viewer's follow state for every author in the tree.
+    """
+    tree = get_comment_tree(serializer.context)
+    if tree is not None and all(tree.covers(comment) for comment in comments):
+        return
+    tree = CommentTreeLoader().load(comments)
+    serializer.context[COMMENT_TREE_CONTEXT_KEY] = tree
+
+    request = serializer.context.get('request')
+    if request and request.user.is_authenticated:
+        authors = [comment.user for comment in comments]
+        authors += [child.user for children in tree.children.values() for child in children]
+        serializer.context[VIEWER_STATE_CONTEXT_KEY] = ViewerStateResolver(request.user).resolve_users(authors)
+
+
+class CommentReadListSerializer(serializers.ListSerializer):
+    """
+    List serializer for CommentReadSerializer.
+    Loads the replies of the whole page in one query instead of recursing per node.
+    """
+
+    def to_representation(self, data):
+        comments = list(data.all() if hasattr(data, 'all') else data)
+        resolve_comment_tree(self, comments)
+        return super().to_representation(comments)
 
 
 class CommentReadSerializer(serializers.ModelSerializer):
     """
     Serializer for retrieving comments (GET).
-    Includes author information and replies (nested comments).
+    Includes author information and replies (nested comments) up to COMMENT_TREE_MAX_DEPTH,
+    with at most COMMENT_TREE_REPLIES_PER_NODE replies per comment.
+    `replies_next` links to the reply endpoint when more replies exist than are embedded.
     """
     user = UserSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
+    replies_count = serializers.SerializerMethodField()
+    replies_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -26,16 +62,38 @@ class CommentReadSerializer(serializers.ModelSerializer):
             'created_at',
             'parent',
             'replies',
+            'replies_count',
+            'replies_next',
         ]
         read_only_fields = fields
+        list_serializer_class = CommentReadListSerializer
 
-    def get_replies(self, instance):
+    def to_representation(self, instance):
+        if self.parent is None:
+            resolve_comment_tree(self, [instance])
+        return super().to_representation(instance)
+
+    def get_replies(self, instance) -> list[dict]:
         """
-        Recursively serializes the replies (nested comments).
+        Serializes the replies already loaded in the comment tree.
         """
-        if instance.replies.exists():
-            return CommentReadSerializer(instance.replies.all(), many=True, context=self.context).data
-        return []
+        children = get_comment_tree(self.context).get_children(instance)
+        if not children:
+            return []
+        return CommentReadSerializer(children, many=True, context=self.context).data
+
+    def get_replies_count(self, instance) -> int:
+        return get_comment_tree(self.context).get_replies_count(instance)
+
+    def get_replies_next(self, instance) -> str | None:
+        cursor = get_comment_tree(self.context).get_next_cursor(instance)
+        if cursor is None:
+            return None
+        url = reverse('comments:comment-replies', kwargs={'uid': instance.uid})
+        if cursor:
+            url = f'{url}?{urlencode({"cursor": cursor})}'
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class CommentCreateSerializer(serializers.Serializer):
@@ -62,6 +120,8 @@ class CommentCreateSerializer(serializers.Serializer):
                 data['parent'] = parent_comment  # Add the object to data for use in the create method
             except Comment.DoesNotExist:
                 raise serializers.ValidationError({'parent_uid': 'Parent comment not found or belongs to a different post.'})
+            if parent_comment.depth >= MAX_THREAD_DEPTH:
+                raise serializers.ValidationError({'parent_uid': 'Maximum reply depth reached.'})
         else:
             data['parent'] = None
 
@@ -1,20 +1,29 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 
 from snapsapi.apps.comments.models import Comment
 
 
+@receiver(pre_save, sender=Comment)
+def assign_comment_thread_position(sender, instance, raw, **kwargs):
+    """
+    새 댓글에 스레드 위치(root, depth, path)를 지정합니다.
+    create_comment를 거치지 않고 생성된 댓글(Comment.objects.create 등)도 처리합니다.
+    """
+    if raw or not instance._state.adding or instance.path:
+        return
+    instance.assign_thread_position()
+
+
 @receiver(post_save, sender=Comment)
 def update_comment_count(sender, instance, created, update_fields, **kwargs):
     post = instance.post
-    # updated_fields = update_fields or []
+    updated_fields = update_fields or []
 
     if created:
         post.increment_comments_count()
-    else:
-        post.decrement_comments_count()
-    # elif 'is_deleted' in updated_fields:
-    #     if instance.is_deleted:
-    #         post.decrement_comments_count()
-    #     else:
-    #         post.increment_comments_count()
+    elif 'is_deleted' in updated_fields:
+        if instance.is_deleted:
+            post.decrement_comments_count()
+        else:
+            post.increment_comments_count()
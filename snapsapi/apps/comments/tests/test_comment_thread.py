@@ -0,0 +1,120 @@
+import importlib
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.comments.model_mixins import MAX_THREAD_DEPTH
+from snapsapi.apps.comments.models import Comment
+
+
+@pytest.fixture
+def thread(user1, post1):
+    """
+    c1
+    ├── r1
+    │   └── r1a
+    └── r2
+    """
+    create = Comment.objects.create_comment
+    c1 = create(user=user1, post=post1, content='c1')
+    r1 = create(user=user1, post=post1, content='r1', parent=c1)
+    r1a = create(user=user1, post=post1, content='r1a', parent=r1)
+    r2 = create(user=user1, post=post1, content='r2', parent=c1)
+    return {'c1': c1, 'r1': r1, 'r1a': r1a, 'r2': r2}
+
+
+@pytest.mark.django_db
+class TestCommentThreadPosition:
+    """Tests for root / depth / path on Comment"""
+
+    def test_create_comment_should_assign_thread_position(self, thread):
+        c1, r1, r1a = thread['c1'], thread['r1'], thread['r1a']
+        assert c1.root_id == c1.pk and c1.depth == 0
+        assert r1a.root_id == c1.pk and r1a.depth == 2
+        assert r1a.path.startswith(r1.path) and r1.path.startswith(c1.path)
+
+    def test_objects_create_should_also_assign_position(self, user1, post1, comment1):
+        reply = Comment.objects.create(user=user1, post=post1, content='reply', parent=comment1)
+        assert reply.root_id == comment1.pk
+        assert reply.depth == 1
+        assert reply.path.startswith(comment1.path)
+
+    def test_get_thread_should_return_rendering_order_in_one_query(self, thread):
+        with CaptureQueriesContext(connection) as ctx:
+            contents = [comment.content for comment in Comment.objects.get_thread(thread['c1'])]
+        assert len(ctx.captured_queries) == 1
+        assert contents == ['c1', 'r1', 'r1a', 'r2']
+
+    def test_get_descendants_should_return_the_subtree(self, thread):
+        assert thread['c1'].get_descendants().count() == 3
+        assert [comment.content for comment in thread['r1'].get_descendants()] == ['r1a']
+        assert not thread['r2'].get_descendants().exists()
+
+
+@pytest.mark.django_db
+class TestCommentSubtreeDelete:
+    """Tests for soft-deleting a comment with its replies"""
+
+    def test_soft_delete_should_delete_the_subtree(self, thread, post1):
+        post1.refresh_from_db()
+        assert post1.comments_count == 4
+
+        thread['r1'].soft_delete()
+
+        live = set(Comment.objects.filter(is_deleted=False).values_list('content', flat=True))
+        assert live == {'c1', 'r2'}
+        post1.refresh_from_db()
+        assert post1.comments_count == 2
+
+
+@pytest.mark.django_db
+class TestCommentDepthLimit:
+    """Tests for the maximum reply depth"""
+
+    def test_reply_below_max_depth_should_be_rejected(self, jwt_client, user1, post1):
+        parent = Comment.objects.create_comment(user=user1, post=post1, content='top')
+        for _ in range(MAX_THREAD_DEPTH):
+            parent = Comment.objects.create_comment(user=user1, post=post1, content='reply', parent=parent)
+
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid})
+        res = jwt_client.post(url, {'content': 'too deep', 'parent_uid': str(parent.uid)}, format='json')
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestThreadBackfillMigration:
+    """Tests for the root / depth / path backfill"""
+
+    def test_backfill_should_rebuild_positions(self, thread):
+        expected = {comment.pk: (comment.root_id, comment.depth) for comment in thread.values()}
+        Comment.objects.update(root=None, depth=0, path='')
+
+        migration = importlib.import_module('snapsapi.apps.comments.migrations.0007_comment_thread_path')
+        migration.backfill_thread_positions(apps, None)
+
+        actual = {pk: (root_id, depth) for pk, root_id, depth in Comment.objects.values_list('pk', 'root_id', 'depth')}
+        assert actual == expected
+        contents = [comment.content for comment in Comment.objects.get_thread(thread['c1'])]
+        assert contents == ['c1', 'r1', 'r1a', 'r2']
+
+    def test_backfill_should_clamp_deep_threads(self, user1, post1):
+        comments = [Comment.objects.create(user=user1, post=post1, content='0')]
+        for depth in range(1, MAX_THREAD_DEPTH + 3):
+            comments.append(Comment.objects.create(user=user1, post=post1, content=str(depth), parent=comments[-1]))
+        Comment.objects.update(root=None, depth=0, path='')
+
+        migration = importlib.import_module('snapsapi.apps.comments.migrations.0007_comment_thread_path')
+        migration.backfill_thread_positions(apps, None)
+
+        deepest_parent = comments[MAX_THREAD_DEPTH - 1]
+        for comment in comments[MAX_THREAD_DEPTH:]:
+            comment.refresh_from_db()
+            assert comment.depth == MAX_THREAD_DEPTH
+            assert comment.parent_id == deepest_parent.pk
+            assert len(comment.path) <= Comment._meta.get_field('path').max_length
+        contents = [comment.content for comment in Comment.objects.get_thread(comments[0])]
+        assert contents[:MAX_THREAD_DEPTH] == [str(depth) for depth in range(MAX_THREAD_DEPTH)]
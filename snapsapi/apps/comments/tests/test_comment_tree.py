@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.comments.tree import CommentTreeLoader
+from snapsapi.apps.core.models import Follow
+
+
+def build_thread(post, user, top_level, replies, depth):
+    """Creates `top_level` comments, each with `replies` replies per node down to `depth`."""
+    def add_children(parent, level):
+        if level > depth:
+            return
+        for idx in range(replies):
+            child = Comment.objects.create(user=user, post=post, content=f'{parent.content}.{idx}', parent=parent)
+            add_children(child, level + 1)
+
+    for idx in range(top_level):
+        add_children(Comment.objects.create(user=user, post=post, content=f'c{idx}'), 1)
+
+
+@pytest.mark.django_db
+class TestCommentTreeLoader:
+    """Tests for the non-recursive comment tree loader"""
+
+    def test_load_should_use_a_single_query(self, post1, user1):
+        build_thread(post1, user1, top_level=2, replies=2, depth=3)
+        roots = list(Comment.objects.filter(post=post1, parent__isnull=True))
+
+        with CaptureQueriesContext(connection) as ctx:
+            tree = CommentTreeLoader(max_depth=3, replies_per_node=10).load(roots)
+
+        assert len(ctx.captured_queries) == 1
+        grandchild = tree.get_children(tree.get_children(roots[0])[0])[0]
+        assert tree.depth[grandchild.pk] == 2
+        assert tree.get_replies_count(roots[0]) == 2
+
+    def test_deleted_replies_should_be_skipped(self, post1, user1, comment1):
+        Comment.objects.create(user=user1, post=post1, content='gone', parent=comment1, is_deleted=True)
+        kept = Comment.objects.create(user=user1, post=post1, content='kept', parent=comment1)
+
+        tree = CommentTreeLoader().load([comment1])
+        assert tree.get_children(comment1) == [kept]
+        assert tree.get_replies_count(comment1) == 1
+
+
+@pytest.mark.django_db
+class TestCommentListTree:
+    """Tests for the reply tree in /posts/{uid}/comments/"""
+
+    def test_query_count_should_not_depend_on_tree_size(self, jwt_client, post1, user1, user2):
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid})
+        build_thread(post1, user2, top_level=1, replies=1, depth=1)
+        with CaptureQueriesContext(connection) as small:
+            jwt_client.get(url)
+
+        build_thread(post1, user2, top_level=3, replies=3, depth=3)
+        with CaptureQueriesContext(connection) as large:
+            res = jwt_client.get(url)
+
+        assert len(res.data) == 4
+        assert len(small.captured_queries) == len(large.captured_queries)
+
+    def test_is_following_should_be_resolved_for_reply_authors(self, jwt_client, post1, user1, user2, comment1):
+        Comment.objects.create(user=user2, post=post1, content='reply', parent=comment1)
+        Follow.objects.create(follower=user1, following=user2)
+
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid})
+        reply = jwt_client.get(url).data[0]['replies'][0]
+        assert reply['user']['is_following'] is True
+
+    def test_replies_below_max_depth_should_be_linked(self, settings, api_client, post1, user1, comment1):
+        settings.COMMENT_TREE_MAX_DEPTH = 1
+        reply = Comment.objects.create(user=user1, post=post1, content='reply', parent=comment1)
+        Comment.objects.create(user=user1, post=post1, content='nested', parent=reply)
+
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid})
+        embedded = api_client.get(url).data[0]['replies'][0]
+        assert embedded['replies'] == []
+        assert embedded['replies_count'] == 1
+        assert embedded['replies_next'].endswith(reverse('comments:comment-replies', kwargs={'uid': reply.uid}))
+
+        nested = api_client.get(embedded['replies_next']).json()['results']
+        assert [item['content'] for item in nested] == ['nested']
+
+    def test_more_replies_should_continue_after_the_embedded_ones(self, settings, api_client, post1, user1, comment1):
+        settings.COMMENT_TREE_REPLIES_PER_NODE = 2
+        for idx in range(5):
+            Comment.objects.create(user=user1, post=post1, content=f'reply {idx}', parent=comment1)
+        expected = list(comment1.replies.order_by('-created_at', '-uid').values_list('content', flat=True))
+
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid})
+        top = api_client.get(url).data[0]
+        assert top['replies_count'] == 5
+        seen = [reply['content'] for reply in top['replies']]
+
+        next_url = top['replies_next']
+        while next_url:
+            page = api_client.get(next_url).json()
+            seen.extend(item['content'] for item in page['results'])
+            next_url = page['next']
+
+        assert seen == expected
+
+    def test_replies_next_should_be_null_when_everything_is_embedded(self, api_client, post1, comment1, reply1):
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid})
+        top = api_client.get(url).data[0]
+        assert top['replies_count'] == 1
+        assert top['replies_next'] is None
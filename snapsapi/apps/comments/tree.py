@@ -0,0 +1,121 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models import Count, F, QuerySet, Window
+from django.db.models.functions import RowNumber
+
+from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core.pagination import KeysetCursorPagination, encode_cursor
+
+COMMENT_TREE_CONTEXT_KEY = 'comment_tree'
+
+# Replies are listed newest first, matching Comment.Meta.ordering and the reply endpoint.
+REPLY_ORDERING = ('-created_at', '-pk')
+
+
+@dataclass
+class CommentTree:
+    """
+    In-memory comment tree for a page of top-level comments (or replies).
+    Serializers read children from here instead of querying `comment.replies`.
+    """
+    max_depth: int
+    node_ids: set = field(default_factory=set)
+    depth: dict = field(default_factory=dict)
+    children: dict = field(default_factory=lambda: defaultdict(list))
+    replies_count: dict = field(default_factory=dict)
+
+    def covers(self, comment: Comment) -> bool:
+        return comment.pk in self.node_ids
+
+    def get_children(self, comment: Comment) -> list[Comment]:
+        """Children to embed; empty once the maximum depth is reached."""
+        if self.depth.get(comment.pk, 0) >= self.max_depth:
+            return []
+        return self.children.get(comment.pk, [])
+
+    def get_replies_count(self, comment: Comment) -> int:
+        return self.replies_count.get(comment.pk, 0)
+
+    def get_next_cursor(self, comment: Comment) -> str | None:
+        """
+        Cursor for the reply endpoint that continues after the embedded children.
+        Returns '' when none of the replies are embedded (start from the first page),
+        and None when every reply is already embedded.
+        """
+        shown = self.get_children(comment)
+        if len(shown) >= self.get_replies_count(comment):
+            return None
+        if not shown:
+            return ''
+        position = KeysetCursorPagination.get_position(shown[-1], REPLY_ORDERING)
+        return encode_cursor({'p': position, 'o': list(REPLY_ORDERING), 'r': False})
+
+
+class CommentTreeLoader:
+    """
+    Loads comment threads without recursion:
+    1. The caller fetches the top-level page (one query).
+    2. `load()` fetches the newest `replies_per_node` live replies of every node in the
+       threads on the page (by root id) with a single window-function query, with the total reply count
+       of each parent annotated on the same rows.
+    The tree is then assembled in memory down to `max_depth`.
+    """
+
+    def __init__(self, max_depth: int | None = None, replies_per_node: int | None = None):
+        self.max_depth = settings.COMMENT_TREE_MAX_DEPTH if max_depth is None else max_depth
+        self.replies_per_node = replies_per_node or settings.COMMENT_TREE_REPLIES_PER_NODE
+
+    def get_replies_queryset(self, root_ids: Iterable) -> QuerySet:
+        # Scoped to the threads on the page through the (post, root, created_at) index.
+        return (
+            Comment.objects.filter(root_id__in=root_ids, parent__isnull=False, is_deleted=False)
+            .select_related('user', 'user__profile')
+            .annotate(
+                sibling_rank=Window(
+                    RowNumber(),
+                    partition_by=[F('parent_id')],
+                    order_by=[F('created_at').desc(), F('pk').desc()],
+                ),
+                sibling_count=Window(Count('pk'), partition_by=[F('parent_id')]),
+            )
+            .filter(sibling_rank__lte=self.replies_per_node)
+            .order_by('parent_id', 'sibling_rank')
+        )
+
+    def load(self, roots: Iterable[Comment]) -> CommentTree:
+        """
+        :param roots: Comments at depth 0 (a page of top-level comments or of replies)
+        :return: The tree below the roots
+        """
+        roots = list(roots)
+        tree = CommentTree(max_depth=self.max_depth)
+        tree.node_ids.update(root.pk for root in roots)
+        tree.depth.update((root.pk, 0) for root in roots)
+        if not roots or self.max_depth <= 0:
+            return tree
+
+        by_parent = defaultdict(list)
+        for reply in self.get_replies_queryset({root.root_id for root in roots}):
+            by_parent[reply.parent_id].append(reply)
+            tree.replies_count[reply.parent_id] = reply.sibling_count
+
+        level = roots
+        for depth in range(1, self.max_depth + 1):
+            next_level = []
+            for parent in level:
+                children = by_parent.get(parent.pk, [])
+                tree.children[parent.pk] = children
+                for child in children:
+                    tree.node_ids.add(child.pk)
+                    tree.depth[child.pk] = depth
+                next_level.extend(children)
+            level = next_level
+        return tree
+
+
+def get_comment_tree(context: dict) -> CommentTree | None:
+    """Returns the CommentTree stored in a serializer context, if any."""
+    return context.get(COMMENT_TREE_CONTEXT_KEY)
@@ -10,4 +10,5 @@ urlpatterns += [
     # path('', views.CommentListCreateView.as_view(), name='posts-list-create'),
     path('<uuid:uid>/', views.CommentDetailView.as_view(), name='comments-detail'),
     path('<uuid:uid>/likes/', CommentLikeToggleView.as_view(), name='comment-like-toggle'),
+    path('<uuid:uid>/replies/', views.CommentReplyListView.as_view(), name='comment-replies'),
 ]
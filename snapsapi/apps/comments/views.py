@@ -1,10 +1,13 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import ListAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from snapsapi.apps.notifications.services import FCMService
+from snapsapi.apps.core.pagination import KeysetCursorPagination, OptionalKeysetCursorPagination
+from snapsapi.apps.notifications.models import Notification
+from snapsapi.apps.notifications.services import notify
 from snapsapi.apps.comments.permissions import IsCommentOwner
 from snapsapi.apps.comments.models import Comment
 from snapsapi.apps.comments.serializers import (
@@ -24,17 +27,18 @@ class CommentListCreateView(ListCreateAPIView):
     POST: Creates a new comment on a specific post.
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = OptionalKeysetCursorPagination
+    cursor_ordering = ('-created_at', '-pk')
 
     def get_queryset(self):
         """
         Receives the Post's uid from URL parameter (self.kwargs['uid']),
         and filters only the top-level comments attached to that Post.
+        Replies are loaded for the whole page by CommentReadSerializer (see comments/tree.py).
         """
         post_uid = self.kwargs['uid']
-        # Optimizes DB query performance using select_related and prefetch_related
         return Comment.objects.filter(is_deleted=False, post__uid=post_uid, parent__isnull=True) \
-            .select_related('user', 'user__profile') \
-            .prefetch_related('replies')
+            .select_related('user', 'user__profile')
 
     def get_serializer_class(self):
         """
@@ -81,35 +85,30 @@ class CommentListCreateView(ListCreateAPIView):
 
 
     def send_notification(self, instance):
-        # 알림 발송 등의 추가 작업
-        # 예: FCM 알림 발송
-        try:
-            post_owner = instance.post.user
-            # 댓글 작성자가 게시물 주인이 아닌 경우에만 알림 발송
-            if self.request.user != post_owner:
-                fcm_service = FCMService()
-                fcm_service.send_notifications_to_user(
-                    user_id=post_owner.id,
-                    title="새 댓글 알림",
-                    body=f"{self.request.user.username}님이 회원님의 게시물에 댓글을 남겼습니다.",
-                    data={
-                        # "url": f"/posts/{instance.post.uid}?comment={instance.uid}",
-                        # "url": "/",
-                        "type": "new_comment",
-                        "post_id": str(instance.post.uid),
-                        "comment_id": str(instance.uid)
-                    }
-                )
-        except Exception as e:
-            # 알림 발송 실패가 API 응답에 영향을 주지 않도록 예외 처리
-            print(f"알림 발송 실패: {e}")
+        # 알림함에 저장하고 푸시는 outbox에 기록해 커밋 후 워커가 FCM으로 전송한다 (응답 지연 없음)
+        post_owner = instance.post.user
+        # 댓글 작성자가 게시물 주인이 아닌 경우에만 알림 발송
+        if self.request.user != post_owner:
+            notify(
+                recipient=post_owner,
+                type=Notification.TYPE_NEW_COMMENT,
+                title="새 댓글 알림",
+                body=f"{self.request.user.username}님이 회원님의 게시물에 댓글을 남겼습니다.",
+                actor=self.request.user,
+                data={
+                    "post_id": str(instance.post.uid),
+                    "comment_id": str(instance.uid)
+                },
+                # 인기 게시물에 댓글이 몰리면 "A님 외 N명" 한 건으로 합쳐서 전송
+                coalesce_key=f"new_comment:{instance.post.uid}",
+                summary="{actor}님 외 {others}명이 회원님의 게시물에 댓글을 남겼습니다.",
+            )
 
     def perform_create(self, serializer):
-        # 객체 생성
-        instance = serializer.save()
-
-        # 객체 생성 후 추가 작업 수행
-        self.send_notification(instance)
+        # 댓글과 알림 outbox 행을 같은 트랜잭션에서 기록
+        with transaction.atomic():
+            instance = serializer.save()
+            self.send_notification(instance)
 
         return instance
 
@@ -117,6 +116,30 @@ class CommentListCreateView(ListCreateAPIView):
 
 
 
+class CommentReplyPagination(KeysetCursorPagination):
+    """
+    Replies are always paginated by cursor; `replies_next` links produced by
+    CommentReadSerializer continue right after the embedded replies.
+    """
+    always_use_cursor = True
+
+
+class CommentReplyListView(ListAPIView):
+    """
+    Lists the direct replies of a comment, newest first, each with its own reply subtree.
+    - GET /comments/<uid>/replies/?cursor=...
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    serializer_class = CommentReadSerializer
+    pagination_class = CommentReplyPagination
+    cursor_ordering = ('-created_at', '-pk')
+
+    def get_queryset(self):
+        parent = get_object_or_404(Comment, uid=self.kwargs['uid'], is_deleted=False)
+        return Comment.objects.filter(parent=parent, is_deleted=False) \
+            .select_related('user', 'user__profile')
+
+
 class CommentDetailView(RetrieveUpdateDestroyAPIView):
     queryset = Comment.objects.filter(is_deleted=False)
     permission_classes = [IsAuthenticated, IsCommentOwner]
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'snapsapi.apps.core'
+
+    def ready(self):
+        from snapsapi.apps.core.instrumentation import install_serializer_timing
+        install_serializer_timing()
+        try:
+            import snapsapi.apps.core.signals
+        except ImportError:
+            pass
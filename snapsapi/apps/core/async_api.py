@@ -0,0 +1,109 @@
+"""
+Helpers for native async (`async def`) API views.
+
+DRF views are synchronous: under ASGI Django runs each of them in a worker thread, so a request
+that mostly waits on the database or the network holds a thread for its whole duration.
+The views built with `async_api_view` run on the event loop instead and use the async ORM
+(`aget`, `aget_or_create`, `adelete`, ...). They keep the JSON contract of the DRF views they
+mirror: JWT authentication, `{"detail": ...}` error bodies and the same status codes.
+"""
+import functools
+import json
+from collections.abc import Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+async def aauthenticate(request):
+    """
+    Async counterpart of JWTAuthentication.authenticate().
+    Returns the user of the bearer token, or None when the request carries no token.
+    Raises AuthenticationFailed/InvalidToken for a bad token or an inactive user.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    # Signature and claims are checked in memory; only the user lookup needs the database.
+    validated_token = authentication.get_validated_token(raw_token)
+    return await sync_to_async(authentication.get_user)(validated_token)
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    """Async version of django.shortcuts.get_object_or_404() (added to Django in 5.0)."""
+    if not hasattr(queryset, 'aget'):
+        queryset = queryset._default_manager.all()
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+
+
+def get_request_data(request):
+    """Parses a JSON body like DRF's JSONParser; form-encoded bodies are returned as request.POST."""
+    if request.content_type != 'application/json':
+        return request.POST
+    if not request.body:
+        return {}
+    try:
+        return json.loads(request.body)
+    except ValueError as exc:
+        raise exceptions.ParseError(f'JSON parse error - {exc}')
+
+
+def exception_response(request, exc) -> JsonResponse:
+    """Renders the exceptions handled by DRF's exception_handler() the same way."""
+    if isinstance(exc, Http404):
+        exc = exceptions.NotFound(*exc.args)
+    elif isinstance(exc, PermissionDenied):
+        exc = exceptions.PermissionDenied(*exc.args)
+
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        headers['WWW-Authenticate'] = JWTAuthentication().authenticate_header(request)
+    if getattr(exc, 'wait', None):
+        headers['Retry-After'] = '%d' % exc.wait
+
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    return JsonResponse(data, status=exc.status_code, headers=headers, safe=False)
+
+
+def async_api_view(http_method_names: Iterable[str], authenticated: bool = True):
+    """
+    Decorator for async function views.
+    - rejects other methods with 405
+    - with `authenticated`, sets request.user from the JWT bearer token or responds with 401
+    - renders APIException, Http404 and PermissionDenied as JSON error responses
+    """
+    allowed_methods = [method.upper() for method in http_method_names]
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in allowed_methods:
+                    response = exception_response(request, exceptions.MethodNotAllowed(request.method))
+                    response['Allow'] = ', '.join(allowed_methods)
+                    return response
+                if authenticated:
+                    user = await aauthenticate(request)
+                    if user is None:
+                        raise exceptions.NotAuthenticated()
+                    request.user = user
+                return await view(request, *args, **kwargs)
+            except (exceptions.APIException, Http404, PermissionDenied) as exc:
+                return exception_response(request, exc)
+
+        # Django 4.2's csrf_exempt() wraps the view in a sync function, so the flag is set directly.
+        # Like the DRF views, these views only accept bearer tokens, which browsers never send on their own.
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
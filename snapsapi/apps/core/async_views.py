@@ -0,0 +1,12 @@
+from django.http import JsonResponse
+
+from snapsapi.apps.core.async_api import async_api_view
+
+
+@async_api_view(['GET'], authenticated=False)
+async def health_check(request):
+    """
+    /async/core/health/ 헬스체크 엔드포인트 (이벤트 루프에서 처리)
+    status: ok JSON 반환
+    """
+    return JsonResponse({"status": "ok"})
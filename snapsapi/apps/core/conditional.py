@@ -0,0 +1,73 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    HTTP conditional GET (ETag / Last-Modified) for retrieve views.
+
+    The view describes the current state of the object with cheap validators instead of
+    serializing it: `get_etag_components` returns the values the representation depends on
+    (timestamps, counters, viewer flags), `get_last_modified` optionally returns a timestamp
+    that covers every change of the representation. A matching `If-None-Match` (or, when no
+    ETag is sent, a matching `If-Modified-Since`) is answered with 304 Not Modified and no body.
+
+    Anonymous responses are marked `public` with a short `s-maxage`, so the nginx proxy cache
+    can store them and revalidate them with conditional requests. Responses for authenticated
+    users contain viewer flags and are `private`.
+    """
+    conditional_shared_max_age = None
+
+    def get_etag_components(self, instance) -> Iterable[Any]:
+        raise NotImplementedError('Views using ConditionalGetMixin must implement get_etag_components().')
+
+    def get_last_modified(self, instance) -> datetime | None:
+        return None
+
+    def get_etag(self, instance) -> str:
+        digest = hashlib.blake2b(repr(tuple(self.get_etag_components(instance))).encode(), digest_size=16)
+        # Weak: the body is semantically the same for equal validators, not byte-for-byte.
+        return f'W/"{digest.hexdigest()}"'
+
+    def is_not_modified(self, request, etag: str, last_modified: datetime | None) -> bool:
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # Weak comparison (RFC 9110 13.1.2).
+            tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+            return '*' in tags or etag.removeprefix('W/') in tags
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        if if_modified_since is not None and last_modified is not None:
+            return int(last_modified.timestamp()) <= if_modified_since
+        return False
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self.get_etag(instance)
+        last_modified = self.get_last_modified(instance)
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            get_serializer = getattr(self, 'get_read_serializer', self.get_serializer)
+            response = Response(get_serializer(instance).data)
+        self.set_validator_headers(request, response, etag, last_modified)
+        return response
+
+    def set_validator_headers(self, request, response, etag: str, last_modified: datetime | None) -> None:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            shared_max_age = self.conditional_shared_max_age
+            if shared_max_age is None:
+                shared_max_age = settings.CONDITIONAL_GET_SHARED_MAX_AGE
+            patch_cache_control(response, public=True, max_age=0, s_maxage=shared_max_age)
+        patch_vary_headers(response, ('Authorization',))
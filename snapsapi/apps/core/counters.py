@@ -0,0 +1,319 @@
+import atexit
+import contextlib
+import logging
+import threading
+import zlib
+from collections import defaultdict
+from typing import Iterable
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+from django.db.models.functions import Greatest
+from django.utils.module_loading import import_string
+
+from snapsapi.utils.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE = 'snapsapi.apps.core.counters.InMemoryCounterStore'
+
+# Denormalized counter columns managed by the counter service.
+COUNTED_FIELDS = {
+    'posts.post': ('likes_count', 'comments_count'),
+    'comments.comment': ('likes_count',),
+    'users.user': ('posts_count', 'followers_count', 'following_count', 'unread_notifications_count'),
+}
+
+_service_cache = {}
+
+
+def make_key(model: type[models.Model], pk, field: str) -> str:
+    """Builds the store key `<app_label>.<model_name>:<pk>:<field>`."""
+    label = model._meta.label_lower
+    if field not in COUNTED_FIELDS.get(label, ()):
+        raise ValueError(f'{label}.{field} is not a managed counter.')
+    return f'{label}:{pk}:{field}'
+
+
+def parse_key(key: str) -> tuple[str, str, str]:
+    label, pk, field = key.rsplit(':', 2)
+    return label, pk, field
+
+
+def shard_for(key: str, shards: int) -> int:
+    # crc32 is stable across processes, unlike hash().
+    return zlib.crc32(key.encode()) % shards
+
+
+class BaseCounterStore:
+    """
+    Buffer of pending counter deltas.
+
+    `drain()` moves the pending deltas into an in-flight batch and returns it; the batch stays
+    visible to `get_many()` until `complete()` is called after the database write, so reads do not
+    dip while a flush is running. If a flush fails, the in-flight batch is retried by the next drain.
+    """
+    process_local = False
+
+    def incr(self, key: str, delta: int) -> None:
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        """Returns the pending (not yet flushed) delta of each key; keys without deltas are omitted."""
+        raise NotImplementedError
+
+    def drain(self) -> dict[str, int]:
+        raise NotImplementedError
+
+    def complete(self) -> None:
+        raise NotImplementedError
+
+    def flush_lock(self) -> contextlib.AbstractContextManager:
+        """
+        Held by CounterService.flush from drain() to complete(). A process-local store is only
+        flushed by its own process, where the service's thread lock is enough.
+        """
+        return contextlib.nullcontext()
+
+
+class InMemoryCounterStore(BaseCounterStore):
+    """
+    Process-local store split into lock-striped shards, so concurrent requests touching
+    different counters do not contend on a single lock.
+    Each process flushes its own buffer from a background thread (see CounterService).
+    """
+    process_local = True
+
+    def __init__(self, shards: int | None = None):
+        self.shards = shards or settings.COUNTERS_SHARDS
+        self._locks = [threading.Lock() for _ in range(self.shards)]
+        self._pending: list[dict[str, int]] = [defaultdict(int) for _ in range(self.shards)]
+        self._inflight: dict[str, int] = defaultdict(int)
+        self._inflight_lock = threading.Lock()
+
+    def incr(self, key, delta):
+        idx = shard_for(key, self.shards)
+        with self._locks[idx]:
+            self._pending[idx][key] += delta
+
+    def get_many(self, keys):
+        result = {}
+        for key in keys:
+            idx = shard_for(key, self.shards)
+            with self._locks[idx]:
+                delta = self._pending[idx].get(key, 0)
+            with self._inflight_lock:
+                delta += self._inflight.get(key, 0)
+            if delta:
+                result[key] = delta
+        return result
+
+    def drain(self):
+        with self._inflight_lock:
+            for idx in range(self.shards):
+                with self._locks[idx]:
+                    pending, self._pending[idx] = self._pending[idx], defaultdict(int)
+                for key, delta in pending.items():
+                    self._inflight[key] += delta
+            return {key: delta for key, delta in self._inflight.items() if delta}
+
+    def complete(self):
+        with self._inflight_lock:
+            self._inflight.clear()
+
+
+class RedisCounterStore(BaseCounterStore):
+    """
+    Redis store: deltas are HINCRBY'd into `counters:pending:<shard>` hashes, so every web
+    process shares one buffer and a single `flush_counters` worker can drain it.
+    Draining RENAMEs each shard to `counters:flushing:<shard>`, which is atomic with respect
+    to concurrent HINCRBYs. The flushing hashes are shared by every flushing process
+    (`flush_counters`, `reconcile_counters`), so a flush holds the `counters:flush-lock` Redis lock
+    (SET NX PX) until the batch is completed; otherwise two processes would apply the same batch.
+    """
+    pending_key = 'counters:pending:{}'
+    flushing_key = 'counters:flushing:{}'
+    lock_key = 'counters:flush-lock'
+
+    def __init__(self, shards: int | None = None, url: str | None = None):
+        self.shards = shards or settings.COUNTERS_SHARDS
+        self.client = get_redis_client(url or settings.COUNTERS_REDIS_URL)
+
+    def incr(self, key, delta):
+        self.client.hincrby(self.pending_key.format(shard_for(key, self.shards)), key, delta)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            idx = shard_for(key, self.shards)
+            pipe.hget(self.pending_key.format(idx), key)
+            pipe.hget(self.flushing_key.format(idx), key)
+        values = pipe.execute()
+        result = {}
+        for idx, key in enumerate(keys):
+            delta = int(values[idx * 2] or 0) + int(values[idx * 2 + 1] or 0)
+            if delta:
+                result[key] = delta
+        return result
+
+    def drain(self):
+        import redis
+
+        batch = defaultdict(int)
+        for idx in range(self.shards):
+            pending, flushing = self.pending_key.format(idx), self.flushing_key.format(idx)
+            try:
+                # A leftover flushing hash means the previous flush failed; retry it first.
+                self.client.renamenx(pending, flushing)
+            except redis.ResponseError:
+                pass  # Nothing pending in this shard.
+            for key, delta in self.client.hgetall(flushing).items():
+                batch[key.decode() if isinstance(key, bytes) else key] += int(delta)
+        return {key: delta for key, delta in batch.items() if delta}
+
+    def complete(self):
+        self.client.delete(*[self.flushing_key.format(idx) for idx in range(self.shards)])
+
+    def flush_lock(self):
+        # Expires after COUNTERS_FLUSH_LOCK_TIMEOUT if the flushing process dies; a process that
+        # cannot get it within that time raises redis.exceptions.LockError.
+        timeout = settings.COUNTERS_FLUSH_LOCK_TIMEOUT
+        return self.client.lock(self.lock_key, timeout=timeout, blocking_timeout=timeout)
+
+
+class CounterService:
+    """
+    Entry point for the denormalized counters (likes, comments, posts, follows).
+
+    - Write-through (default): `incr` runs `UPDATE ... SET x = GREATEST(x + delta, 0)` immediately,
+      inside the caller's transaction.
+    - Write-behind (`COUNTERS_WRITE_BEHIND = True`): `incr` buffers the delta in the store once the
+      transaction commits, and `flush` applies all buffered deltas in batches, one UPDATE per
+      (model, field, delta) group. Hot rows are then updated once per flush instead of once per
+      request. Read paths call `value`/`overlay` to add the pending deltas to the stored values.
+    """
+
+    def __init__(self, store: BaseCounterStore):
+        self.store = store
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+
+    @property
+    def write_behind(self) -> bool:
+        return settings.COUNTERS_WRITE_BEHIND
+
+    def incr(self, model: type[models.Model], pk, field: str, delta: int = 1) -> None:
+        """
+        Adds `delta` to a counter column.
+        :param model: Model class owning the counter
+        :param pk: Primary key of the row
+        :param field: Counter field name (see COUNTED_FIELDS)
+        :param delta: Amount to add (negative to subtract)
+        """
+        key = make_key(model, pk, field)
+        if not self.write_behind:
+            model._default_manager.filter(pk=pk).update(**{field: Greatest(models.F(field) + delta, 0)})
+            return
+        # Only count what was actually committed.
+        transaction.on_commit(lambda: self.store.incr(key, delta))
+        self.ensure_flusher()
+
+    def decr(self, model: type[models.Model], pk, field: str, delta: int = 1) -> None:
+        self.incr(model, pk, field, -delta)
+
+    def pending(self, instances: Iterable[models.Model], fields: Iterable[str]) -> dict[tuple, int]:
+        """
+        Returns the pending deltas as {(pk, field): delta} for the given instances.
+        """
+        if not self.write_behind:
+            return {}
+        keys = {}
+        for instance in instances:
+            for field in fields:
+                keys[make_key(type(instance), instance.pk, field)] = (instance.pk, field)
+        if not keys:
+            return {}
+        return {keys[key]: delta for key, delta in self.store.get_many(keys).items()}
+
+    def overlay(self, instances: Iterable[models.Model], fields: Iterable[str]) -> None:
+        """
+        Adds pending deltas to the counter attributes of already-loaded instances,
+        using a single store round-trip for the whole batch.
+        """
+        instances = [instance for instance in instances if not getattr(instance, '_counters_overlaid', False)]
+        by_pk = defaultdict(list)
+        for instance in instances:
+            by_pk[instance.pk].append(instance)
+            instance._counters_overlaid = True
+        for (pk, field), delta in self.pending(instances, tuple(fields)).items():
+            for instance in by_pk[pk]:
+                setattr(instance, field, max(getattr(instance, field) + delta, 0))
+
+    def value(self, instance: models.Model, field: str) -> int:
+        """Returns the stored value of a counter plus its pending delta."""
+        delta = self.pending([instance], [field]).get((instance.pk, field), 0)
+        return max(getattr(instance, field) + delta, 0)
+
+    def flush(self) -> int:
+        """
+        Applies all buffered deltas to the database.
+        :return: Number of counters written
+        """
+        with self._flush_lock, self.store.flush_lock():
+            batch = self.store.drain()
+            if not batch:
+                return 0
+
+            groups = defaultdict(list)
+            for key, delta in batch.items():
+                label, pk, field = parse_key(key)
+                groups[(label, field, delta)].append(pk)
+
+            with transaction.atomic():
+                for (label, field, delta), pks in groups.items():
+                    model = apps.get_model(label)
+                    model._default_manager.filter(pk__in=pks).update(
+                        **{field: Greatest(models.F(field) + delta, 0)}
+                    )
+            self.store.complete()
+            return len(batch)
+
+    def ensure_flusher(self) -> None:
+        """
+        Starts a daemon thread that flushes a process-local store every COUNTERS_FLUSH_INTERVAL seconds.
+        Shared stores (Redis) are flushed by the `flush_counters` management command instead.
+        """
+        if not self.store.process_local or self._flusher is not None or not settings.COUNTERS_FLUSH_INTERVAL:
+            return
+        with self._flush_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_forever, name='counter-flusher', daemon=True)
+            self._flusher.start()
+            # Flush what is left when the worker shuts down gracefully.
+            atexit.register(self._flush_safely)
+
+    def _flush_safely(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Counter flush failed; deltas will be retried.')
+        finally:
+            close_old_connections()
+
+    def _flush_forever(self) -> None:
+        stop = threading.Event()
+        while not stop.wait(settings.COUNTERS_FLUSH_INTERVAL):
+            self._flush_safely()
+
+
+def get_counter_service() -> CounterService:
+    """
+    Returns the shared counter service for the configured store (`settings.COUNTERS_STORE`).
+    """
+    path = getattr(settings, 'COUNTERS_STORE', None) or DEFAULT_STORE
+    if path not in _service_cache:
+        _service_cache[path] = CounterService(import_string(path)())
+    return _service_cache[path]
@@ -0,0 +1,175 @@
+"""
+Read replica routing with read-your-writes stickiness.
+
+ReplicaRoutingMiddleware picks one of DATABASE_REPLICAS for each safe (GET/HEAD/OPTIONS) request and
+ReplicaRouter sends that request's reads there. Writes, reads of unsafe requests and reads outside a
+request (management commands, on_commit callbacks, background threads) use `default`.
+
+A client that has just written must see its own writes, which a lagging replica may not have yet.
+After an unsafe request succeeds its reads are pinned to the primary for REPLICA_PIN_SECONDS, tracked
+by a signed cookie and, for JWT clients that do not keep cookies, by an entry per user in the shared
+REPLICA_PIN_CACHE. Without that cache the reads of JWT clients always go to the primary.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from snapsapi.apps.core import metrics
+
+PIN_COOKIE_SALT = 'snapsapi.replica-pin'
+PIN_CACHE_KEY = 'replica-pin:{user_id}'
+
+# Replica chosen for the reads of the current request; None reads from `default`.
+_read_database: ContextVar[str | None] = ContextVar('snapsapi_read_database', default=None)
+
+
+class ReplicaRouter:
+    """Database router for DATABASE_REPLICAS. Replicas are never written to or migrated."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_database.get()
+        if alias is None:
+            return None
+        # A transaction on the primary must see its own writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def get_read_database() -> str | None:
+    """Replica serving the reads of the current request, or None."""
+    return _read_database.get()
+
+
+def get_token_user_id(request):
+    """
+    User id claim of the bearer token, without verifying the signature: a forged token can only
+    pin its sender to the primary. The view still authenticates the request.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        return UntypedToken(raw_token, verify=False).get(api_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+def get_pin_cache():
+    """Cache holding the pins of JWT clients, or None when no shared cache is configured."""
+    if not settings.REPLICA_PIN_CACHE:
+        return None
+    return caches[settings.REPLICA_PIN_CACHE]
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Chooses where the reads of each request go (see the module docstring) and pins clients to the
+    primary after their writes. Does nothing while DATABASE_REPLICAS is empty.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        user_id = get_token_user_id(request)
+        cache = get_pin_cache()
+        pinned = self.has_pin_cookie(request) or (
+            user_id is not None and (cache is None or cache.get(PIN_CACHE_KEY.format(user_id=user_id)) is not None)
+        )
+        token = _read_database.set(self.choose_database(request, pinned))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_database.reset(token)
+
+        if self.wrote(request, response):
+            self.set_pin_cookie(request, response)
+            if user_id is not None and cache is not None:
+                cache.set(PIN_CACHE_KEY.format(user_id=user_id), 1, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        user_id = get_token_user_id(request)
+        cache = get_pin_cache()
+        pinned = self.has_pin_cookie(request) or (
+            user_id is not None
+            and (cache is None or await cache.aget(PIN_CACHE_KEY.format(user_id=user_id)) is not None)
+        )
+        token = _read_database.set(self.choose_database(request, pinned))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_database.reset(token)
+
+        if self.wrote(request, response):
+            self.set_pin_cookie(request, response)
+            if user_id is not None and cache is not None:
+                await cache.aset(PIN_CACHE_KEY.format(user_id=user_id), 1, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    @staticmethod
+    def choose_database(request, pinned: bool) -> str | None:
+        if request.method not in SAFE_METHODS:
+            decision, alias = 'write', None
+        elif pinned:
+            decision, alias = 'pinned', None
+        else:
+            decision, alias = 'replica', random.choice(settings.DATABASE_REPLICAS)
+        metrics.DB_READ_ROUTING.inc(decision=decision)
+        return alias
+
+    @staticmethod
+    def wrote(request, response) -> bool:
+        return request.method not in SAFE_METHODS and response.status_code < 400
+
+    @staticmethod
+    def has_pin_cookie(request) -> bool:
+        return request.get_signed_cookie(
+            settings.REPLICA_PIN_COOKIE, default=None, salt=PIN_COOKIE_SALT, max_age=settings.REPLICA_PIN_SECONDS,
+        ) is not None
+
+    @staticmethod
+    def set_pin_cookie(request, response) -> None:
+        response.set_signed_cookie(
+            settings.REPLICA_PIN_COOKIE, '1', salt=PIN_COOKIE_SALT, max_age=settings.REPLICA_PIN_SECONDS,
+            secure=request.is_secure(), httponly=True, samesite='Lax',
+        )
@@ -0,0 +1,231 @@
+import functools
+import hashlib
+import heapq
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('snapsapi.instrumentation')
+
+_current_metrics: ContextVar['RequestMetrics | None'] = ContextVar('snapsapi_request_metrics', default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_VALUES_LIST = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """
+    Reduces a statement to its shape: literals and placeholders become `?` and
+    `IN (?, ?, ...)` / multi-row VALUES lists collapse, so the same query with
+    different parameters or page sizes normalizes to the same text.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    sql = _VALUES_LIST.sub(r'\1', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint_sql(sql: str) -> str:
+    """Short stable identifier of the statement shape (see normalize_sql)."""
+    return hashlib.blake2b(normalize_sql(sql).encode(), digest_size=8).hexdigest()
+
+
+@dataclass
+class RequestMetrics:
+    """Measurements of one sampled request."""
+    queries: int = 0
+    db_ms: float = 0.0
+    serializer_ms: float = 0.0
+    statements: list[tuple[float, str]] = field(default_factory=list)
+    serializing: bool = False
+
+    def record_query(self, sql: str, duration_ms: float) -> None:
+        self.queries += 1
+        self.db_ms += duration_ms
+        self.statements.append((duration_ms, sql))
+
+    def slowest(self, limit: int) -> list[dict[str, Any]]:
+        return [
+            {'fingerprint': fingerprint_sql(sql), 'ms': round(duration_ms, 2), 'sql': normalize_sql(sql)[:300]}
+            for duration_ms, sql in heapq.nlargest(limit, self.statements, key=lambda statement: statement[0])
+        ]
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Fingerprints executed at least `threshold` times; usually an N+1."""
+        counts = Counter(fingerprint_sql(sql) for _, sql in self.statements)
+        return {fingerprint: count for fingerprint, count in counts.most_common() if count >= threshold}
+
+
+class QueryRecorder:
+    """Database execute wrapper (connection.execute_wrapper) that times every statement."""
+
+    def __init__(self, metrics: RequestMetrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.record_query(sql, (time.perf_counter() - started) * 1000)
+
+
+def get_current_metrics() -> RequestMetrics | None:
+    """Metrics of the request being handled, or None when it is not sampled."""
+    return _current_metrics.get()
+
+
+def _timed_data(prop: property) -> property:
+    fget = prop.fget
+
+    def data(self):
+        metrics = _current_metrics.get()
+        # 중첩된 serializer의 .data 호출은 바깥 serializer 시간에 이미 포함된다.
+        if metrics is None or metrics.serializing:
+            return fget(self)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            metrics.serializer_ms += (time.perf_counter() - started) * 1000
+            metrics.serializing = False
+
+    data._instrumented = True
+    return property(data)
+
+
+def install_serializer_timing() -> None:
+    """
+    Times `serializer.data` of sampled requests. Serialization happens inside the views
+    (DRF evaluates lazy querysets while serializing), so this is the only place it can be
+    separated from the rest of the view. Called once from CoreConfig.ready().
+    """
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, '_instrumented', False):
+            cls.data = _timed_data(cls.data)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Records, for a sample of requests (INSTRUMENTATION_SAMPLE_RATE), the number of queries,
+    the total database time, the slowest and most repeated statements (by fingerprint),
+    the time spent in serializers and the response size.
+
+    The measurements are written as one JSON line to the `snapsapi.instrumentation` logger
+    and, with INSTRUMENTATION_SERVER_TIMING, returned in a `Server-Timing` header.
+    Requests that are not sampled only pay for one random() call.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def is_sampled() -> bool:
+        rate = settings.INSTRUMENTATION_SAMPLE_RATE
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    @staticmethod
+    def install_recorder(stack: ExitStack, metrics: RequestMetrics) -> None:
+        recorder = QueryRecorder(metrics)
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                self.install_recorder(stack, metrics)
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self.finish(request, response, metrics, (time.perf_counter() - started) * 1000)
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                # Connections are per thread: the async ORM runs the request's queries in its
+                # thread-sensitive executor, so the wrappers are installed (and removed) there.
+                await sync_to_async(self.install_recorder)(stack, metrics)
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    await sync_to_async(stack.close)()
+        finally:
+            _current_metrics.reset(token)
+        # The log record may load a session user lazily.
+        return await sync_to_async(self.finish)(request, response, metrics, (time.perf_counter() - started) * 1000)
+
+    def finish(self, request, response, metrics: RequestMetrics, total_ms: float):
+        if settings.INSTRUMENTATION_SERVER_TIMING:
+            response['Server-Timing'] = self.build_server_timing(metrics, total_ms)
+        logger.info(json.dumps(self.build_log_record(request, response, metrics, total_ms), default=str))
+        return response
+
+    @staticmethod
+    def build_server_timing(metrics: RequestMetrics, total_ms: float) -> str:
+        return ', '.join([
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries"',
+            f'serialize;dur={metrics.serializer_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+    @staticmethod
+    def build_log_record(request, response, metrics: RequestMetrics, total_ms: float) -> dict[str, Any]:
+        match = getattr(request, 'resolver_match', None)
+        user = getattr(request, 'user', None)
+        return {
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            # 경로 파라미터가 없는 route로 엔드포인트별 집계가 가능하다.
+            'route': match.route if match else None,
+            'status': response.status_code,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'duration_ms': round(total_ms, 2),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_ms, 2),
+            'serializer_ms': round(metrics.serializer_ms, 2),
+            'response_bytes': None if response.streaming else len(response.content),
+            'slow_queries': metrics.slowest(settings.INSTRUMENTATION_SLOW_QUERIES),
+            'repeated_queries': metrics.repeated(settings.INSTRUMENTATION_REPEATED_QUERY_THRESHOLD),
+        }
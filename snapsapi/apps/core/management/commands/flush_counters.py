@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from snapsapi.apps.core.counters import get_counter_service
+
+
+class Command(BaseCommand):
+    help = 'Applies buffered counter deltas (likes, comments, posts, follows) to the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Keep running and flush every N seconds. Flushes once when omitted.')
+
+    def handle(self, *args, **options):
+        service = get_counter_service()
+        interval = options['interval']
+        while True:
+            flushed = service.flush()
+            if options['verbosity'] > 1 or not interval:
+                self.stdout.write(self.style.SUCCESS(f'Flushed {flushed} counters.'))
+            if not interval:
+                return
+            time.sleep(interval)
@@ -0,0 +1,520 @@
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE = 'snapsapi.apps.core.metrics.InMemoryMetricsStore'
+# Latency buckets in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# DirectoryMetricsStore: counters and histograms of exited processes, folded into one file.
+EXITED_FILE = 'exited.json'
+
+_store_cache = {}
+
+
+def get_metrics_store() -> 'BaseMetricsStore':
+    """Returns the shared metrics store for the configured class (`settings.METRICS_STORE`)."""
+    path = getattr(settings, 'METRICS_STORE', None) or DEFAULT_STORE
+    if path not in _store_cache:
+        _store_cache[path] = import_string(path)()
+    return _store_cache[path]
+
+
+def make_key(name: str, labels: tuple[str, ...]) -> str:
+    return json.dumps([name, *labels])
+
+
+def parse_key(key: str) -> tuple[str, tuple[str, ...]]:
+    name, *labels = json.loads(key)
+    return name, tuple(labels)
+
+
+class BaseMetricsStore:
+    """
+    Holds the current values of all metrics.
+
+    A snapshot is {'counters': {key: value}, 'gauges': {key: value},
+    'histograms': {key: [bucket counts..., +Inf count, sum]}} with keys from make_key().
+    """
+
+    def inc(self, kind: str, key: str, amount: float) -> None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: float) -> None:
+        raise NotImplementedError
+
+    def observe(self, key: str, buckets: tuple[float, ...], value: float) -> None:
+        raise NotImplementedError
+
+    def collect(self) -> dict[str, dict]:
+        """Returns the snapshot served by the metrics endpoint."""
+        raise NotImplementedError
+
+
+class InMemoryMetricsStore(BaseMetricsStore):
+    """
+    Process-local store. Enough for a single process (runserver, one worker);
+    under several gunicorn workers every scrape would only see the worker that answered it,
+    use DirectoryMetricsStore there.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = defaultdict(float)
+        self._histograms: dict[str, list[float]] = {}
+
+    def _check_fork(self):
+        # gunicorn --preload: 마스터에서 기록된 값이 워커마다 복사되어 중복 집계되지 않도록 한다.
+        if os.getpid() != self._pid:
+            self._reset()
+            self.after_fork()
+
+    def after_fork(self) -> None:
+        pass
+
+    def inc(self, kind, key, amount):
+        self._check_fork()
+        with self._lock:
+            (self._counters if kind == 'counter' else self._gauges)[key] += amount
+
+    def set(self, key, value):
+        self._check_fork()
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, key, buckets, value):
+        self._check_fork()
+        with self._lock:
+            values = self._histograms.get(key)
+            if values is None:
+                values = self._histograms[key] = [0.0] * (len(buckets) + 2)
+            for idx, bound in enumerate(buckets):
+                if value <= bound:
+                    values[idx] += 1
+                    break
+            else:
+                values[len(buckets)] += 1
+            values[-1] += value
+
+    def snapshot(self) -> dict[str, dict]:
+        self._check_fork()
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'histograms': {key: list(values) for key, values in self._histograms.items()},
+            }
+
+    def collect(self):
+        return self.snapshot()
+
+
+class DirectoryMetricsStore(InMemoryMetricsStore):
+    """
+    Multi-process store for gunicorn workers.
+
+    Each process keeps its values in memory and a background thread writes them to
+    `<METRICS_MULTIPROCESS_DIR>/<pid>.json` every METRICS_FLUSH_INTERVAL seconds (and at exit).
+    A scrape, answered by any worker, writes its own file first and sums the files of all
+    processes. The counters and histograms of exited workers are folded into EXITED_FILE and
+    their files deleted (see fold_exited_processes), so totals never go back and the directory
+    does not grow as workers are recycled; their gauges are dropped.
+
+    The directory must be emptied when the server starts (see clear_multiprocess_dir).
+    """
+
+    def __init__(self, directory: str | None = None, interval: float | None = None):
+        self.directory = directory or settings.METRICS_MULTIPROCESS_DIR
+        self.interval = interval if interval is not None else settings.METRICS_FLUSH_INTERVAL
+        if not self.directory:
+            raise ValueError('DirectoryMetricsStore requires METRICS_MULTIPROCESS_DIR.')
+        os.makedirs(self.directory, exist_ok=True)
+        self._writer = None
+        super().__init__()
+
+    def after_fork(self):
+        self._writer = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f'{os.getpid()}.json')
+
+    def inc(self, kind, key, amount):
+        super().inc(kind, key, amount)
+        self.ensure_writer()
+
+    def set(self, key, value):
+        super().set(key, value)
+        self.ensure_writer()
+
+    def observe(self, key, buckets, value):
+        super().observe(key, buckets, value)
+        self.ensure_writer()
+
+    def write(self) -> None:
+        """Atomically replaces this process's file with its current values."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, self.path)
+
+    def ensure_writer(self) -> None:
+        if self._writer is not None or not self.interval:
+            return
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._write_forever, name='metrics-writer', daemon=True)
+            self._writer.start()
+        atexit.register(self._write_safely)
+
+    def _write_safely(self) -> None:
+        try:
+            self.write()
+        except OSError:
+            logger.exception('Writing metrics failed.')
+
+    def _write_forever(self) -> None:
+        stop = threading.Event()
+        while not stop.wait(self.interval):
+            self._write_safely()
+
+    def collect(self):
+        self.write()
+        with lock_directory(self.directory):
+            _fold_exited_processes(self.directory)
+            merged = {'counters': defaultdict(float), 'gauges': defaultdict(float), 'histograms': {}}
+            for path, snapshot in read_snapshots(self.directory):
+                merge_snapshot(merged, snapshot, gauges=os.path.basename(path) != EXITED_FILE)
+        return merged
+
+
+def read_snapshots(directory: str) -> Iterable[tuple[str, dict]]:
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue  # Being replaced or truncated; the next scrape reads it.
+        yield path, snapshot
+
+
+def merge_snapshot(merged: dict, snapshot: dict, gauges: bool = True) -> None:
+    for key, value in snapshot['counters'].items():
+        merged['counters'][key] += value
+    if gauges:
+        for key, value in snapshot['gauges'].items():
+            merged['gauges'][key] += value
+    for key, values in snapshot['histograms'].items():
+        current = merged['histograms'].get(key)
+        merged['histograms'][key] = values if current is None else [a + b for a, b in zip(current, values)]
+
+
+@contextmanager
+def lock_directory(directory: str):
+    """Exclusive lock on a metrics directory, held while its files are folded or summed."""
+    with open(os.path.join(directory, '.lock'), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def fold_exited_processes(directory: str | None = None) -> None:
+    """
+    Adds the counters and histograms of exited processes to EXITED_FILE and deletes their files.
+    Called by the gunicorn master when a worker exits (`child_exit`), before its PID can be
+    reused by a new worker that would overwrite the file, and on every scrape.
+    """
+    directory = directory or settings.METRICS_MULTIPROCESS_DIR
+    with lock_directory(directory):
+        _fold_exited_processes(directory)
+
+
+def _fold_exited_processes(directory: str) -> None:
+    exited_path = os.path.join(directory, EXITED_FILE)
+    exited = {'counters': defaultdict(float), 'gauges': {}, 'histograms': {}}
+    folded = []
+    for path, snapshot in read_snapshots(directory):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if path == exited_path:
+            merge_snapshot(exited, snapshot, gauges=False)
+        elif name.isdigit() and not is_alive(int(name)):
+            merge_snapshot(exited, snapshot, gauges=False)
+            folded.append(path)
+    if not folded:
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(exited, f)
+    os.replace(tmp_path, exited_path)
+    for path in folded:
+        os.remove(path)
+
+
+def is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def clear_multiprocess_dir(directory: str | None = None) -> None:
+    """
+    Removes the files of a previous server run. Call it once in the server master
+    before workers are started (gunicorn `on_starting`).
+    """
+    directory = directory or settings.METRICS_MULTIPROCESS_DIR
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+
+
+class Metric:
+    """A metric family. Values are kept in the configured store, one entry per label set."""
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def key(self, labels: dict[str, Any]) -> str:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}.')
+        return make_key(self.name, tuple(str(labels[name]) for name in self.labelnames))
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError('Counters can only increase.')
+        get_metrics_store().inc('counter', self.key(labels), amount)
+
+
+class Gauge(Metric):
+    """Gauges of several processes are summed (only live processes are included)."""
+    type = 'gauge'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        get_metrics_store().inc('gauge', self.key(labels), amount)
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        get_metrics_store().inc('gauge', self.key(labels), -amount)
+
+    def set(self, value: float, **labels) -> None:
+        get_metrics_store().set(self.key(labels), value)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        get_metrics_store().observe(self.key(labels), self.buckets, value)
+
+    def time(self, **labels) -> 'Timer':
+        return Timer(self, labels)
+
+
+class Timer:
+    def __init__(self, histogram: Histogram, labels: dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f'Metric {metric.name} is already registered.')
+        self.metrics[metric.name] = metric
+
+    def render(self, snapshot: dict[str, dict] | None = None) -> str:
+        """Renders the store in the Prometheus text exposition format (version 0.0.4)."""
+        snapshot = snapshot if snapshot is not None else get_metrics_store().collect()
+        samples = defaultdict(list)
+        for kind in ('counters', 'gauges', 'histograms'):
+            for key, value in snapshot[kind].items():
+                name, labels = parse_key(key)
+                samples[name].append((labels, value))
+
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f'# HELP {name} {escape_help(metric.documentation)}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for labels, value in sorted(samples.get(name, ())):
+                pairs = list(zip(metric.labelnames, labels))
+                if metric.type != 'histogram':
+                    lines.append(f'{name}{format_labels(pairs)} {format_value(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip((*metric.buckets, math.inf), value):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{format_labels(pairs + [("le", format_value(bound))])} '
+                                 f'{format_value(cumulative)}')
+                lines.append(f'{name}_sum{format_labels(pairs)} {format_value(value[-1])}')
+                lines.append(f'{name}_count{format_labels(pairs)} {format_value(cumulative)}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_help(text: str) -> str:
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def format_labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = Registry()
+
+# HTTP (MetricsMiddleware). `route` is the URL name (namespace:name) of the matched pattern.
+HTTP_REQUEST_DURATION = Histogram(
+    'snapsapi_http_request_duration_seconds', 'Request latency by URL name.', ['route', 'method'],
+)
+HTTP_REQUESTS = Counter(
+    'snapsapi_http_requests_total', 'Requests by URL name and status code.', ['route', 'method', 'status'],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    'snapsapi_http_requests_in_progress', 'Requests being handled (each holds at most one DB connection).',
+)
+
+# Database and caches
+DB_CONNECTIONS_CREATED = Counter(
+    'snapsapi_db_connections_created_total', 'New database connections opened.', ['alias'],
+)
+DB_CONNECTIONS_REUSED = Counter(
+    'snapsapi_db_connections_reused_total', 'Requests that started with an open persistent connection.', ['alias'],
+)
+DB_CONNECTIONS_CLOSED = Counter(
+    'snapsapi_db_connections_closed_total',
+    'Connections closed at the end of a request (not persistent, CONN_MAX_AGE reached or unusable).', ['alias'],
+)
+DB_READ_ROUTING = Counter(
+    'snapsapi_db_read_routing_total',
+    'Requests by where their reads went: replica, pinned (primary after a recent write) or write.', ['decision'],
+)
+DB_CONNECTION_REQUESTS = Histogram(
+    'snapsapi_db_connection_requests', 'Requests served by a connection before it was closed.', ['alias'],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+CACHE_REQUESTS = Counter(
+    'snapsapi_cache_requests_total', 'Cache lookups by cache and result (hit/miss).', ['cache', 'result'],
+)
+
+
+
+def record_cache_lookups(cache: str, hits: int, misses: int) -> None:
+    if hits:
+        CACHE_REQUESTS.inc(hits, cache=cache, result='hit')
+    if misses:
+        CACHE_REQUESTS.inc(misses, cache=cache, result='miss')
+
+
+# Domain events, counted once the transaction commits (see core/signals.py).
+LIKES = Counter('snapsapi_likes_total', 'Likes created or removed.', ['target', 'action'])
+FOLLOWS = Counter('snapsapi_follows_total', 'Follows created or removed.', ['action'])
+COMMENTS = Counter('snapsapi_comments_total', 'Comments created.', ['kind'])
+PUSH_MESSAGES = Counter('snapsapi_push_messages_total', 'FCM messages by outcome.', ['result'])
+
+
+class MetricsMiddleware:
+    """
+    Records the latency and status of every request per URL name.
+    Requests that do not match a URL pattern are grouped under route="unmatched".
+    Runs natively in both the WSGI and the ASGI handler.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.record(request, status, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.record(request, status, time.perf_counter() - started)
+
+    @staticmethod
+    def record(request, status: int, duration: float) -> None:
+        HTTP_REQUESTS_IN_PROGRESS.dec()
+        match = getattr(request, 'resolver_match', None)
+        route = (match.view_name or match.route) if match else 'unmatched'
+        HTTP_REQUEST_DURATION.observe(duration, route=route, method=request.method)
+        HTTP_REQUESTS.inc(route=route, method=request.method, status=status)
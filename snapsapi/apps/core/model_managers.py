@@ -39,6 +39,17 @@ class FollowManager(models.Manager):
         deleted_count, _ = self.filter(follower=follower, following=following).delete()
         return deleted_count
 
+    async def afollow(self, follower: 'User', following: 'User') -> tuple['Follow', bool]:
+        """Async version of follow()."""
+        if follower == following:
+            raise FollowYourselfException()
+        return await self.aget_or_create(follower=follower, following=following)
+
+    async def aunfollow(self, follower: 'User', following: 'User') -> int:
+        """Async version of unfollow()."""
+        deleted_count, _ = await self.filter(follower=follower, following=following).adelete()
+        return deleted_count
+
 
 class CollectionManager(models.Manager):
     def get_queryset(self):
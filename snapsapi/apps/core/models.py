@@ -4,11 +4,12 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from bson.objectid import ObjectId
 import shortuuid
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
 from datetime import datetime, UTC
 
 from snapsapi.apps.core import model_managers as mm
+from snapsapi.apps.core.counters import get_counter_service
 
 
 def generate_short_uuid():
@@ -46,15 +47,10 @@ def increment_follow_counts(sender, instance, created, **kwargs):
     팔로우를 받은 유저(following)의 followers_count를 1씩 증가시킵니다.
     """
     if created:
-        follower = instance.follower
-        following = instance.following
-
-        # F() expression을 사용하여 race condition을 방지합니다.
-        follower.following_count = models.F('following_count') + 1
-        follower.save(update_fields=['following_count'])
-
-        following.followers_count = models.F('followers_count') + 1
-        following.save(update_fields=['followers_count'])
+        # 카운터 서비스가 원자적 UPDATE(또는 write-behind 버퍼링)로 race condition을 방지합니다.
+        counters = get_counter_service()
+        counters.incr(User, instance.follower_id, 'following_count')
+        counters.incr(User, instance.following_id, 'followers_count')
 
 
 @receiver(post_delete, sender=Follow)
@@ -63,15 +59,10 @@ def decrement_follow_counts(sender, instance, **kwargs):
     Follow 객체가 삭제될 때,
     관련된 유저들의 카운트를 1씩 감소시킵니다.
     """
-    follower = instance.follower
-    following = instance.following
-
-    # 0보다 클 때만 감소시키도록 조건을 추가하여 안정성을 높입니다.
-    follower.following_count = models.F('following_count') - 1
-    follower.save(update_fields=['following_count'])
-
-    following.followers_count = models.F('followers_count') - 1
-    following.save(update_fields=['followers_count'])
+    # 카운터는 0 아래로 내려가지 않습니다 (GREATEST(x - 1, 0)).
+    counters = get_counter_service()
+    counters.decr(User, instance.follower_id, 'following_count')
+    counters.decr(User, instance.following_id, 'followers_count')
 
 
 class Collection(models.Model):
@@ -130,3 +121,28 @@ class CollectionMember(models.Model):
 
     def __str__(self):
         return f"{self.user.username} in {self.collection.name}"
+
+
+# --- Signals keeping Collection.updated_at in sync with its posts and members ---
+# Collection.updated_at is the Last-Modified validator of CollectionDetailView.
+
+def touch_collections(collection_ids):
+    Collection.objects.filter(pk__in=collection_ids).update(updated_at=datetime.now(UTC))
+
+
+@receiver(m2m_changed, sender=Collection.posts.through)
+def touch_collection_on_posts_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch_collections([instance.pk])
+    elif action == 'pre_clear':
+        touch_collections(instance.collections.values_list('pk', flat=True))
+    else:
+        touch_collections(pk_set)
+
+
+@receiver(post_save, sender=CollectionMember)
+@receiver(post_delete, sender=CollectionMember)
+def touch_collection_on_member_change(sender, instance, **kwargs):
+    touch_collections([instance.collection_id])
@@ -1,5 +1,16 @@
-from rest_framework.pagination import PageNumberPagination
+import datetime
+import uuid
+from typing import Any
+
+from django.core import signing
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR_SIGNING_SALT = 'snapsapi.core.pagination.cursor'
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -22,3 +33,281 @@ class StandardResultsSetPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """
+    Encodes a cursor payload into an opaque, signed, URL-safe string.
+    :param payload: JSON-serializable cursor payload
+    :return: The signed cursor string
+    """
+    return signing.dumps(payload, salt=CURSOR_SIGNING_SALT, compress=True)
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Decodes a cursor created by encode_cursor.
+    :param cursor: The signed cursor string
+    :return: The cursor payload
+    :raises NotFound: If the cursor was tampered with or is malformed.
+    """
+    try:
+        payload = signing.loads(cursor, salt=CURSOR_SIGNING_SALT)
+    except signing.BadSignature:
+        raise NotFound('Invalid cursor.')
+    if not isinstance(payload, dict):
+        raise NotFound('Invalid cursor.')
+    return payload
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Returns the planner's row estimate for the queryset instead of running COUNT(*).
+    On PostgreSQL this reads the 'Plan Rows' of EXPLAIN, which is computed from the
+    table statistics. Other databases fall back to an exact count.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset (seek) pagination keyed on `(created_at, pk)` by default.
+
+    Pages are located with a `WHERE (created_at, pk) < (...)` predicate on the ordering
+    columns, so deep pages cost the same as the first page and no COUNT(*) is needed.
+    Cursors are opaque and signed, so clients cannot forge arbitrary positions.
+
+    The cursor mode is used when the request carries a `cursor` or `pagination=cursor`
+    query parameter (or always, if `always_use_cursor` is set). Otherwise the request is
+    handed to `fallback_pagination_class`, which keeps existing page-number clients
+    working; with no fallback the list is returned unpaginated.
+
+    Views may override the keyset with a `cursor_ordering` attribute. The last
+    field must be unique (usually 'pk') so positions are unambiguous.
+
+    The optional `count` query parameter selects how the total is reported:
+    - `none` (default): no count is computed.
+    - `estimated`: the PostgreSQL planner estimate (see estimate_count).
+    - `exact`: a regular COUNT(*).
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+    ordering = ('-created_at', '-pk')
+    fallback_pagination_class = StandardResultsSetPagination
+    always_use_cursor = False
+
+    count_modes = ('none', 'estimated', 'exact')
+    default_count_mode = 'none'
+
+    def __init__(self):
+        self.fallback = None
+        self.request = None
+        self.count = None
+        self.current_ordering = self.ordering
+        self.next_position = None
+        self.previous_position = None
+
+    def use_cursor(self, request) -> bool:
+        if self.always_use_cursor:
+            return True
+        params = request.query_params
+        return self.cursor_query_param in params or params.get(self.mode_query_param) == 'cursor'
+
+    def get_ordering(self, view) -> tuple[str, ...]:
+        return tuple(getattr(view, 'cursor_ordering', None) or self.ordering)
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_count_mode(self, request) -> str:
+        mode = request.query_params.get(self.count_query_param, self.default_count_mode)
+        return mode if mode in self.count_modes else self.default_count_mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if not self.use_cursor(request):
+            if self.fallback_pagination_class is None:
+                return None
+            self.fallback = self.fallback_pagination_class()
+            return self.fallback.paginate_queryset(queryset, request, view=view)
+
+        ordering = self.current_ordering = self.get_ordering(view)
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_position(request, queryset, ordering)
+
+        count_mode = self.get_count_mode(request)
+        if count_mode == 'estimated':
+            self.count = estimate_count(queryset)
+        elif count_mode == 'exact':
+            self.count = queryset.count()
+
+        seek_ordering = self.reverse_ordering(ordering) if reverse else ordering
+        queryset = queryset.order_by(*seek_ordering)
+        if position is not None:
+            queryset = queryset.filter(self.build_keyset_filter(seek_ordering, position))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_position = self.get_position(rows[-1], ordering) if rows and has_next else None
+        self.previous_position = self.get_position(rows[0], ordering) if rows and has_previous else None
+        return rows
+
+    def decode_position(self, request, queryset, ordering) -> tuple[list[Any] | None, bool]:
+        """
+        :return: A tuple of (position values or None, whether the cursor points backwards)
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+
+        payload = decode_cursor(cursor)
+        values = payload.get('p')
+        if payload.get('o') != list(ordering) or not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound('Invalid cursor.')
+
+        meta = queryset.model._meta
+        position = []
+        for name, value in zip(ordering, values):
+            field_name = name.lstrip('-')
+            field = meta.pk if field_name == 'pk' else meta.get_field(field_name)
+            try:
+                position.append(field.to_python(value))
+            except Exception:
+                raise NotFound('Invalid cursor.')
+        return position, payload.get('r', False)
+
+    @staticmethod
+    def reverse_ordering(ordering) -> tuple[str, ...]:
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+    @staticmethod
+    def build_keyset_filter(ordering, position) -> Q:
+        """
+        Builds the row-value comparison `(f1, f2, ...) > (v1, v2, ...)` in the direction
+        of each ordering field, expanded into an OR of prefix equalities.
+        """
+        keyset_filter = Q()
+        for idx, name in enumerate(ordering):
+            field_name = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            clause = Q(**{f'{field_name}__{lookup}': position[idx]})
+            for prev_name, prev_value in zip(ordering[:idx], position[:idx]):
+                clause &= Q(**{prev_name.lstrip('-'): prev_value})
+            keyset_filter |= clause
+        return keyset_filter
+
+    @staticmethod
+    def get_position(instance, ordering) -> list[Any]:
+        position = []
+        for name in ordering:
+            value = getattr(instance, name.lstrip('-'))
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            elif isinstance(value, uuid.UUID):
+                value = str(value)
+            position.append(value)
+        return position
+
+    def build_link(self, position, reverse: bool) -> str | None:
+        if position is None:
+            return None
+        cursor = encode_cursor({'p': position, 'o': list(self.current_ordering), 'r': reverse})
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self.build_link(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        return self.build_link(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True, 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque cursor returned in the next/previous links.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "Set to 'cursor' to request the first page in cursor mode.",
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'How to compute the total count in cursor mode.',
+                'schema': {'type': 'string', 'enum': list(self.count_modes)},
+            },
+        ]
+        if self.fallback_pagination_class is not None:
+            parameters += self.fallback_pagination_class().get_schema_operation_parameters(view)
+        else:
+            parameters.append({
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            })
+        return parameters
+
+
+class OptionalKeysetCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for endpoints that historically returned the full list.
+    Without a cursor the list stays unpaginated, so existing clients are unaffected.
+    """
+    fallback_pagination_class = None
@@ -0,0 +1,243 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router, transaction
+from django.db.models import Count, Q
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10000
+DRIFT_SAMPLE_SIZE = 20
+
+
+@dataclass(frozen=True)
+class CounterSpec:
+    """
+    Describes a denormalized counter: `target.field` must equal the number of `source`
+    rows (matching `condition`) whose `source_fk` points at the target row.
+    """
+    name: str
+    target: str
+    field: str
+    source: str
+    source_fk: str
+    condition: Q = field(default_factory=Q)
+
+    @property
+    def target_model(self):
+        return apps.get_model(self.target)
+
+    @property
+    def source_model(self):
+        return apps.get_model(self.source)
+
+
+COUNTERS = (
+    CounterSpec('post.likes_count', 'posts.Post', 'likes_count', 'likes.PostLike', 'post'),
+    CounterSpec('post.comments_count', 'posts.Post', 'comments_count', 'comments.Comment', 'post',
+                Q(is_deleted=False)),
+    CounterSpec('comment.likes_count', 'comments.Comment', 'likes_count', 'likes.CommentLike', 'comment'),
+    CounterSpec('user.posts_count', 'users.User', 'posts_count', 'posts.Post', 'user', Q(is_deleted=False)),
+    CounterSpec('user.followers_count', 'users.User', 'followers_count', 'core.Follow', 'following'),
+    CounterSpec('user.following_count', 'users.User', 'following_count', 'core.Follow', 'follower'),
+    CounterSpec('user.unread_notifications_count', 'users.User', 'unread_notifications_count',
+                'notifications.Notification', 'recipient', Q(is_read=False)),
+)
+COUNTERS_BY_NAME = {spec.name: spec for spec in COUNTERS}
+
+
+@dataclass
+class CounterDrift:
+    """Drift found (and fixed, unless dry-run) for one counter."""
+    counter: str
+    rows_checked: int = 0
+    rows_drifted: int = 0
+    total_drift: int = 0
+    chunks: int = 0
+    samples: list[dict[str, Any]] = field(default_factory=list)
+
+    def add(self, rows: list[tuple[Any, int, int]]) -> None:
+        self.rows_drifted += len(rows)
+        for pk, stored, actual in rows:
+            self.total_drift += abs(actual - stored)
+            if len(self.samples) < DRIFT_SAMPLE_SIZE:
+                self.samples.append({'pk': pk, 'stored': stored, 'actual': actual})
+
+
+@dataclass
+class ReconciliationReport:
+    dry_run: bool
+    counters: list[CounterDrift] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def rows_drifted(self) -> int:
+        return sum(drift.rows_drifted for drift in self.counters)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'dry_run': self.dry_run,
+            'duration': round(self.duration, 3),
+            'rows_drifted': self.rows_drifted,
+            'counters': [drift.__dict__ for drift in self.counters],
+        }
+
+
+class CounterReconciler:
+    """
+    Recomputes denormalized counters with set-based SQL.
+
+    For each counter and each primary-key range (`chunk_size` rows) of the target table:
+    1. One SELECT joins the target rows to a grouped `COUNT(*)` of the source rows and returns
+       only the rows whose stored value differs (the drift report).
+    2. One `UPDATE target SET field = d.actual FROM (<same query>) AS d WHERE target.pk = d.pk`
+       fixes them in a single statement.
+    Work per statement is bounded by `chunk_size`, so locks are short-lived on large tables.
+    Both PostgreSQL and SQLite (3.33+) support `UPDATE ... FROM`.
+
+    Buffered write-behind deltas are flushed before the repair. A process-local store only holds
+    the deltas of this process; those of the web workers would be applied on top of the recomputed
+    values, so repairs are refused in that mode (dry runs still report).
+    """
+
+    def __init__(self, counters: Iterable[str] | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 dry_run: bool = False, pks: Iterable[Any] | None = None, using: str | None = None):
+        """
+        :param counters: Counter names to reconcile (see COUNTERS); all of them by default
+        :param chunk_size: Width of each primary-key range
+        :param dry_run: Only report drift, do not write
+        :param pks: Restrict the target rows to these primary keys (e.g. an admin selection)
+        :param using: Database alias; the write database of each counter's table by default
+        """
+        names = list(counters) if counters else [spec.name for spec in COUNTERS]
+        unknown = set(names) - set(COUNTERS_BY_NAME)
+        if unknown:
+            raise ValueError(f"Unknown counters: {', '.join(sorted(unknown))}")
+        self.specs = [COUNTERS_BY_NAME[name] for name in names]
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.pks = sorted(set(pks)) if pks is not None else None
+        self.using = using
+
+    def get_database(self, spec: CounterSpec) -> str:
+        return self.using or router.db_for_write(spec.target_model)
+
+    def run(self) -> ReconciliationReport:
+        from snapsapi.apps.core.counters import get_counter_service
+
+        started = time.monotonic()
+        report = ReconciliationReport(dry_run=self.dry_run)
+        if not self.dry_run:
+            service = get_counter_service()
+            if service.write_behind and service.store.process_local:
+                raise ImproperlyConfigured(
+                    'Counters cannot be repaired with a process-local write-behind store: the deltas buffered '
+                    'by other processes would be counted twice. Use write-through or RedisCounterStore.'
+                )
+            # Buffered deltas would be double-counted after the repair, so apply them first.
+            service.flush()
+        for spec in self.specs:
+            report.counters.append(self.reconcile(spec))
+        report.duration = time.monotonic() - started
+        return report
+
+    def iter_chunks(self, spec: CounterSpec) -> Iterable[Q]:
+        pk_name = spec.target_model._meta.pk.name
+        if self.pks is not None:
+            for idx in range(0, len(self.pks), self.chunk_size):
+                yield Q(**{f'{pk_name}__in': self.pks[idx:idx + self.chunk_size]})
+            return
+        # Walk the primary-key index: each boundary is the chunk_size-th pk after the previous one.
+        # This works for integer and UUID keys alike and keeps chunks full on sparse ids.
+        rows = spec.target_model._base_manager.using(self.get_database(spec))
+        pks = rows.order_by('pk').values_list('pk', flat=True)
+        lower = None
+        while True:
+            remaining = pks if lower is None else pks.filter(pk__gt=lower)
+            upper = remaining[self.chunk_size - 1:self.chunk_size].first()
+            chunk = Q() if lower is None else Q(**{f'{pk_name}__gt': lower})
+            if upper is None:
+                if lower is None or remaining.exists():
+                    yield chunk
+                return
+            yield chunk & Q(**{f'{pk_name}__lte': upper})
+            lower = upper
+
+    def build_drift_query(self, spec: CounterSpec, chunk: Q) -> tuple[str, list[Any]]:
+        """
+        Builds `SELECT pk, stored, actual` for the drifted rows of one chunk.
+        The grouped source aggregate is generated by the ORM, so conditions stay in Python.
+        """
+        target, source = spec.target_model, spec.source_model
+        db = self.get_database(spec)
+        qn = connections[db].ops.quote_name
+
+        target_sql, target_params = (
+            target._base_manager.filter(chunk).values('pk').query.get_compiler(db).as_sql()
+        )
+        fk_column = source._meta.get_field(spec.source_fk).column
+        source_chunk = Q(**{f'{spec.source_fk}__in': target._base_manager.filter(chunk).values('pk')})
+        counts_sql, counts_params = (
+            source._base_manager.filter(spec.condition & source_chunk)
+            .values(spec.source_fk).order_by().annotate(actual=Count('pk'))
+            .values_list(spec.source_fk, 'actual').query.get_compiler(db).as_sql()
+        )
+        table, pk_column = qn(target._meta.db_table), qn(target._meta.pk.column)
+        column = qn(target._meta.get_field(spec.field).column)
+        sql = (
+            f'SELECT t.{pk_column} AS pk, t.{column} AS stored, COALESCE(c.actual, 0) AS actual '
+            f'FROM {table} t '
+            f'LEFT JOIN ({counts_sql}) c ON c.{qn(fk_column)} = t.{pk_column} '
+            f'WHERE t.{pk_column} IN ({target_sql}) AND t.{column} <> COALESCE(c.actual, 0)'
+        )
+        return sql, [*counts_params, *target_params]
+
+    def reconcile(self, spec: CounterSpec) -> CounterDrift:
+        drift = CounterDrift(counter=spec.name)
+        target = spec.target_model
+        db = self.get_database(spec)
+        connection = connections[db]
+        qn = connection.ops.quote_name
+        table, pk_column = qn(target._meta.db_table), qn(target._meta.pk.column)
+        column = qn(target._meta.get_field(spec.field).column)
+
+        for chunk in self.iter_chunks(spec):
+            drift.chunks += 1
+            drift.rows_checked += target._base_manager.using(db).filter(chunk).count()
+            select_sql, params = self.build_drift_query(spec, chunk)
+            with transaction.atomic(using=db), connection.cursor() as cursor:
+                cursor.execute(select_sql, params)
+                rows = cursor.fetchall()
+                drift.add(rows)
+                if rows and not self.dry_run:
+                    cursor.execute(
+                        f'UPDATE {table} SET {column} = d.actual '
+                        f'FROM ({select_sql}) d WHERE {table}.{pk_column} = d.pk',
+                        params,
+                    )
+
+        if drift.rows_drifted:
+            logger.warning('Counter drift: %s rows=%d total=%d%s', spec.name, drift.rows_drifted,
+                           drift.total_drift, ' (dry-run)' if self.dry_run else '')
+        return drift
+
+
+def reconcile_counters(counters: Iterable[str] | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       dry_run: bool = False, pks: Iterable[Any] | None = None,
+                       using: str | None = None) -> ReconciliationReport:
+    """Shortcut for CounterReconciler(...).run()."""
+    return CounterReconciler(counters, chunk_size=chunk_size, dry_run=dry_run, pks=pks, using=using).run()
+
+
+def run_scheduled_reconciliation() -> dict[str, Any]:
+    """
+    Entry point for schedulers (cron, Celery beat, Kubernetes CronJob, ...).
+    Repairs every counter and logs the drift report.
+    """
+    report = reconcile_counters()
+    logger.info('Counter reconciliation finished: %s', report.as_dict())
+    return report.as_dict()
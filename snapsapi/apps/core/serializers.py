@@ -5,6 +5,7 @@ from rest_framework import serializers
 
 from snapsapi.apps.users.serializers import UserSerializer
 from snapsapi.apps.core.models import Collection, CollectionMember
+from snapsapi.apps.posts.image_variants import pick_variant_url
 from snapsapi.apps.posts.models import Post
 
 User = get_user_model()
@@ -40,9 +41,12 @@ class CollectionPostSerializer(serializers.ModelSerializer):
         read_only_fields = ['uid', 'caption', 'first_image', 'created_at']
 
     def get_first_image(self, obj):
+        if hasattr(obj, 'first_image_url'):
+            # annotated by PostQuerySet.with_first_image()
+            return pick_variant_url(obj.first_image_url, obj.first_image_variants)
         first_image = obj.images.order_by('order').first()
         if first_image:
-            return first_image.url
+            return pick_variant_url(first_image.url, first_image.variants)
         return None
 
 
@@ -63,7 +67,7 @@ class CollectionReadSerializer(serializers.ModelSerializer):
 
     def get_posts(self, obj):
         from snapsapi.apps.core.serializers import CollectionPostSerializer
-        return CollectionPostSerializer(obj.posts.all(), many=True).data
+        return CollectionPostSerializer(obj.posts.all().with_first_image(), many=True).data
 
     def get_posts_count(self, obj):
         return obj.posts.count()
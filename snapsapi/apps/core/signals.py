@@ -0,0 +1,77 @@
+from functools import partial
+
+from django.core.signals import request_finished, request_started
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core import metrics
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.likes.models import CommentLike, PostLike
+
+
+def count_on_commit(counter: metrics.Counter, using: str, **labels) -> None:
+    """Counts the event only if the transaction that produced it commits."""
+    transaction.on_commit(partial(counter.inc, **labels), using=using)
+
+
+@receiver(connection_created)
+def count_database_connection(sender, connection, **kwargs):
+    metrics.DB_CONNECTIONS_CREATED.inc(alias=connection.alias)
+    connection.requests_served = 0
+
+
+# Django's close_old_connections() is connected to both signals first, so these receivers see
+# the connections it has kept (request_started) or closed (request_finished).
+@receiver(request_started)
+def count_reused_connections(sender, **kwargs):
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            metrics.DB_CONNECTIONS_REUSED.inc(alias=connection.alias)
+
+
+@receiver(request_finished)
+def count_closed_connections(sender, **kwargs):
+    for connection in connections.all(initialized_only=True):
+        requests_served = getattr(connection, 'requests_served', None)
+        if requests_served is None:
+            continue
+        connection.requests_served = requests_served = requests_served + 1
+        if connection.connection is None:
+            metrics.DB_CONNECTIONS_CLOSED.inc(alias=connection.alias)
+            metrics.DB_CONNECTION_REQUESTS.observe(requests_served, alias=connection.alias)
+            connection.requests_served = None
+
+
+@receiver(post_save, sender=PostLike)
+@receiver(post_save, sender=CommentLike)
+def count_like(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        target = 'post' if sender is PostLike else 'comment'
+        count_on_commit(metrics.LIKES, using, target=target, action='like')
+
+
+@receiver(post_delete, sender=PostLike)
+@receiver(post_delete, sender=CommentLike)
+def count_unlike(sender, instance, using=None, **kwargs):
+    target = 'post' if sender is PostLike else 'comment'
+    count_on_commit(metrics.LIKES, using, target=target, action='unlike')
+
+
+@receiver(post_save, sender=Follow)
+def count_follow(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        count_on_commit(metrics.FOLLOWS, using, action='follow')
+
+
+@receiver(post_delete, sender=Follow)
+def count_unfollow(sender, instance, using=None, **kwargs):
+    count_on_commit(metrics.FOLLOWS, using, action='unfollow')
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        count_on_commit(metrics.COMMENTS, using, kind='reply' if instance.parent_id else 'comment')
@@ -0,0 +1,155 @@
+from unittest import mock
+
+import pytest
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.likes.models import PostLike
+from snapsapi.apps.notifications.models import FCMDevice
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.mark.anyio
+class TestAsyncHealthCheck:
+    """Tests for the async health check served through the ASGI handler"""
+
+    async def test_health_check(self):
+        response = await AsyncClient().get(reverse('async:health_check'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'status': 'ok'}
+
+    async def test_method_not_allowed(self):
+        response = await AsyncClient().post(reverse('async:health_check'))
+
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+        assert response['Allow'] == 'GET'
+
+    async def test_async_middleware_records_metrics_and_timings(self, settings):
+        from snapsapi.apps.core import metrics
+        store = metrics.InMemoryMetricsStore()
+        settings.INSTRUMENTATION_SAMPLE_RATE = 1
+
+        with mock.patch.object(metrics, '_store_cache', {metrics.DEFAULT_STORE: store}):
+            response = await AsyncClient().get(reverse('async:health_check'))
+            text = metrics.registry.render()
+
+        assert response['Server-Timing'].startswith('db;dur=0.0;desc="0 queries"')
+        assert 'snapsapi_http_requests_total{route="async:health_check",method="GET",status="200"} 1' in text
+
+
+@pytest.mark.django_db
+class TestAsyncAuthentication:
+    """Tests for JWT authentication of the async views"""
+
+    def test_anonymous_request_is_rejected(self, api_client, post1):
+        response = api_client.post(reverse('async:like-toggle', kwargs={'uid': post1.uid}))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response['WWW-Authenticate'] == 'Bearer realm="api"'
+        assert 'detail' in response.json()
+
+    def test_invalid_token_is_rejected(self, api_client, post1):
+        api_client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+
+        response = api_client.post(reverse('async:like-toggle', kwargs={'uid': post1.uid}))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()['code'] == 'token_not_valid'
+
+
+@pytest.mark.django_db
+class TestAsyncToggles:
+    """The async like/follow toggles answer like their DRF counterparts"""
+
+    def test_like_toggle(self, jwt_client, user1, post1):
+        url = reverse('async:like-toggle', kwargs={'uid': post1.uid})
+
+        liked = jwt_client.post(url)
+        assert liked.status_code == status.HTTP_200_OK
+        assert liked.json() == {'likes_count': 1, 'is_liked': True}
+        assert PostLike.objects.filter(user=user1, post=post1).exists()
+
+        unliked = jwt_client.post(url)
+        assert unliked.json() == {'likes_count': 0, 'is_liked': False}
+        assert not PostLike.objects.filter(user=user1, post=post1).exists()
+
+    def test_like_toggle_unknown_post(self, jwt_client):
+        response = jwt_client.post(reverse('async:like-toggle', kwargs={'uid': '00000000-0000-0000-0000-000000000000'}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_follow_toggle_matches_sync_view(self, jwt_client, user1, user2):
+        async_response = jwt_client.post(reverse('async:user-follow-toggle', kwargs={'user_uid': user2.uid}))
+        assert async_response.status_code == status.HTTP_200_OK
+        assert Follow.objects.filter(follower=user1, following=user2).exists()
+
+        sync_response = jwt_client.post(reverse('users:user-follow-toggle', kwargs={'user_uid': user2.uid}))
+        assert async_response.json() == {**sync_response.json(), 'is_following': True, 'followers_count': 1}
+        assert not Follow.objects.filter(follower=user1, following=user2).exists()
+
+    def test_follow_yourself(self, jwt_client, user1):
+        response = jwt_client.post(reverse('async:user-follow-toggle', kwargs={'user_uid': user1.uid}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Users cannot follow themselves.'
+
+    def test_follow_unknown_user(self, jwt_client):
+        response = jwt_client.post(reverse('async:user-follow-toggle', kwargs={'user_uid': 'unknown'}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestAsyncDeviceRegistration:
+    """Tests for the async device registration"""
+
+    def test_register_and_update(self, jwt_client, user1):
+        url = reverse('async:fcm-device-register')
+
+        created = jwt_client.post(url, {'registration_id': 'token-1', 'type': 'android'}, format='json')
+        assert created.status_code == status.HTTP_201_CREATED
+        assert created.json()['registered'] is True
+
+        updated = jwt_client.post(url, {'registration_id': 'token-1', 'type': 'ios'}, format='json')
+        assert updated.status_code == status.HTTP_200_OK
+        assert FCMDevice.objects.get(user=user1, registration_id='token-1').type == 'ios'
+
+    def test_registration_id_is_required(self, jwt_client):
+        response = jwt_client.post(reverse('async:fcm-device-register'), {}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_malformed_json(self, jwt_client):
+        response = jwt_client.post(reverse('async:fcm-device-register'), '{', content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['detail'].startswith('JSON parse error')
+
+
+@pytest.mark.django_db
+class TestAsyncPresignedURL:
+    """Tests for the async presigned URL generation"""
+
+    def test_presigned_urls(self, jwt_client, user1):
+        signed = [{'url': 'https://bucket.s3.amazonaws.com/', 'fields': {'key': 'a'}}]
+        with mock.patch('snapsapi.apps.posts.async_views.create_presigned_posts', return_value=signed) as sign:
+            response = jwt_client.post(reverse('async:posts-presigned-url'),
+                                       {'files': [{'file_name': 'a.jpg', 'file_type': 'image/jpeg'}]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'results': [{'file_name': 'a.jpg', 'presigned_url': signed[0]}]}
+        [object_name] = sign.call_args.args[1]
+        assert object_name.startswith(f'media/posts/user_{user1.uid}/')
+
+    def test_invalid_request(self, jwt_client):
+        response = jwt_client.post(reverse('async:posts-presigned-url'), {'files': [{}]}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'files' in response.json()
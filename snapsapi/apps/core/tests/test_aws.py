@@ -0,0 +1,126 @@
+import datetime
+import threading
+from unittest import mock
+
+import boto3
+import pytest
+from botocore.config import Config
+
+from snapsapi.utils import aws
+from snapsapi.utils.aws import S3PostPolicySigner, create_presigned_posts, get_boto3_session
+
+FIXED_NOW = datetime.datetime(2026, 1, 2, 3, 4, 5)
+REGION = 'ap-northeast-2'
+
+
+class FixedDateTime(datetime.datetime):
+    @classmethod
+    def utcnow(cls):
+        return FIXED_NOW
+
+
+def botocore_presigned_post(bucket_name, object_name, session_token=None, **kwargs):
+    client = boto3.session.Session(
+        aws_access_key_id='AKID', aws_secret_access_key='SECRET', aws_session_token=session_token,
+        region_name=REGION,
+    ).client('s3', config=Config(signature_version='s3v4'))
+    with mock.patch('botocore.auth.datetime.datetime', FixedDateTime), \
+            mock.patch('botocore.signers.datetime.datetime', FixedDateTime):
+        return client.generate_presigned_post(bucket_name, object_name, **kwargs)
+
+
+def make_signer(session_token=None):
+    return S3PostPolicySigner(
+        'AKID', 'SECRET', REGION, session_token, clock=lambda: FIXED_NOW.replace(tzinfo=datetime.UTC),
+    )
+
+
+@pytest.fixture
+def aws_settings(settings):
+    settings.AWS_ACCESS_KEY_ID = 'AKID'
+    settings.AWS_SECRET_ACCESS_KEY = 'SECRET'
+    settings.AWS_REGION = REGION
+    aws._session_cache.clear()
+    yield settings
+    aws._session_cache.clear()
+
+
+class TestS3PostPolicySigner:
+    """Tests for offline POST policy signing"""
+
+    def test_matches_botocore(self):
+        """Fields and URL are identical to boto3's generate_presigned_post"""
+        expected = botocore_presigned_post('bucket', 'posts/a.jpg', ExpiresIn=300)
+
+        result = make_signer().sign_many('bucket', ['posts/a.jpg'], expiration=300)
+
+        assert result == [expected]
+
+    def test_matches_botocore_with_fields_conditions_and_token(self):
+        """Prefilled fields, extra conditions and session tokens are signed the same way"""
+        fields = {'Content-Type': 'image/jpeg'}
+        conditions = [{'Content-Type': 'image/jpeg'}, ['content-length-range', 1, 1024]]
+        expected = botocore_presigned_post(
+            'bucket', 'posts/${filename}', session_token='TOKEN',
+            Fields=dict(fields), Conditions=list(conditions), ExpiresIn=60,
+        )
+
+        result = make_signer('TOKEN').sign_many(
+            'bucket', ['posts/${filename}'], fields=fields, conditions=conditions, expiration=60,
+        )
+
+        assert result == [expected]
+
+    @pytest.mark.parametrize('bucket_name', ['snaps-media', 'xn--media', '123'])
+    def test_bucket_url_matches_botocore(self, bucket_name):
+        expected = botocore_presigned_post(bucket_name, 'posts/a.jpg')
+
+        assert make_signer().get_bucket_url(bucket_name) == expected['url']
+
+    @pytest.mark.parametrize('bucket_name', ['media.snaps.my', 'Snaps_Media', 'ab', 'media-'])
+    def test_rejects_buckets_botocore_addresses_path_style(self, bucket_name):
+        assert '.s3.amazonaws.com' not in botocore_presigned_post(bucket_name, 'posts/a.jpg')['url']
+        with pytest.raises(ValueError):
+            make_signer().sign_many(bucket_name, ['posts/a.jpg'])
+
+    def test_sign_many_keeps_order(self):
+        """Every object key gets its own policy, in input order"""
+        names = [f'posts/{i}.jpg' for i in range(5)]
+
+        result = make_signer().sign_many('bucket', names, expiration=300)
+
+        assert [item['fields']['key'] for item in result] == names
+        assert result == [botocore_presigned_post('bucket', name, ExpiresIn=300) for name in names]
+        assert len({item['fields']['x-amz-signature'] for item in result}) == len(names)
+
+
+class TestSharedBoto3Session:
+    """Tests for the process-wide boto3 session"""
+
+    def test_session_is_reused(self, aws_settings):
+        """The session is created once and shared"""
+        assert get_boto3_session() is get_boto3_session()
+
+    def test_session_is_created_once_across_threads(self, aws_settings):
+        """Concurrent first calls create a single session"""
+        barrier = threading.Barrier(8)
+        sessions = []
+
+        def worker():
+            barrier.wait()
+            sessions.append(get_boto3_session())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(session) for session in sessions}) == 1
+
+    def test_create_presigned_posts(self, aws_settings):
+        """Batch presigning uses the configured credentials and returns one entry per key"""
+        result = create_presigned_posts('bucket', ['posts/a.jpg', 'posts/b.jpg'], expiration=300)
+
+        assert [item['fields']['key'] for item in result] == ['posts/a.jpg', 'posts/b.jpg']
+        assert all(item['fields']['x-amz-credential'].startswith('AKID/') for item in result)
@@ -0,0 +1,154 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from snapsapi.apps.core.models import Collection, Follow
+from snapsapi.apps.likes.models import PostLike
+from snapsapi.apps.posts.models import Post
+
+
+def post_url(post):
+    return reverse('posts:posts-detail', kwargs={'uid': post.uid})
+
+
+def profile_url(user):
+    return reverse('users:user-profile', kwargs={'user_uid': user.uid})
+
+
+def collection_url(collection):
+    return reverse('collections-detail', kwargs={'uid': collection.uid})
+
+
+@pytest.mark.django_db
+class TestPostConditionalGet:
+    """Tests for conditional GET on PostDetailView"""
+
+    def test_matching_etag_should_return_304_without_body(self, api_client, post1):
+        response = api_client.get(post_url(post1))
+        etag = response['ETag']
+        assert etag.startswith('W/"')
+
+        response = api_client.get(post_url(post1), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response['ETag'] == etag
+
+    def test_304_should_skip_serialization_queries(self, api_client, post1):
+        etag = api_client.get(post_url(post1))['ETag']
+
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get(post_url(post1), HTTP_IF_NONE_MATCH=etag)
+
+        selects = [q for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        assert len(selects) == 1
+
+    def test_etag_should_change_with_counters_and_caption(self, api_client, post1):
+        etag = api_client.get(post_url(post1))['ETag']
+        Post.objects.filter(pk=post1.pk).update(likes_count=3)
+
+        response = api_client.get(post_url(post1), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['likes_count'] == 3
+
+        post1.caption = 'edited'
+        post1.save()
+        assert api_client.get(post_url(post1), HTTP_IF_NONE_MATCH=response['ETag']).status_code == status.HTTP_200_OK
+
+    def test_etag_should_include_viewer_flags(self, jwt_client_user2, user2, post1):
+        etag = jwt_client_user2.get(post_url(post1))['ETag']
+        PostLike.objects.create(user=user2, post=post1)
+        # likes_count is maintained by the counter service, so reset it to isolate the viewer flag
+        Post.objects.filter(pk=post1.pk).update(likes_count=0)
+
+        response = jwt_client_user2.get(post_url(post1), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['is_liked'] is True
+
+    def test_cache_control_should_be_public_for_anonymous_and_private_for_users(self, api_client, post1, user1):
+        anonymous = APIClient().get(post_url(post1))
+        assert 'public' in anonymous['Cache-Control']
+        assert 's-maxage=' in anonymous['Cache-Control']
+        assert 'Authorization' in anonymous['Vary']
+
+        client = APIClient()
+        client.force_authenticate(user=user1)
+        authenticated = client.get(post_url(post1))
+        assert 'private' in authenticated['Cache-Control']
+        assert anonymous['ETag'] != authenticated['ETag']
+
+    def test_post_should_not_send_last_modified(self, api_client, post1):
+        # counters have no timestamp, so only the ETag can validate a post
+        response = api_client.get(post_url(post1), HTTP_IF_MODIFIED_SINCE=http_date())
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Last-Modified' not in response
+
+
+@pytest.mark.django_db
+class TestProfileConditionalGet:
+    """Tests for conditional GET on UserProfileView"""
+
+    def test_matching_etag_should_return_304(self, api_client, user1):
+        etag = api_client.get(profile_url(user1))['ETag']
+
+        response = api_client.get(profile_url(user1), HTTP_IF_NONE_MATCH=f'"other", {etag}')
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_new_follower_should_change_etag(self, api_client, user1, user2):
+        etag = api_client.get(profile_url(user2))['ETag']
+        Follow.objects.create(follower=user1, following=user2)
+
+        response = api_client.get(profile_url(user2), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['followers_count'] == 1
+
+    def test_profile_edit_should_change_etag(self, api_client, user1):
+        etag = api_client.get(profile_url(user1))['ETag']
+        user1.profile.bio = 'hello'
+        user1.profile.save()
+
+        assert api_client.get(profile_url(user1), HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestCollectionConditionalGet:
+    """Tests for conditional GET on CollectionDetailView"""
+
+    def test_matching_etag_should_return_304(self, jwt_client, collection1):
+        response = jwt_client.get(collection_url(collection1))
+        assert 'Last-Modified' not in response
+
+        response = jwt_client.get(collection_url(collection1), HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert 'private' in response['Cache-Control']
+
+    def test_if_modified_since_alone_should_not_return_304(self, jwt_client, collection1):
+        response = jwt_client.get(collection_url(collection1), HTTP_IF_MODIFIED_SINCE=http_date())
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_adding_a_post_should_change_etag(self, jwt_client, collection1, post1):
+        etag = jwt_client.get(collection_url(collection1))['ETag']
+
+        collection1.posts.add(post1)
+
+        refreshed = jwt_client.get(collection_url(collection1), HTTP_IF_NONE_MATCH=etag)
+        assert refreshed.status_code == status.HTTP_200_OK
+        assert len(refreshed.data['posts']) == 1
+
+    def test_owner_rename_should_change_etag(self, jwt_client, user1, collection1):
+        etag = jwt_client.get(collection_url(collection1))['ETag']
+        user1.username = 'renamed'
+        user1.save()
+
+        refreshed = jwt_client.get(collection_url(collection1), HTTP_IF_NONE_MATCH=etag)
+        assert refreshed.status_code == status.HTTP_200_OK
+        assert refreshed.data['owner']['username'] == 'renamed'
@@ -0,0 +1,178 @@
+from unittest import mock
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core import counters
+from snapsapi.apps.core.counters import (
+    CounterService,
+    InMemoryCounterStore,
+    RedisCounterStore,
+    get_counter_service,
+    make_key,
+)
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.likes.models import PostLike
+from snapsapi.apps.posts.models import Post
+
+
+@pytest.fixture(autouse=True)
+def counter_service():
+    counters._service_cache.clear()
+    yield
+    counters._service_cache.clear()
+
+
+@pytest.fixture
+def write_behind(settings):
+    settings.COUNTERS_WRITE_BEHIND = True
+    settings.COUNTERS_FLUSH_INTERVAL = 0  # Flushed explicitly by the tests
+    return get_counter_service()
+
+
+@pytest.mark.django_db
+class TestWriteThroughCounters:
+    """Tests for the default (write-through) mode"""
+
+    def test_like_should_update_the_row_immediately(self, user1, post1):
+        PostLike.objects.create(user=user1, post=post1)
+        post1.refresh_from_db()
+        assert post1.likes_count == 1
+
+    def test_decrement_should_not_go_below_zero(self, user1, post1):
+        get_counter_service().decr(Post, post1.pk, 'likes_count')
+        post1.refresh_from_db()
+        assert post1.likes_count == 0
+
+    def test_editing_a_comment_should_not_change_comments_count(self, user1, post1):
+        comment = Comment.objects.create(user=user1, post=post1, content='hello')
+        comment.content = 'edited'
+        comment.save()
+        post1.refresh_from_db()
+        assert post1.comments_count == 1
+
+        comment.soft_delete()
+        post1.refresh_from_db()
+        assert post1.comments_count == 0
+
+
+@pytest.mark.django_db
+class TestWriteBehindCounters:
+    """Tests for buffered counters (COUNTERS_WRITE_BEHIND = True)"""
+
+    def test_like_should_be_buffered_until_flush(self, write_behind, jwt_client, post1,
+                                                 django_capture_on_commit_callbacks):
+        url = reverse('posts:like-toggle', kwargs={'uid': post1.uid})
+        with django_capture_on_commit_callbacks(execute=True):
+            res = jwt_client.post(url)
+
+        assert res.status_code == 200
+        # Read paths already include the pending delta...
+        detail = jwt_client.get(reverse('posts:posts-detail', kwargs={'uid': post1.uid})).json()
+        assert detail['likes_count'] == 1
+        # ...while the row itself is untouched until the flush.
+        post1.refresh_from_db()
+        assert post1.likes_count == 0
+
+        assert write_behind.flush() == 1
+        post1.refresh_from_db()
+        assert post1.likes_count == 1
+        assert write_behind.value(post1, 'likes_count') == 1
+
+    def test_rolled_back_writes_should_not_be_counted(self, write_behind, user1, post1,
+                                                      django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    PostLike.objects.create(user=user1, post=post1)
+                    raise RuntimeError('rolled back')
+
+        # The counter delta registered by the like was discarded with the transaction.
+        assert callbacks == []
+        assert write_behind.flush() == 0
+        assert write_behind.value(post1, 'likes_count') == 0
+        post1.refresh_from_db()
+        assert post1.likes_count == 0
+
+    def test_flush_should_group_updates_by_delta(self, write_behind, user1, user2,
+                                                 django_capture_on_commit_callbacks):
+        posts = [Post.objects.create(user=user1, caption=f'post {idx}') for idx in range(10)]
+        with django_capture_on_commit_callbacks(execute=True):
+            for post in posts:
+                PostLike.objects.create(user=user1, post=post)
+            PostLike.objects.create(user=user2, post=posts[0])
+        write_behind.flush()  # posts_count deltas from the setup
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for post in posts:
+                PostLike.objects.filter(user=user1, post=post).delete()
+                PostLike.objects.create(user=user1, post=post)
+            PostLike.objects.create(user=user2, post=posts[1])
+
+        with CaptureQueriesContext(connection) as ctx:
+            write_behind.flush()
+        updates = [query for query in ctx.captured_queries if query['sql'].startswith('UPDATE')]
+        # Every net delta is 0 except posts[1] (+1): a single UPDATE.
+        assert len(updates) == 1
+        assert Post.objects.get(pk=posts[0].pk).likes_count == 2
+        assert Post.objects.get(pk=posts[1].pk).likes_count == 2
+
+    def test_follow_counts_should_be_overlaid_on_profile(self, write_behind, jwt_client, user1, user2,
+                                                         django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            Follow.objects.follow(follower=user1, following=user2)
+
+        res = jwt_client.get(reverse('users:user-profile', kwargs={'user_uid': user2.uid}))
+        assert res.json()['followers_count'] == 1
+
+
+class TestInMemoryCounterStore:
+    """Tests for the sharded in-memory store"""
+
+    def test_drained_batch_should_stay_visible_until_completed(self):
+        store = InMemoryCounterStore(shards=4)
+        key = make_key(Post, 1, 'likes_count')
+        store.incr(key, 2)
+
+        assert store.drain() == {key: 2}
+        assert store.get_many([key]) == {key: 2}
+        store.incr(key, 1)
+        assert store.get_many([key]) == {key: 3}
+
+        store.complete()
+        assert store.get_many([key]) == {key: 1}
+
+    def test_failed_flush_should_be_retried_by_the_next_drain(self):
+        store = InMemoryCounterStore(shards=4)
+        key = make_key(Post, 1, 'likes_count')
+        store.incr(key, 2)
+        store.drain()  # The flush "fails": complete() is never called.
+        store.incr(key, 1)
+        assert store.drain() == {key: 3}
+
+    def test_unknown_counter_should_be_rejected(self):
+        with pytest.raises(ValueError):
+            make_key(Post, 1, 'caption')
+
+
+@pytest.mark.django_db
+class TestRedisCounterStore:
+    """Tests for the shared Redis store, with a mocked client"""
+
+    def test_flush_should_hold_the_shared_lock_until_completed(self, post1):
+        key = make_key(Post, post1.pk, 'likes_count')
+        client = mock.MagicMock()
+        client.hgetall.return_value = {key.encode(): b'2'}
+        with mock.patch.object(counters, 'get_redis_client', return_value=client):
+            store = RedisCounterStore(shards=1)
+
+        assert CounterService(store).flush() == 1
+
+        calls = [name for name, _, _ in client.mock_calls]
+        assert calls == ['lock', 'lock().__enter__', 'renamenx', 'hgetall', 'delete', 'lock().__exit__']
+        assert client.lock.call_args.args == (RedisCounterStore.lock_key,)
+        post1.refresh_from_db()
+        assert post1.likes_count == 2
@@ -0,0 +1,133 @@
+import pytest
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.core import db_routing
+from snapsapi.apps.core.db_routing import ReplicaRouter, ReplicaRoutingMiddleware
+from snapsapi.apps.posts.models import Post
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                   'LOCATION': 'test-db-routing'}}
+    settings.REPLICA_PIN_CACHE = 'default'
+    yield settings
+    caches['default'].clear()
+
+
+def routed_database(client, method, path, **extra):
+    """Performs the request and returns the database the router chose for its reads."""
+    chosen = []
+    original = ReplicaRoutingMiddleware.choose_database
+
+    def record(request, pinned):
+        alias = original(request, pinned)
+        chosen.append(alias or 'default')
+        return alias
+
+    ReplicaRoutingMiddleware.choose_database = staticmethod(record)
+    try:
+        response = getattr(client, method)(path, **extra)
+    finally:
+        ReplicaRoutingMiddleware.choose_database = staticmethod(original)
+    return response, chosen[0]
+
+
+class TestReplicaRouter:
+    """Tests for the routing decisions of ReplicaRouter"""
+
+    def test_reads_outside_a_request_use_the_primary(self, replicas):
+        assert ReplicaRouter().db_for_read(Post) is None
+
+    def test_reads_follow_the_request(self, replicas):
+        token = db_routing._read_database.set('replica')
+        try:
+            assert ReplicaRouter().db_for_read(Post) == 'replica'
+            assert ReplicaRouter().db_for_write(Post) == 'default'
+        finally:
+            db_routing._read_database.reset(token)
+
+    def test_replicas_are_not_migrated(self, replicas):
+        assert ReplicaRouter().allow_migrate('replica', 'posts') is False
+        assert ReplicaRouter().allow_migrate('default', 'posts') is None
+
+    @pytest.mark.django_db
+    def test_reads_inside_a_transaction_use_the_primary(self, replicas):
+        token = db_routing._read_database.set('replica')
+        try:
+            with transaction.atomic():
+                assert ReplicaRouter().db_for_read(Post) == 'default'
+        finally:
+            db_routing._read_database.reset(token)
+
+
+# `replica` mirrors the test database through a second connection, which only sees committed rows.
+@pytest.mark.django_db(databases=['default', 'replica'], transaction=True)
+class TestReplicaRoutingMiddleware:
+    """Tests for the per-request routing and read-your-writes pinning"""
+
+    def test_safe_request_reads_from_the_replica(self, replicas, api_client, post1):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response, database = routed_database(api_client, 'get', reverse('posts:tags-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert database == 'replica'
+        assert len(replica_queries) > 0
+
+    def test_write_pins_the_client_to_the_primary(self, replicas, jwt_client, post1):
+        response, database = routed_database(jwt_client, 'post', reverse('posts:like-toggle', kwargs={'uid': post1.uid}))
+        assert response.status_code == status.HTTP_200_OK
+        assert database == 'default'
+        assert replicas.REPLICA_PIN_COOKIE in response.cookies
+
+        _, database = routed_database(jwt_client, 'get', reverse('posts:tags-list'))
+        assert database == 'default'
+
+    def test_pin_follows_the_user_without_cookies(self, replicas, jwt_client, post1):
+        jwt_client.post(reverse('posts:like-toggle', kwargs={'uid': post1.uid}))
+        jwt_client.cookies.clear()
+
+        _, database = routed_database(jwt_client, 'get', reverse('posts:tags-list'))
+        assert database == 'default'
+
+    def test_unpinned_client_reads_from_the_replica(self, replicas, jwt_client, post1, user1):
+        jwt_client.post(reverse('posts:like-toggle', kwargs={'uid': post1.uid}))
+        jwt_client.cookies.clear()
+        caches['default'].delete(db_routing.PIN_CACHE_KEY.format(user_id=user1.pk))
+
+        _, database = routed_database(jwt_client, 'get', reverse('posts:tags-list'))
+        assert database == 'replica'
+
+    def test_token_requests_use_the_primary_without_a_pin_cache(self, replicas, jwt_client, post1):
+        replicas.REPLICA_PIN_CACHE = None
+
+        _, database = routed_database(jwt_client, 'get', reverse('posts:tags-list'))
+        assert database == 'default'
+        jwt_client.credentials()
+        _, database = routed_database(jwt_client, 'get', reverse('posts:tags-list'))
+        assert database == 'replica'
+
+    def test_failed_write_does_not_pin(self, replicas, jwt_client):
+        response, _ = routed_database(jwt_client, 'post', reverse('posts:posts-presigned-url'), data={}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert replicas.REPLICA_PIN_COOKIE not in response.cookies
+
+    def test_tampered_cookie_is_ignored(self, replicas, api_client, post1):
+        api_client.cookies[replicas.REPLICA_PIN_COOKIE] = '1'
+
+        _, database = routed_database(api_client, 'get', reverse('posts:tags-list'))
+        assert database == 'replica'
+
+    def test_post_list_reads_from_the_replica(self, replicas, api_client, post1):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response, database = routed_database(api_client, 'get', reverse('posts:posts-list-create'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert database == 'replica'
+        assert any('posts_post' in query['sql'] for query in replica_queries)
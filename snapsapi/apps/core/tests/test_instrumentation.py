@@ -0,0 +1,92 @@
+import json
+import logging
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.core.instrumentation import fingerprint_sql, normalize_sql
+from snapsapi.apps.posts.models import Post
+
+
+@pytest.fixture
+def instrumentation_log(caplog):
+    logger = logging.getLogger('snapsapi.instrumentation')
+    logger.addHandler(caplog.handler)
+    caplog.set_level(logging.INFO, logger='snapsapi.instrumentation')
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+def log_records(caplog):
+    return [json.loads(record.getMessage()) for record in caplog.records if record.name == 'snapsapi.instrumentation']
+
+
+class TestFingerprint:
+    """Tests for SQL fingerprints"""
+
+    def test_parameters_do_not_change_the_fingerprint(self):
+        assert normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21') == \
+               'SELECT * FROM "t" WHERE "id" IN (...) LIMIT ?'
+        assert fingerprint_sql('SELECT 1 FROM "t" WHERE "id" IN (%s)') == \
+               fingerprint_sql('SELECT  1 FROM "t"\nWHERE "id" IN (%s, %s)')
+        assert fingerprint_sql("SELECT * FROM \"t\" WHERE \"name\" = 'a'") == \
+               fingerprint_sql("SELECT * FROM \"t\" WHERE \"name\" = 'it''s'")
+
+    def test_different_statements_differ(self):
+        assert fingerprint_sql('SELECT * FROM "a"') != fingerprint_sql('SELECT * FROM "b"')
+
+
+@pytest.mark.django_db
+class TestRequestInstrumentationMiddleware:
+    """Tests for per-request SQL and timing instrumentation"""
+
+    def test_sampled_request_reports_timings(self, api_client, post1, settings, instrumentation_log):
+        settings.INSTRUMENTATION_SAMPLE_RATE = 1
+
+        response = api_client.get(reverse('posts:posts-detail', kwargs={'uid': post1.uid}))
+
+        assert response.status_code == status.HTTP_200_OK
+        timing = response['Server-Timing']
+        assert timing.startswith('db;dur=')
+        assert 'serialize;dur=' in timing and 'total;dur=' in timing
+        [record] = log_records(instrumentation_log)
+        assert record['route'] == 'posts/<uuid:uid>/'
+        assert record['status'] == 200
+        assert record['queries'] > 0
+        assert f'desc="{record["queries"]} queries"' in timing
+        assert record['serializer_ms'] > 0
+        assert record['response_bytes'] == len(response.content)
+        assert 0 < len(record['slow_queries']) <= settings.INSTRUMENTATION_SLOW_QUERIES
+        assert {'fingerprint', 'ms', 'sql'} <= set(record['slow_queries'][0])
+
+    def test_repeated_statements_are_reported(self, jwt_client, user1, settings, instrumentation_log):
+        settings.INSTRUMENTATION_SAMPLE_RATE = 1
+        settings.INSTRUMENTATION_REPEATED_QUERY_THRESHOLD = 3
+        for idx in range(3):
+            Post.objects.create_post(user1, f'caption {idx}', ['a.jpg'], [f'tag{idx}'])
+
+        # 게시물 목록은 게시물 수와 무관한 쿼리만 실행하므로 반복 쿼리가 없다.
+        response = jwt_client.get(reverse('posts:posts-list-create'))
+
+        assert response.status_code == status.HTTP_200_OK
+        [record] = log_records(instrumentation_log)
+        assert record['user_id'] == user1.pk
+        assert record['repeated_queries'] == {}
+
+    def test_unsampled_request_is_untouched(self, api_client, post1, settings, instrumentation_log):
+        settings.INSTRUMENTATION_SAMPLE_RATE = 0
+
+        response = api_client.get(reverse('posts:posts-detail', kwargs={'uid': post1.uid}))
+
+        assert 'Server-Timing' not in response
+        assert log_records(instrumentation_log) == []
+
+    def test_server_timing_header_can_be_disabled(self, api_client, post1, settings, instrumentation_log):
+        settings.INSTRUMENTATION_SAMPLE_RATE = 1
+        settings.INSTRUMENTATION_SERVER_TIMING = False
+
+        response = api_client.get(reverse('posts:posts-detail', kwargs={'uid': post1.uid}))
+
+        assert 'Server-Timing' not in response
+        assert len(log_records(instrumentation_log)) == 1
@@ -0,0 +1,177 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.core import metrics, signals
+from snapsapi.apps.core.metrics import DirectoryMetricsStore, InMemoryMetricsStore, make_key
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = InMemoryMetricsStore()
+    monkeypatch.setattr(metrics, '_store_cache', {metrics.DEFAULT_STORE: store})
+    return store
+
+
+def scrape(client):
+    response = client.get(reverse('core:metrics'))
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    return response.content.decode()
+
+
+class TestExposition:
+    """Tests for the Prometheus text format"""
+
+    def test_counter_and_gauge(self, store):
+        metrics.LIKES.inc(target='post', action='like')
+        metrics.LIKES.inc(2, target='post', action='like')
+        metrics.HTTP_REQUESTS_IN_PROGRESS.inc()
+
+        text = metrics.registry.render()
+
+        assert '# TYPE snapsapi_likes_total counter' in text
+        assert 'snapsapi_likes_total{target="post",action="like"} 3' in text
+        assert 'snapsapi_http_requests_in_progress 1' in text
+
+    def test_histogram_buckets_are_cumulative(self, store):
+        for value in (0.003, 0.02, 0.02, 30):
+            metrics.HTTP_REQUEST_DURATION.observe(value, route='posts:posts-detail', method='GET')
+
+        text = metrics.registry.render()
+
+        labels = 'route="posts:posts-detail",method="GET"'
+        assert f'snapsapi_http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+        assert f'snapsapi_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 3' in text
+        assert f'snapsapi_http_request_duration_seconds_bucket{{{labels},le="10"}} 3' in text
+        assert f'snapsapi_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in text
+        assert f'snapsapi_http_request_duration_seconds_count{{{labels}}} 4' in text
+        assert f'snapsapi_http_request_duration_seconds_sum{{{labels}}} 30.043' in text
+
+    def test_label_values_are_escaped(self, store):
+        metrics.CACHE_REQUESTS.inc(cache='a"b\\c\nd', result='hit')
+
+        assert 'snapsapi_cache_requests_total{cache="a\\"b\\\\c\\nd",result="hit"} 1' in metrics.registry.render()
+
+    def test_labels_must_match(self, store):
+        with pytest.raises(ValueError):
+            metrics.LIKES.inc(target='post')
+
+
+class TestDirectoryMetricsStore:
+    """Tests for aggregating the metrics of several worker processes"""
+
+    def test_sums_processes_and_drops_gauges_of_exited_ones(self, tmp_path):
+        counter_key = make_key('snapsapi_follows_total', ('follow',))
+        gauge_key = make_key('snapsapi_http_requests_in_progress', ())
+        histogram_key = make_key('snapsapi_http_request_duration_seconds', ('core:health_check', 'GET'))
+        buckets = metrics.HTTP_REQUEST_DURATION.buckets
+        exited = [0.0] * (len(buckets) + 2)
+        exited[0], exited[-1] = 2, 0.004
+        # pid 2**22 + 1 is above the default pid_max, so it is never a live process
+        (tmp_path / f'{2 ** 22 + 1}.json').write_text(json.dumps({
+            'counters': {counter_key: 5}, 'gauges': {gauge_key: 7}, 'histograms': {histogram_key: exited},
+        }))
+        store = DirectoryMetricsStore(directory=str(tmp_path), interval=0)
+        store.inc('counter', counter_key, 1)
+        store.inc('gauge', gauge_key, 1)
+        store.observe(histogram_key, buckets, 0.002)
+
+        merged = store.collect()
+
+        assert merged['counters'][counter_key] == 6
+        assert merged['gauges'][gauge_key] == 1
+        assert merged['histograms'][histogram_key][0] == 3
+        # the scraping process wrote its own values first
+        assert json.loads((tmp_path / f'{os.getpid()}.json').read_text())['counters'][counter_key] == 1
+
+    def test_exited_processes_are_folded_into_one_file(self, tmp_path):
+        counter_key = make_key('snapsapi_follows_total', ('follow',))
+        gauge_key = make_key('snapsapi_http_requests_in_progress', ())
+        for pid in (2 ** 22 + 1, 2 ** 22 + 2):
+            (tmp_path / f'{pid}.json').write_text(json.dumps({
+                'counters': {counter_key: 5}, 'gauges': {gauge_key: 7}, 'histograms': {},
+            }))
+        store = DirectoryMetricsStore(directory=str(tmp_path), interval=0)
+
+        assert store.collect()['counters'][counter_key] == 10
+        assert sorted(path.name for path in tmp_path.glob('*.json')) == [f'{os.getpid()}.json', 'exited.json']
+
+        # a new process reusing an exited PID no longer overwrites its counters
+        (tmp_path / f'{2 ** 22 + 1}.json').write_text(json.dumps({
+            'counters': {counter_key: 1}, 'gauges': {}, 'histograms': {},
+        }))
+        metrics.fold_exited_processes(str(tmp_path))
+        merged = store.collect()
+
+        assert merged['counters'][counter_key] == 11
+        assert merged['gauges'] == {}
+        assert not (tmp_path / f'{2 ** 22 + 1}.json').exists()
+
+
+class TestConnectionMetrics:
+    """Tests for the persistent connection statistics"""
+
+    def test_reused_and_closed_connections(self, store, monkeypatch):
+        connection = SimpleNamespace(alias='default', connection=object())
+        monkeypatch.setattr(signals, 'connections', SimpleNamespace(all=lambda initialized_only: [connection]))
+
+        signals.count_database_connection(sender=None, connection=connection)
+        for _ in range(2):
+            signals.count_reused_connections(sender=None)
+            signals.count_closed_connections(sender=None)
+        connection.connection = None  # CONN_MAX_AGE reached
+        signals.count_closed_connections(sender=None)
+
+        text = metrics.registry.render()
+        assert 'snapsapi_db_connections_created_total{alias="default"} 1' in text
+        assert 'snapsapi_db_connections_reused_total{alias="default"} 2' in text
+        assert 'snapsapi_db_connections_closed_total{alias="default"} 1' in text
+        assert 'snapsapi_db_connection_requests_bucket{alias="default",le="2"} 0' in text
+        assert 'snapsapi_db_connection_requests_bucket{alias="default",le="5"} 1' in text
+        assert connection.requests_served is None
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Tests for /core/metrics/ and the recorded events"""
+
+    def test_request_latency_per_route(self, api_client, post1, store):
+        api_client.get(reverse('posts:posts-detail', kwargs={'uid': post1.uid}))
+
+        text = scrape(api_client)
+
+        assert 'snapsapi_http_requests_total{route="posts:posts-detail",method="GET",status="200"} 1' in text
+        assert 'snapsapi_http_request_duration_seconds_count{route="posts:posts-detail",method="GET"} 1' in text
+
+    def test_likes_and_follows_are_counted_after_commit(self, jwt_client, post1, user2, store,
+                                                        django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            jwt_client.post(reverse('posts:like-toggle', kwargs={'uid': post1.uid}))
+            jwt_client.post(reverse('posts:like-toggle', kwargs={'uid': post1.uid}))
+            jwt_client.post(reverse('users:user-follow-toggle', kwargs={'user_uid': user2.uid}))
+
+        text = scrape(jwt_client)
+
+        assert 'snapsapi_likes_total{target="post",action="like"} 1' in text
+        assert 'snapsapi_likes_total{target="post",action="unlike"} 1' in text
+        assert 'snapsapi_follows_total{action="follow"} 1' in text
+
+    def test_token_is_required_when_configured(self, api_client, settings, store):
+        settings.METRICS_TOKEN = 'secret'
+
+        assert api_client.get(reverse('core:metrics')).status_code == status.HTTP_403_FORBIDDEN
+        api_client.credentials(HTTP_AUTHORIZATION='Bearer secret')
+        assert api_client.get(reverse('core:metrics')).status_code == status.HTTP_200_OK
+
+    def test_anonymous_scrapes_are_denied_without_a_token_in_prod(self, api_client, settings, store):
+        settings.METRICS_TOKEN = None
+        settings.METRICS_ALLOW_ANONYMOUS = False
+
+        assert api_client.get(reverse('core:metrics')).status_code == status.HTTP_403_FORBIDDEN
+        api_client.credentials(HTTP_AUTHORIZATION='Bearer None')
+        assert api_client.get(reverse('core:metrics')).status_code == status.HTTP_403_FORBIDDEN
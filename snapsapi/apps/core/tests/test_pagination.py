@@ -0,0 +1,127 @@
+import pytest
+from datetime import datetime, timedelta, UTC
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core.pagination import encode_cursor
+from snapsapi.apps.posts.models import Post
+
+
+@pytest.fixture
+def many_posts(user1):
+    """25 posts by user1; several of them share the same created_at to exercise the pk tie-breaker."""
+    posts = [Post.objects.create(user=user1, caption=f"post {idx}") for idx in range(25)]
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    for idx, post in enumerate(posts):
+        Post.objects.filter(pk=post.pk).update(created_at=base + timedelta(minutes=idx // 3))
+    return posts
+
+
+def expected_uids():
+    return [str(uid) for uid in Post.objects.order_by('-created_at', '-pk').values_list('uid', flat=True)]
+
+
+def walk(client, url, direction='next'):
+    seen = []
+    while url:
+        res = client.get(url)
+        assert res.status_code == status.HTTP_200_OK
+        data = res.json()
+        seen.extend(item['uid'] for item in data['results'])
+        url = data[direction]
+    return seen
+
+
+@pytest.mark.django_db
+class TestKeysetCursorPagination:
+    """Tests for cursor mode on /api/posts/"""
+
+    def test_cursor_pages_should_cover_every_post_once_in_order(self, api_client, many_posts):
+        url = reverse('posts:posts-list-create') + '?pagination=cursor&page_size=4'
+        assert walk(api_client, url) == expected_uids()
+
+    def test_previous_link_should_return_the_previous_page(self, api_client, many_posts):
+        url = reverse('posts:posts-list-create') + '?pagination=cursor&page_size=4'
+        first = api_client.get(url).json()
+        assert first['previous'] is None
+
+        second = api_client.get(first['next']).json()
+        third = api_client.get(second['next']).json()
+        back = api_client.get(third['previous']).json()
+
+        assert [item['uid'] for item in back['results']] == [item['uid'] for item in second['results']]
+        back_to_first = api_client.get(back['previous']).json()
+        assert [item['uid'] for item in back_to_first['results']] == [item['uid'] for item in first['results']]
+        assert back_to_first['previous'] is None
+
+    def test_cursor_mode_should_not_count_by_default(self, api_client, many_posts):
+        url = reverse('posts:posts-list-create') + '?pagination=cursor'
+        data = api_client.get(url).json()
+        assert data['count'] is None
+
+    def test_cursor_mode_should_count_when_requested(self, api_client, many_posts):
+        url = reverse('posts:posts-list-create')
+        assert api_client.get(url + '?pagination=cursor&count=exact').json()['count'] == 25
+        # SQLite has no planner statistics, so the estimate falls back to the exact count.
+        assert api_client.get(url + '?pagination=cursor&count=estimated').json()['count'] == 25
+
+    def test_tampered_cursor_should_return_404(self, api_client, many_posts):
+        url = reverse('posts:posts-list-create')
+        res = api_client.get(url, {'cursor': 'not-a-valid-cursor'})
+        assert res.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cursor_for_another_ordering_should_return_404(self, api_client, many_posts):
+        url = reverse('posts:posts-list-create')
+        cursor = encode_cursor({'p': ['2025-01-01T00:00:00+00:00'], 'o': ['-created_at'], 'r': False})
+        res = api_client.get(url, {'cursor': cursor})
+        assert res.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_without_cursor_should_keep_page_number_pagination(self, api_client, many_posts):
+        url = reverse('posts:posts-list-create')
+        data = api_client.get(url, {'page': 2}).json()
+        assert data['count'] == 25
+        assert [item['uid'] for item in data['results']] == expected_uids()[10:20]
+
+
+@pytest.mark.django_db
+class TestOptionalKeysetCursorPagination:
+    """Tests for cursor mode on endpoints that are unpaginated by default"""
+
+    def test_comments_should_stay_unpaginated_without_cursor(self, api_client, post1, user1):
+        for idx in range(3):
+            Comment.objects.create(user=user1, post=post1, content=f"comment {idx}")
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid})
+        res = api_client.get(url)
+        assert isinstance(res.data, list)
+        assert len(res.data) == 3
+
+    def test_comments_should_paginate_in_cursor_mode(self, api_client, post1, user1):
+        for idx in range(5):
+            Comment.objects.create(user=user1, post=post1, content=f"comment {idx}")
+        url = reverse('posts:comments-list-create', kwargs={'uid': post1.uid}) + '?pagination=cursor&page_size=2'
+        contents = []
+        while url:
+            data = api_client.get(url).json()
+            assert len(data['results']) <= 2
+            contents.extend(item['content'] for item in data['results'])
+            url = data['next']
+        assert sorted(contents) == [f"comment {idx}" for idx in range(5)]
+
+    def test_follow_list_should_paginate_in_cursor_mode(self, api_client, user1, user2):
+        from django.contrib.auth import get_user_model
+        from snapsapi.apps.core.models import Follow
+        followers = [
+            get_user_model().objects.create_user(email=f'f{idx}@snaps.com', password='pw', username=f'follower{idx}')
+            for idx in range(5)
+        ]
+        for follower in followers:
+            Follow.objects.create(follower=follower, following=user2)
+
+        url = reverse('users:user-connections', kwargs={'user_uid': user2.uid}) + '?pagination=cursor&page_size=2'
+        usernames = []
+        while url:
+            data = api_client.get(url).json()
+            usernames.extend(item['username'] for item in data['results'])
+            url = data['next']
+        assert sorted(usernames) == sorted(follower.username for follower in followers)
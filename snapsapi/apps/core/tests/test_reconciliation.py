@@ -0,0 +1,91 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.core.reconciliation import CounterReconciler, reconcile_counters
+from snapsapi.apps.likes.models import PostLike
+from snapsapi.apps.posts.models import Post
+from snapsapi.apps.users.models import User
+
+
+@pytest.fixture
+def drifted(user1, user2, post1):
+    """Real rows plus counters that were corrupted afterwards."""
+    posts = [post1] + [Post.objects.create(user=user1, caption=f'post {idx}') for idx in range(4)]
+    for post in posts[:3]:
+        PostLike.objects.create(user=user2, post=post)
+    Comment.objects.create(user=user2, post=post1, content='hello')
+    Comment.objects.create(user=user2, post=post1, content='gone', is_deleted=True)
+    Follow.objects.create(follower=user2, following=user1)
+
+    Post.objects.filter(pk__in=[post.pk for post in posts]).update(likes_count=7, comments_count=0)
+    User.objects.filter(pk=user1.pk).update(posts_count=0, followers_count=3)
+    return posts
+
+
+@pytest.mark.django_db
+class TestCounterReconciler:
+    """Tests for the set-based counter reconciliation"""
+
+    def test_reconcile_should_fix_every_counter(self, drifted, user1, user2):
+        report = reconcile_counters()
+
+        for post in drifted:
+            post.refresh_from_db()
+        assert [post.likes_count for post in drifted] == [1, 1, 1, 0, 0]
+        assert drifted[0].comments_count == 1
+        user1.refresh_from_db()
+        assert (user1.posts_count, user1.followers_count, user1.following_count) == (5, 1, 0)
+
+        by_name = {drift.counter: drift for drift in report.counters}
+        assert by_name['post.likes_count'].rows_drifted == 5
+        assert by_name['post.likes_count'].total_drift == 3 * 6 + 2 * 7
+        assert by_name['post.comments_count'].rows_drifted == 1
+        assert by_name['user.followers_count'].samples == [{'pk': user1.pk, 'stored': 3, 'actual': 1}]
+
+    def test_dry_run_should_only_report(self, drifted):
+        report = reconcile_counters(['post.likes_count'], dry_run=True)
+        assert report.rows_drifted == 5
+        assert Post.objects.filter(likes_count=7).count() == 5
+
+    def test_each_chunk_should_use_a_single_update(self, drifted):
+        reconciler = CounterReconciler(['post.likes_count'], chunk_size=2)
+        with CaptureQueriesContext(connection) as ctx:
+            report = reconciler.run()
+
+        updates = [query for query in ctx.captured_queries if query['sql'].startswith('UPDATE')]
+        assert len(updates) == report.counters[0].chunks
+        assert report.counters[0].rows_checked == len(drifted)
+        assert not Post.objects.filter(likes_count=7).exists()
+
+    def test_pks_should_restrict_the_reconciled_rows(self, drifted):
+        reconcile_counters(['post.likes_count'], pks=[drifted[0].pk])
+        assert Post.objects.get(pk=drifted[0].pk).likes_count == 1
+        assert Post.objects.filter(likes_count=7).count() == 4
+
+    def test_process_local_write_behind_should_refuse_repairs(self, settings, drifted):
+        settings.COUNTERS_WRITE_BEHIND = True
+        settings.COUNTERS_STORE = 'snapsapi.apps.core.counters.InMemoryCounterStore'
+
+        with pytest.raises(ImproperlyConfigured):
+            reconcile_counters(['post.likes_count'])
+        assert reconcile_counters(['post.likes_count'], dry_run=True).rows_drifted == 5
+        assert Post.objects.filter(likes_count=7).count() == 5
+
+    def test_unknown_counter_should_raise(self):
+        with pytest.raises(ValueError):
+            CounterReconciler(['post.views_count'])
+
+    def test_command_should_print_json_report(self, drifted):
+        out = StringIO()
+        call_command('reconcile_counters', '--counter', 'user.posts_count', '--json', stdout=out)
+        report = json.loads(out.getvalue())
+        assert report['rows_drifted'] == 1
+        assert report['counters'][0]['counter'] == 'user.posts_count'
@@ -0,0 +1,143 @@
+import io
+import json
+from unittest import mock
+from datetime import datetime, UTC
+
+import pytest
+from django.core.management import call_command
+from django.db.models import F
+
+from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core.models import Collection, Follow
+from snapsapi.apps.core.reconciliation import reconcile_counters
+from snapsapi.apps.core import seeding
+from snapsapi.apps.core.seeding import CopyLoader, DatasetSeeder, SeedConfig
+from snapsapi.apps.likes.models import PostLike
+from snapsapi.apps.posts.models import Post, PostImage, Tag
+from snapsapi.apps.search.backends import SimpleSearchBackend
+from snapsapi.apps.users.models import Profile, User
+
+SMALL = dict(users=40, follows_per_user=5, posts_per_user=3, tags=20, likes_per_post=4, comments_per_post=3,
+             collections_per_user=0.5)
+
+
+def snapshot():
+    return {
+        'users': list(User.objects.order_by('pk').values_list('uid', 'username', 'followers_count')),
+        'follows': list(Follow.objects.order_by('follower_id', 'following_id').values_list('follower_id', 'following_id')),
+        'posts': list(Post.objects.order_by('pk').values_list('uid', 'user_id', 'caption', 'likes_count', 'created_at')),
+        'comments': list(Comment.objects.order_by('path').values_list('uid', 'root_id', 'depth', 'path')),
+    }
+
+
+@pytest.mark.django_db
+class TestDatasetSeeder:
+    """Tests for the seed_dataset engine"""
+
+    def test_generates_every_entity_with_consistent_counters(self):
+        report = DatasetSeeder(SeedConfig(seed=1, **SMALL), chunk_size=50).run()
+
+        assert User.objects.count() == Profile.objects.count() == 40
+        assert Post.objects.count() == 120
+        assert report.rows['posts'] == 120
+        assert report.total == sum(report.rows.values())
+        for model in (Follow, PostImage, PostLike, Comment, Collection):
+            assert model.objects.exists()
+        assert not Follow.objects.filter(follower_id=F('following_id')).exists()
+        # counters were recomputed after the bulk load
+        assert reconcile_counters(dry_run=True).rows_drifted == 0
+
+    def test_comment_threads_are_consistent(self):
+        DatasetSeeder(SeedConfig(seed=2, **{**SMALL, 'comments_per_post': 8, 'reply_ratio': 0.6})).run()
+
+        replies = Comment.objects.filter(parent__isnull=False).select_related('parent')
+        assert replies.exists()
+        for reply in replies:
+            assert reply.root_id == reply.parent.root_id
+            assert reply.depth == reply.parent.depth + 1
+            assert reply.path.startswith(reply.parent.path)
+            assert reply.post_id == reply.parent.post_id
+        assert all(c.root_id == c.uid for c in Comment.objects.filter(parent__isnull=True))
+
+    def test_same_seed_produces_same_data(self):
+        DatasetSeeder(SeedConfig(seed=7, **SMALL)).run()
+        first = snapshot()
+        for model in (Comment, PostLike, PostImage, Post, Tag, Follow, Collection, Profile, User):
+            model.objects.all().delete()
+
+        DatasetSeeder(SeedConfig(seed=7, **SMALL)).run()
+        second = snapshot()
+
+        # ids continue after the deleted rows; everything else is identical
+        assert second['users'] == first['users']
+        assert [row[:1] + row[2:] for row in second['posts']] == [row[:1] + row[2:] for row in first['posts']]
+        assert [(row[0], row[2], row[3]) for row in second['comments']] == \
+               [(row[0], row[2], row[3]) for row in first['comments']]
+
+    def test_popularity_is_skewed(self):
+        DatasetSeeder(SeedConfig(seed=3, **{**SMALL, 'users': 200, 'follows_per_user': 10})).run()
+
+        followers = sorted(User.objects.values_list('followers_count', flat=True), reverse=True)
+        top_share = sum(followers[:20]) / sum(followers)
+        # the 10% most followed users have far more than 10% of the follows
+        assert top_share > 0.3
+
+    def test_search_documents_are_built_for_the_seeded_posts(self):
+        with mock.patch.object(SimpleSearchBackend, 'update_post_indexes') as update_post_indexes:
+            DatasetSeeder(SeedConfig(seed=4, **SMALL), chunk_size=50).run()
+
+        indexed = [pk for call in update_post_indexes.call_args_list for pk in call.args[0].values_list('pk', flat=True)]
+        assert sorted(indexed) == list(Post.objects.order_by('pk').values_list('pk', flat=True))
+        assert len(update_post_indexes.call_args_list) == 3
+
+    def test_command_prints_json_report(self):
+        out = io.StringIO()
+
+        call_command('seed_dataset', '--users', '10', '--posts-per-user', '1', '--loader', 'insert', '--json',
+                     stdout=out)
+
+        report = json.loads(out.getvalue())
+        assert report['rows']['users'] == 10
+        assert report['rows']['posts'] == 10
+
+
+class StubCursor:
+    def __init__(self):
+        self.cursor = self
+        self.sql = None
+        self.data = None
+
+    def copy_expert(self, sql, buffer):
+        self.sql = sql
+        self.data = buffer.read()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class TestCopyLoader:
+    """Tests for the COPY text format writer"""
+
+    def test_formats_rows_for_copy(self, monkeypatch):
+        cursor = StubCursor()
+
+        class StubConnection:
+            ops = seeding.connections['default'].ops
+
+            def cursor(self):
+                return cursor
+
+        monkeypatch.setattr(seeding, 'connections', {'default': StubConnection()})
+        created = datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+        CopyLoader().load(PostImage, ['post_id', 'url', 'order', 'is_active', 'created_at', 'variants', 'width'], [
+            (1, '/a\tb\\c\n.jpg', 0, True, created, [{'name': 'thumb'}], None),
+        ])
+
+        assert cursor.sql.startswith('COPY "posts_postimage" ("post_id", "url", "order", "is_active", "created_at"')
+        assert cursor.data == (
+            '1\t/a\\tb\\\\c\\n.jpg\t0\tt\t2025-01-02T03:04:05+00:00\t[{"name": "thumb"}]\t\\N\n'
+        )
@@ -0,0 +1,56 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from snapsapi.apps.core.models import Collection
+from snapsapi.apps.core.views import CollectionListCreateView
+from snapsapi.apps.posts.views import PostListCreateView
+
+
+def record_atomic_block(view_class, method_name):
+    """Patches a view method to record whether it runs inside a transaction."""
+    original = getattr(view_class, method_name)
+    in_atomic_block = []
+
+    def record(self, *args, **kwargs):
+        in_atomic_block.append(connection.in_atomic_block)
+        return original(self, *args, **kwargs)
+
+    return mock.patch.object(view_class, method_name, record), in_atomic_block
+
+
+# Without transaction=True the test itself runs in a transaction and every view is in an atomic block.
+@pytest.mark.django_db(transaction=True)
+class TestAtomicUnsafeMethodsMixin:
+    """Tests for the transaction policy of the API views"""
+
+    def test_list_runs_in_autocommit(self, api_client, post1):
+        patch, in_atomic_block = record_atomic_block(PostListCreateView, 'get_queryset')
+        with patch:
+            response = api_client.get(reverse('posts:posts-list-create'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert in_atomic_block == [False]
+
+    def test_create_runs_in_a_transaction(self, jwt_client):
+        patch, in_atomic_block = record_atomic_block(CollectionListCreateView, 'perform_create')
+        with patch:
+            response = jwt_client.post(reverse('collections-list-create'), {'name': 'trips'}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert in_atomic_block == [True]
+
+    def test_error_response_rolls_back_the_write(self, jwt_client):
+        def create_then_fail(self, serializer):
+            serializer.save()
+            raise ValidationError({'name': 'rejected after saving'})
+
+        with mock.patch.object(CollectionListCreateView, 'perform_create', create_then_fail):
+            response = jwt_client.post(reverse('collections-list-create'), {'name': 'trips'}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Collection.objects.filter(name='trips').exists()
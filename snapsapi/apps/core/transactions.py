@@ -0,0 +1,28 @@
+from django.db import transaction
+
+
+class AtomicUnsafeMethodsMixin:
+    """
+    Runs the unsafe methods (POST/PUT/PATCH/DELETE) of an API view in one transaction.
+
+    Safe methods only read, so they run in autocommit: a GET does not open a transaction and hold
+    its snapshot while the response is serialized, and its reads can go to a replica
+    (ReplicaRouter sends reads inside a transaction to the primary).
+    Side effects of a write (pushes, cache invalidation, search and timeline updates) are
+    registered with transaction.on_commit() and run only once the write has committed.
+
+    `atomic_methods` lists the methods wrapped in transaction.atomic(). Their writes are rolled
+    back when the view raises, including the exceptions rendered as error responses
+    (ValidationError, PermissionDenied, ...).
+    """
+    atomic_methods = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.atomic_methods:
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            response = super().dispatch(request, *args, **kwargs)
+            # DRF's exception handler only rolls back with ATOMIC_REQUESTS, which is off.
+            if getattr(response, 'exception', False):
+                transaction.set_rollback(True)
+            return response
@@ -2,6 +2,7 @@ from django.urls import path
 from snapsapi.apps.core.views import (
     # home,
     health_check,
+    metrics_view,
 )
 
 app_name = 'core'
@@ -11,4 +12,6 @@ urlpatterns = [
     # path('', home, name='home'),
     # 헬스체크 URL
     path('health/', health_check, name='health_check'),
+    # Prometheus 메트릭
+    path('metrics/', metrics_view, name='metrics'),
 ]
@@ -1,5 +1,7 @@
-from django.db import transaction
-from django.utils.decorators import method_decorator
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.db.models import Count, Max, Prefetch
 from django.utils.translation import gettext_lazy as _
 from drf_rw_serializers.generics import (
     GenericAPIView,
@@ -13,6 +15,7 @@ from rest_framework.decorators import api_view
 from rest_framework import status
 
 from django.contrib.auth import get_user_model
+from snapsapi.apps.core import metrics
 from snapsapi.apps.core.models import Collection, CollectionMember
 
 User = get_user_model()
@@ -21,7 +24,9 @@ from snapsapi.apps.core.serializers import (
     CollectionWriteSerializer,
     CollectionMemberSerializer,
 )
-from snapsapi.apps.core.pagination import StandardResultsSetPagination
+from snapsapi.apps.core.conditional import ConditionalGetMixin
+from snapsapi.apps.core.pagination import KeysetCursorPagination
+from snapsapi.apps.core.transactions import AtomicUnsafeMethodsMixin
 
 
 @api_view(['GET'])
@@ -45,15 +50,30 @@ def health_check(request):
     })
 
 
-@method_decorator(transaction.atomic, name='dispatch')
-class CollectionListCreateView(ListCreateAPIView):
+def metrics_view(request):
+    """
+    /core/metrics/ Prometheus 메트릭 엔드포인트 (text exposition format 0.0.4)
+    METRICS_TOKEN이 설정된 경우 `Authorization: Bearer <token>` 헤더가 필요합니다.
+    설정되지 않은 경우 METRICS_ALLOW_ANONYMOUS가 꺼져 있으면(운영 환경) 항상 403을 반환합니다.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.METRICS_ALLOW_ANONYMOUS:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class CollectionListCreateView(AtomicUnsafeMethodsMixin, ListCreateAPIView):
     """
     List and create collections.
     - GET /api/collections/ - List collections
     - POST /api/collections/ - Create a new collection
     """
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('-created_at', '-pk')
     read_serializer_class = CollectionReadSerializer
     write_serializer_class = CollectionWriteSerializer
 
@@ -71,14 +91,13 @@ class CollectionListCreateView(ListCreateAPIView):
         # Get collections where the user is a member
         member_collections = Collection.objects.get_collections_with_membership(user)
         # Combine the querysets
-        return (owned_collections | member_collections).distinct()
+        return (owned_collections | member_collections).distinct().select_related('owner')
 
 
-@method_decorator(transaction.atomic, name='dispatch')
-class CollectionDetailView(RetrieveUpdateDestroyAPIView):
+class CollectionDetailView(AtomicUnsafeMethodsMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a collection.
-    - GET /api/collections/{uid}/ - Retrieve a collection
+    - GET /api/collections/{uid}/ - Retrieve a collection (supports If-None-Match)
     - PATCH /api/collections/{uid}/ - Update a collection
     - DELETE /api/collections/{uid}/ - Delete a collection
     """
@@ -98,7 +117,23 @@ class CollectionDetailView(RetrieveUpdateDestroyAPIView):
         # Get collections where the user is a member
         member_collections = Collection.objects.get_collections_with_membership(user)
         # Combine the querysets
-        return (owned_collections | member_collections).distinct()
+        return (owned_collections | member_collections).distinct().select_related('owner').prefetch_related(
+            Prefetch('members', queryset=CollectionMember.objects.select_related('user'))
+        )
+
+    def get_etag_components(self, collection):
+        """
+        Adding/removing posts or members touches collection.updated_at (see core/models.py);
+        edits of the posts themselves are covered by their own updated_at.
+        No Last-Modified: username changes of the owner or members do not touch any timestamp,
+        so only the ETag can reflect them (as for PostDetailView).
+        """
+        posts = collection.posts.aggregate(last_updated=Max('updated_at'), total=Count('pk'))
+        members = list(collection.members.order_by('pk').values_list('user__uid', 'user__username'))
+        return [
+            collection.uid, collection.updated_at, collection.owner.uid, collection.owner.username,
+            posts['last_updated'], posts['total'], members,
+        ]
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -115,8 +150,7 @@ class CollectionDetailView(RetrieveUpdateDestroyAPIView):
         return Response({'detail': 'Collection soft deleted'}, status=status.HTTP_204_NO_CONTENT)
 
 
-@method_decorator(transaction.atomic, name='dispatch')
-class CollectionMemberView(GenericAPIView):
+class CollectionMemberView(AtomicUnsafeMethodsMixin, GenericAPIView):
     """
     Add or remove members from a collection.
     - POST /api/collections/{uid}/members/{user_uid}/ - Add a member to a collection
@@ -204,8 +238,7 @@ class CollectionMemberView(GenericAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-@method_decorator(transaction.atomic, name='dispatch')
-class CollectionAddPostView(GenericAPIView):
+class CollectionAddPostView(AtomicUnsafeMethodsMixin, GenericAPIView):
     """
     Add or remove posts from a collection.
     - POST /api/collections/{uid}/posts/{post_uid}/ - Add a post to a collection
@@ -288,8 +321,7 @@ class CollectionAddPostView(GenericAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-@method_decorator(transaction.atomic, name='dispatch')
-class DefaultCollectionAddPostView(GenericAPIView):
+class DefaultCollectionAddPostView(AtomicUnsafeMethodsMixin, GenericAPIView):
     """
     Toggle posts in the user's default collection.
     - POST /api/collections/posts/{post_uid}/ - Toggle a post in the default collection (add if not present, remove if present)
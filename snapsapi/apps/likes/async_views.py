@@ -0,0 +1,30 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+
+from snapsapi.apps.core.async_api import aget_object_or_404, async_api_view
+from snapsapi.apps.core.counters import get_counter_service
+from snapsapi.apps.posts.models import Post
+from .models import PostLike
+from .serializers import LikeResponseSerializer
+
+
+@async_api_view(['POST'])
+async def post_like_toggle(request, uid):
+    """
+    Async version of PostLikeToggleView: likes the post, or removes the like if it already exists.
+    """
+    post = await aget_object_or_404(Post, uid=uid)
+
+    like, created = await PostLike.objects.aget_or_create(user=request.user, post=post)
+
+    if not created:
+        await like.adelete()  # Delete if it already exists (unlike)
+
+    post.likes_count = await Post.objects.filter(pk=post.pk).values_list('likes_count', flat=True).aget()
+    # Buffered counter deltas may live in Redis.
+    likes_count = await sync_to_async(get_counter_service().value)(post, 'likes_count')
+    serializer = LikeResponseSerializer({
+        'likes_count': likes_count,
+        'is_liked': created
+    })
+    return JsonResponse(serializer.data)
@@ -6,6 +6,7 @@ import shortuuid
 
 from snapsapi.apps.posts.models import Post
 from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core.counters import get_counter_service
 from django.db.models.signals import post_save, post_delete
 
 from django.dispatch import receiver
@@ -50,20 +51,20 @@ class CommentLike(models.Model):
 @receiver(post_save, sender=PostLike)
 def increment_post_likes_count(sender, instance, created, **kwargs):
     if created:
-        Post.objects.filter(pk=instance.post_id).update(likes_count=models.F('likes_count') + 1)
+        get_counter_service().incr(Post, instance.post_id, 'likes_count')
 
 
 @receiver(post_delete, sender=PostLike)
 def decrement_post_likes_count(sender, instance, **kwargs):
-    Post.objects.filter(pk=instance.post_id, likes_count__gt=0).update(likes_count=models.F('likes_count') - 1)
+    get_counter_service().decr(Post, instance.post_id, 'likes_count')
 
 
 @receiver(post_save, sender=CommentLike)
 def increment_comment_likes_count(sender, instance, created, **kwargs):
     if created:
-        Comment.objects.filter(pk=instance.comment_id).update(likes_count=models.F('likes_count') + 1)
+        get_counter_service().incr(Comment, instance.comment_id, 'likes_count')
 
 
 @receiver(post_delete, sender=CommentLike)
 def decrement_comment_likes_count(sender, instance, **kwargs):
-    Comment.objects.filter(pk=instance.comment_id, likes_count__gt=0).update(likes_count=models.F('likes_count') - 1)
+    get_counter_service().decr(Comment, instance.comment_id, 'likes_count')
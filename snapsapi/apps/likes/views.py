@@ -6,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from snapsapi.apps.posts.models import Post
 from snapsapi.apps.comments.models import Comment
+from snapsapi.apps.core.counters import get_counter_service
 from .models import PostLike, CommentLike
 from .serializers import LikeResponseSerializer
 
@@ -26,9 +27,9 @@ class PostLikeToggleView(APIView):
         if not created:
             like.delete() # Delete if it already exists (unlike)
 
-        post.refresh_from_db()
+        post.refresh_from_db(fields=['likes_count'])
         serializer = LikeResponseSerializer({
-            'likes_count': post.likes_count,
+            'likes_count': get_counter_service().value(post, 'likes_count'),
             'is_liked': created
         })
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -50,9 +51,9 @@ class CommentLikeToggleView(APIView):
         if not created:
             like.delete() # Delete if it already exists (unlike)
 
-        comment.refresh_from_db()
+        comment.refresh_from_db(fields=['likes_count'])
         serializer = LikeResponseSerializer({
-            'likes_count': comment.likes_count,
+            'likes_count': get_counter_service().value(comment, 'likes_count'),
             'is_liked': created
         })
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from snapsapi.apps.notifications.models import NotificationOutbox
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'recipient', 'title', 'status', 'attempts', 'available_at', 'sent_at')
+    list_filter = ('status',)
+    raw_id_fields = ('recipient',)
@@ -0,0 +1,34 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework import status
+
+from snapsapi.apps.core.async_api import async_api_view, get_request_data
+from .models import FCMDevice
+from .tokens import invalidate_tokens
+
+
+@async_api_view(['POST'])
+async def register_device(request):
+    """디바이스 토큰 등록/갱신 API (register_device의 async 버전)"""
+    data = get_request_data(request)
+    registration_id = data.get('registration_id')
+    device_type = data.get('type', 'web')
+
+    if not registration_id:
+        return JsonResponse({'error': 'registration_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    device, created = await FCMDevice.objects.aupdate_or_create(
+        user=request.user,
+        registration_id=registration_id,
+        defaults={
+            'type': device_type,
+            'active': True
+        }
+    )
+    await sync_to_async(invalidate_tokens)([request.user.id])
+
+    return JsonResponse({
+        'id': device.id,
+        'registered': created,
+        'active': device.active
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from snapsapi.apps.notifications.outbox import OutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = 'Sends queued push notifications from the notification outbox through FCM.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Keep running and poll the outbox every N seconds. Drains it once when omitted.')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Outbox rows claimed per round (default: NOTIFICATION_OUTBOX_BATCH_SIZE).')
+
+    def handle(self, *args, **options):
+        dispatcher = OutboxDispatcher(batch_size=options['batch_size'])
+        interval = options['interval']
+        while True:
+            processed = dispatcher.dispatch_pending()
+            if options['verbosity'] > 1 or not interval:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} notifications.'))
+            if not interval:
+                return
+            time.sleep(interval)
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-17 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='actors',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='coalesce_key',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='event_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name='notificationoutbox',
+            index=models.Index(fields=['recipient', 'coalesce_key', 'status'], name='outbox_coalesce_idx'),
+        ),
+    ]
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from snapsapi.apps.core.counters import get_counter_service
+
+
+class NotificationOutboxManager(models.Manager):
+    def enqueue(self, recipient_id, title, body, data=None, coalesce_key='', actor=None, summary=None):
+        """
+        Writes a notification to the outbox. Call inside the transaction that creates
+        the event so the notification exists if and only if the event does.
+
+        With a `coalesce_key`, events for the same recipient and key are merged into one
+        pending row until it is sent: each event pushes the send time NOTIFICATION_COALESCE_WINDOW
+        seconds further (sliding window), but never beyond NOTIFICATION_COALESCE_MAX_DELAY
+        seconds after the first event.
+        :param recipient_id: User to notify
+        :param title: Notification title
+        :param body: Notification body for a single event
+        :param data: FCM data payload; values are converted to strings as FCM requires
+        :param coalesce_key: Grouping key, e.g. 'new_comment:<post uid>'
+        :param actor: Display name of the user who caused the event
+        :param summary: Body used once events are merged, formatted with {actor} (the first actor)
+            and {others} (the number of other distinct actors)
+        """
+        data = {str(key): str(value) for key, value in (data or {}).items()}
+        if not coalesce_key:
+            return self.create(recipient_id=recipient_id, title=title, body=body, data=data)
+
+        now = timezone.now()
+        window = timedelta(seconds=settings.NOTIFICATION_COALESCE_WINDOW)
+        max_delay = timedelta(seconds=settings.NOTIFICATION_COALESCE_MAX_DELAY)
+        with transaction.atomic():
+            pending = self.select_for_update().filter(
+                recipient_id=recipient_id,
+                coalesce_key=coalesce_key,
+                status=self.model.STATUS_PENDING,
+                created_at__gt=now - max_delay,
+            ).order_by('-created_at').first()
+            if pending is None:
+                return self.create(
+                    recipient_id=recipient_id, title=title, body=body, data=data,
+                    coalesce_key=coalesce_key, actors=[actor] if actor else [],
+                    available_at=now + window,
+                )
+
+            pending.event_count += 1
+            # Every distinct actor is kept (a row merges events for at most max_delay) so that
+            # "{others}" counts people, not events: three comments by one user are one actor.
+            if actor and actor not in pending.actors:
+                pending.actors = pending.actors + [actor]
+            pending.title = title
+            if summary and pending.actors:
+                pending.body = summary.format(actor=pending.actors[0], others=len(pending.actors) - 1)
+            else:
+                pending.body = body
+            pending.data = {**data, 'event_count': str(pending.event_count)}
+            pending.available_at = min(now + window, pending.created_at + max_delay)
+            pending.save(update_fields=['event_count', 'actors', 'title', 'body', 'data', 'available_at'])
+            return pending
+
+    def claim(self, batch_size, lease_timeout):
+        """
+        Claims up to `batch_size` due rows for this worker and marks them as sending.
+        Uses SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never claim the same row.
+        Rows left in `sending` longer than `lease_timeout` seconds (crashed worker) are claimed again.
+        :param batch_size: Maximum number of rows to claim
+        :param lease_timeout: Seconds after which a claimed row is considered abandoned
+        """
+        now = timezone.now()
+        due = Q(status=self.model.STATUS_PENDING, available_at__lte=now) | Q(
+            status=self.model.STATUS_SENDING, locked_at__lt=now - timedelta(seconds=lease_timeout)
+        )
+        with transaction.atomic():
+            ids = list(
+                self.select_for_update(skip_locked=True)
+                .filter(due)
+                .order_by('available_at', 'pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                return []
+            self.filter(pk__in=ids).update(
+                status=self.model.STATUS_SENDING,
+                locked_at=now,
+                attempts=F('attempts') + 1,
+            )
+        return list(self.filter(pk__in=ids).order_by('available_at', 'pk'))
+
+    def mark_sent(self, ids):
+        """Marks delivered rows as sent with one UPDATE."""
+        if not ids:
+            return 0
+        return self.filter(pk__in=ids).update(
+            status=self.model.STATUS_SENT, sent_at=timezone.now(), locked_at=None, last_error=''
+        )
+
+
+class NotificationManager(models.Manager):
+    def create_notification(self, recipient_id, type, title, body, data=None, actor=None):
+        """
+        Stores an inbox notification and increments the recipient's unread counter.
+        :param recipient_id: User receiving the notification
+        :param type: Notification type (Notification.TYPE_CHOICES)
+        :param title: Title shown in the inbox
+        :param body: Body shown in the inbox
+        :param data: Extra payload for the client (e.g. post/comment ids)
+        :param actor: User who caused the notification
+        """
+        notification = self.create(recipient_id=recipient_id, type=type, title=title, body=body,
+                                   data=data or {}, actor=actor)
+        get_counter_service().incr(get_user_model(), recipient_id, 'unread_notifications_count')
+        return notification
+
+    def mark_read(self, recipient, uids=None):
+        """
+        Marks unread notifications of a user as read with a single UPDATE and decrements
+        the unread counter by the number of rows actually changed.
+        :param recipient: Owner of the notifications
+        :param uids: Notification uids to mark; all unread notifications when None
+        :return: Number of notifications marked as read
+        """
+        queryset = self.filter(recipient=recipient, is_read=False)
+        if uids is not None:
+            queryset = queryset.filter(uid__in=uids)
+        marked = queryset.update(is_read=True, read_at=timezone.now())
+        if marked:
+            get_counter_service().decr(type(recipient), recipient.pk, 'unread_notifications_count', marked)
+        return marked
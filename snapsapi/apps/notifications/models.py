@@ -1,6 +1,12 @@
 # notifications/models.py
+import uuid
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+from snapsapi.apps.notifications.model_managers import NotificationManager, NotificationOutboxManager
+
 
 class FCMDevice(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='fcm_devices')
@@ -13,4 +19,89 @@ class FCMDevice(models.Model):
         unique_together = ('registration_id', 'user')
 
     def __str__(self):
-        return f"{self.user.username}'s {self.type} device"
\ No newline at end of file
+        return f"{self.user.username}'s {self.type} device"
+
+
+class NotificationOutbox(models.Model):
+    """
+    Push notifications waiting to be sent.
+    Rows are written in the same transaction as the event that caused them and sent
+    after commit by the outbox worker (`python manage.py send_notifications`).
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                  related_name='notification_outbox')
+    title = models.CharField(max_length=255)
+    body = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+    # 같은 수신자/키의 이벤트는 전송 전까지 한 행으로 합쳐진다 (예: 'new_comment:<post uid>')
+    coalesce_key = models.CharField(max_length=255, blank=True, default='')
+    event_count = models.PositiveIntegerField(default=1)
+    actors = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # 다음 전송 시도 가능 시각 (재시도 backoff)
+    available_at = models.DateTimeField(default=timezone.now)
+    # 워커가 행을 가져간 시각; 워커가 죽으면 lease 만료 후 다시 가져간다.
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = NotificationOutboxManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_status_available_idx'),
+            models.Index(fields=['recipient', 'coalesce_key', 'status'], name='outbox_coalesce_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} -> {self.recipient_id} ({self.status})"
+
+
+
+class Notification(models.Model):
+    """
+    Persistent in-app notification (inbox entry).
+    Unread notifications are counted in User.unread_notifications_count.
+    """
+    TYPE_NEW_COMMENT = 'new_comment'
+    TYPE_CHOICES = [
+        (TYPE_NEW_COMMENT, 'New comment'),
+    ]
+
+    uid = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                              related_name='+')
+    type = models.CharField(max_length=30, choices=TYPE_CHOICES)
+    title = models.CharField(max_length=255)
+    body = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+    is_read = models.BooleanField(default=False)
+    read_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = NotificationManager()
+
+    class Meta:
+        indexes = [
+            # 안 읽은 알림 목록 (?unread=true)
+            models.Index(fields=['recipient', 'is_read', 'created_at'], name='notification_inbox_unread_idx'),
+            # 전체 알림 목록
+            models.Index(fields=['recipient', 'created_at'], name='notification_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} -> {self.recipient_id}"
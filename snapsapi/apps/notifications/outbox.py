@@ -0,0 +1,166 @@
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from snapsapi.apps.core.metrics import PUSH_MESSAGES
+from snapsapi.apps.notifications.models import FCMDevice, NotificationOutbox
+from snapsapi.apps.notifications.tokens import get_active_tokens, invalidate_tokens
+
+logger = logging.getLogger(__name__)
+
+# FCM은 send_each 한 번에 최대 500개 메시지를 받는다.
+FCM_MAX_BATCH_SIZE = 500
+# 이 에러가 오면 토큰이 더 이상 유효하지 않으므로 기기를 비활성화한다.
+DEAD_TOKEN_ERRORS = ('UnregisteredError', 'SenderIdMismatchError')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class OutboxDispatcher:
+    """
+    Sends claimed outbox rows through FCM.
+    Every (row, device token) pair becomes one message; messages from many rows are sent
+    together with `messaging.send_each` in batches of up to 500. Delivery is at-least-once:
+    a row that hit a transient error is retried as a whole with exponential backoff.
+    """
+
+    def __init__(self, messaging=None, batch_size=None):
+        """
+        :param messaging: Module providing the firebase_admin.messaging API (replaceable in tests)
+        :param batch_size: Outbox rows claimed per round
+        """
+        if messaging is None:
+            from firebase_admin import messaging
+        self.messaging = messaging
+        self.batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+        self.max_attempts = settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+        self.retry_base_delay = settings.NOTIFICATION_OUTBOX_RETRY_BASE_DELAY
+        self.retry_max_delay = settings.NOTIFICATION_OUTBOX_RETRY_MAX_DELAY
+        self.lease_timeout = settings.NOTIFICATION_OUTBOX_LEASE_TIMEOUT
+        self.dead_token_errors = tuple(
+            getattr(self.messaging, name) for name in DEAD_TOKEN_ERRORS if hasattr(self.messaging, name)
+        )
+
+    def dispatch_once(self):
+        """
+        Claims one batch of due rows and sends it.
+        :return: Number of rows processed
+        """
+        rows = NotificationOutbox.objects.claim(self.batch_size, self.lease_timeout)
+        if rows:
+            self.send(rows)
+        return len(rows)
+
+    def dispatch_pending(self):
+        """Sends batches until no due rows are left. Returns the number of rows processed."""
+        total = 0
+        while processed := self.dispatch_once():
+            total += processed
+        return total
+
+    def send(self, rows):
+        tokens_by_user = get_active_tokens(row.recipient_id for row in rows)
+        pairs = [(row, token) for row in rows for token in tokens_by_user.get(row.recipient_id, ())]
+
+        errors = {}  # row pk -> 마지막 일시적 에러
+        dead_tokens = set()
+        for start in range(0, len(pairs), FCM_MAX_BATCH_SIZE):
+            chunk = pairs[start:start + FCM_MAX_BATCH_SIZE]
+            messages = [self.build_message(row, token) for row, token in chunk]
+            try:
+                batch_response = self.messaging.send_each(messages)
+            except Exception as e:
+                logger.error(f"FCM 배치 전송 중 예외 발생: {e}", exc_info=True)
+                PUSH_MESSAGES.inc(len(chunk), result='error')
+                for row, _ in chunk:
+                    errors[row.pk] = repr(e)
+                continue
+
+            logger.info(f"FCM 전송 결과: 성공 {batch_response.success_count}개, 실패 {batch_response.failure_count}개")
+            if batch_response.success_count:
+                PUSH_MESSAGES.inc(batch_response.success_count, result='success')
+            if batch_response.failure_count:
+                PUSH_MESSAGES.inc(batch_response.failure_count, result='failure')
+            for (row, token), response in zip(chunk, batch_response.responses):
+                if response.success:
+                    continue
+                if isinstance(response.exception, self.dead_token_errors):
+                    dead_tokens.add(token)
+                else:
+                    errors[row.pk] = repr(response.exception)
+
+        if dead_tokens:
+            devices = FCMDevice.objects.filter(registration_id__in=dead_tokens, active=True)
+            # 같은 토큰이 여러 사용자에게 등록됐을 수 있으므로 영향받는 사용자 캐시를 모두 비운다
+            affected_users = set(devices.values_list('user_id', flat=True))
+            devices.update(active=False)
+            invalidate_tokens(affected_users)
+            logger.warning(f"{len(dead_tokens)}개의 만료된 FCM 토큰을 비활성화 처리했습니다.")
+
+        NotificationOutbox.objects.mark_sent([row.pk for row in rows if row.pk not in errors])
+        self.schedule_retries([row for row in rows if row.pk in errors], errors)
+
+    def build_message(self, row, token):
+        messaging = self.messaging
+        full_url = urljoin(settings.BASE_FRONTEND_URL, row.data.get('url', '/'))
+        icon_url = urljoin(settings.BASE_FRONTEND_URL, '/assets/icons/icon-192x192.png')
+        return messaging.Message(
+            notification=messaging.Notification(title=row.title, body=row.body),
+            data=row.data,
+            token=token,
+            webpush=messaging.WebpushConfig(
+                notification=messaging.WebpushNotification(icon=icon_url),
+                fcm_options=messaging.WebpushFCMOptions(link=full_url)
+            )
+        )
+
+    def get_retry_delay(self, attempts):
+        """Exponential backoff with jitter, capped at NOTIFICATION_OUTBOX_RETRY_MAX_DELAY seconds."""
+        delay = min(self.retry_base_delay * 2 ** max(attempts - 1, 0), self.retry_max_delay)
+        return delay * random.uniform(0.5, 1.0)
+
+    def schedule_retries(self, rows, errors):
+        if not rows:
+            return
+        now = timezone.now()
+        for row in rows:
+            row.last_error = errors[row.pk]
+            row.locked_at = None
+            if row.attempts >= self.max_attempts:
+                row.status = NotificationOutbox.STATUS_FAILED
+                logger.error(f"FCM: outbox {row.pk} 전송을 {row.attempts}회 실패하여 포기합니다: {row.last_error}")
+            else:
+                row.status = NotificationOutbox.STATUS_PENDING
+                row.available_at = now + timedelta(seconds=self.get_retry_delay(row.attempts))
+        NotificationOutbox.objects.bulk_update(rows, ['status', 'available_at', 'locked_at', 'last_error'])
+
+
+def _dispatch_in_background():
+    close_old_connections()
+    try:
+        OutboxDispatcher().dispatch_pending()
+    except Exception as e:
+        logger.error(f"FCM outbox 즉시 전송 실패: {e}", exc_info=True)
+    finally:
+        close_old_connections()
+
+
+def dispatch_in_background():
+    """
+    Sends pending rows on a background thread of this process.
+    Used after commit when NOTIFICATION_OUTBOX_EAGER_DISPATCH is on; the worker command
+    still picks up anything this misses.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notification-outbox')
+    _executor.submit(_dispatch_in_background)
@@ -0,0 +1,45 @@
+from rest_framework import serializers
+
+from snapsapi.apps.notifications.models import Notification
+from snapsapi.apps.posts.viewer_state import VIEWER_STATE_CONTEXT_KEY, ViewerStateResolver
+from snapsapi.apps.users.serializers import UserSerializer
+
+
+class NotificationListSerializer(serializers.ListSerializer):
+    """
+    List serializer for NotificationSerializer.
+    Resolves the viewer's follow edges to the actors of the whole page in one query.
+    """
+
+    def to_representation(self, data):
+        notifications = list(data.all() if hasattr(data, 'all') else data)
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            actors = [notification.actor for notification in notifications if notification.actor_id]
+            self.context[VIEWER_STATE_CONTEXT_KEY] = ViewerStateResolver(request.user).resolve_users(actors)
+        return super().to_representation(notifications)
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """
+    Inbox notification (GET /notifications/).
+    """
+    actor = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Notification
+        list_serializer_class = NotificationListSerializer
+        fields = ['uid', 'type', 'title', 'body', 'data', 'actor', 'is_read', 'read_at', 'created_at']
+        read_only_fields = fields
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    """
+    Request body of POST /notifications/read/.
+    Marks the given notifications as read, or every unread notification when `uids` is omitted.
+    """
+    uids = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=500)
+
+
+class UnreadCountSerializer(serializers.Serializer):
+    unread_count = serializers.IntegerField()
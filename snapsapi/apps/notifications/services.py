@@ -3,14 +3,55 @@ import logging
 import firebase_admin
 from firebase_admin import credentials, messaging
 from django.conf import settings
+from django.db import transaction
 from urllib.parse import urljoin
 
-from snapsapi.apps.notifications.models import FCMDevice
+from snapsapi.apps.core.metrics import PUSH_MESSAGES
+from snapsapi.apps.notifications.models import FCMDevice, Notification, NotificationOutbox
+from snapsapi.apps.notifications.tokens import get_active_tokens, invalidate_tokens
 
 # 로거 인스턴스 생성
 logger = logging.getLogger(__name__)
 
 
+def enqueue_notification(user_id, title, body, data=None, coalesce_key='', actor=None, summary=None):
+    """
+    Queues a push notification for all active devices of a user.
+    The row is written in the caller's transaction and sent after commit by the outbox
+    worker (`python manage.py send_notifications`), or right after commit on a background
+    thread when NOTIFICATION_OUTBOX_EAGER_DISPATCH is on.
+    Events sharing a `coalesce_key` are merged into one push (see NotificationOutboxManager.enqueue).
+    """
+    notification = NotificationOutbox.objects.enqueue(user_id, title, body, data,
+                                                      coalesce_key=coalesce_key, actor=actor, summary=summary)
+    if settings.NOTIFICATION_OUTBOX_EAGER_DISPATCH:
+        from snapsapi.apps.notifications.outbox import dispatch_in_background
+        transaction.on_commit(dispatch_in_background)
+    return notification
+
+
+def notify(recipient, type, title, body, data=None, actor=None, coalesce_key='', summary=None):
+    """
+    Stores an inbox notification for `recipient` and queues the matching push.
+    Call inside the transaction that creates the event.
+    :param recipient: User to notify
+    :param type: Notification type (Notification.TYPE_CHOICES)
+    :param title: Title for the inbox entry and the push
+    :param body: Body for the inbox entry and the push
+    :param data: Payload for the client (e.g. post/comment ids)
+    :param actor: User who caused the notification
+    :param coalesce_key: Pushes sharing this key are merged (the inbox keeps one entry per event)
+    :param summary: Push body once pushes are merged, formatted with {actor} and {others}
+    """
+    data = {'type': type, **(data or {})}
+    notification = Notification.objects.create_notification(recipient.pk, type, title, body, data, actor=actor)
+    enqueue_notification(
+        recipient.pk, title, body, {**data, 'notification_id': notification.uid},
+        coalesce_key=coalesce_key, actor=actor.username if actor else None, summary=summary,
+    )
+    return notification
+
+
 class FCMService:
     _instance = None
 
@@ -33,8 +74,7 @@ class FCMService:
     def send_notifications_to_user(self, user_id, title, body, data=None):
         """특정 사용자의 모든 활성 디바이스에 알림을 한번에 전송"""
         logger.info(f"FCM: user_id '{user_id}'에 대한 알림 전송을 시작합니다.")
-        devices = FCMDevice.objects.filter(user_id=user_id, active=True)
-        tokens = [device.registration_id for device in devices]
+        tokens = get_active_tokens([user_id])[user_id]
 
         if not tokens:
             logger.warning(f"FCM: user_id '{user_id}'에 대한 활성 기기가 없어 알림을 보내지 않았습니다.")
@@ -56,10 +96,15 @@ class FCMService:
             )
         )
 
+        batch_response = None
         try:
             # send_multicast 대신 send_each_for_multicast 사용
             batch_response = messaging.send_each_for_multicast(message)
             logger.info(f"FCM 전송 결과: 성공 {batch_response.success_count}개, 실패 {batch_response.failure_count}개")
+            if batch_response.success_count:
+                PUSH_MESSAGES.inc(batch_response.success_count, result='success')
+            if batch_response.failure_count:
+                PUSH_MESSAGES.inc(batch_response.failure_count, result='failure')
 
             if batch_response.failure_count > 0:
                 failed_tokens = []
@@ -70,9 +115,12 @@ class FCMService:
                         logger.error(f"FCM 전송 실패: 토큰 '{failed_token}', 에러: {response.exception}")
                 if failed_tokens:
                     FCMDevice.objects.filter(registration_id__in=failed_tokens).update(active=False)
+                    invalidate_tokens([user_id])
                     logger.warning(f"{len(failed_tokens)}개의 만료된 FCM 토큰을 비활성화 처리했습니다.")
             return batch_response
         except Exception as e:
+            if batch_response is None:
+                PUSH_MESSAGES.inc(len(tokens), result='error')
             logger.error(f"FCM 알림 전송 중 예외 발생: {e}", exc_info=True)
             return None
 
@@ -0,0 +1,131 @@
+# tests/apps/notifications/test_coalescing.py
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from snapsapi.apps.notifications.models import FCMDevice, NotificationOutbox
+from snapsapi.apps.notifications.services import enqueue_notification
+from snapsapi.apps.notifications.tokens import get_active_tokens, invalidate_tokens
+from snapsapi.apps.posts.models import Post
+
+SUMMARY = '{actor}님 외 {others}명이 회원님의 게시물에 댓글을 남겼습니다.'
+
+
+def enqueue_comment(user, actor, key='new_comment:post-1'):
+    return enqueue_notification(user.id, '새 댓글 알림', f'{actor}님이 댓글을 남겼습니다.', {'type': 'new_comment'},
+                                coalesce_key=key, actor=actor, summary=SUMMARY)
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    # Stands in for the shared cache; the tests run in a single process.
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                   'LOCATION': 'notification-tokens'}}
+    settings.NOTIFICATION_DEVICE_TOKEN_CACHE = 'default'
+    caches['default'].clear()
+    return caches['default']
+
+
+@pytest.mark.django_db
+class TestNotificationCoalescing:
+    def test_events_are_merged_into_one_pending_row(self, user):
+        first = enqueue_comment(user, 'alice')
+        for i in range(37):
+            enqueue_comment(user, f'user{i}')
+
+        row = NotificationOutbox.objects.get()
+        assert row.pk == first.pk
+        assert row.event_count == 38
+        assert row.body == 'alice님 외 37명이 회원님의 게시물에 댓글을 남겼습니다.'
+        assert row.data['event_count'] == '38'
+        assert len(row.actors) == 38
+
+    def test_summary_counts_distinct_actors(self, user):
+        for actor in ['alice', 'bob', 'alice', 'bob', 'alice']:
+            enqueue_comment(user, actor)
+
+        row = NotificationOutbox.objects.get()
+        assert row.event_count == 5
+        assert row.body == 'alice님 외 1명이 회원님의 게시물에 댓글을 남겼습니다.'
+
+    def test_window_slides_but_is_capped_by_max_delay(self, user, settings):
+        settings.NOTIFICATION_COALESCE_WINDOW = 30
+        settings.NOTIFICATION_COALESCE_MAX_DELAY = 60
+        row = enqueue_comment(user, 'alice')
+        assert row.available_at > timezone.now() + timedelta(seconds=25)
+
+        # 첫 이벤트가 50초 전이었다면 전송 시각은 첫 이벤트 + 60초를 넘지 않는다
+        created_at = timezone.now() - timedelta(seconds=50)
+        NotificationOutbox.objects.filter(pk=row.pk).update(created_at=created_at)
+        row = enqueue_comment(user, 'bob')
+        assert row.available_at == created_at + timedelta(seconds=60)
+
+    def test_different_keys_and_sent_rows_are_not_merged(self, user):
+        first = enqueue_comment(user, 'alice', key='new_comment:post-1')
+        enqueue_comment(user, 'bob', key='new_comment:post-2')
+        NotificationOutbox.objects.mark_sent([first.pk])
+        enqueue_comment(user, 'carol', key='new_comment:post-1')
+
+        assert NotificationOutbox.objects.count() == 3
+        assert set(NotificationOutbox.objects.values_list('event_count', flat=True)) == {1}
+
+    def test_burst_of_comments_enqueues_one_notification(self, user):
+        post = Post.objects.create(user=user, caption='popular')
+        url = reverse('posts:comments-list-create', kwargs={'uid': post.uid})
+        for i in range(5):
+            commenter = user.__class__.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com',
+                                                           password='pw')
+            client = APIClient()
+            client.force_authenticate(user=commenter)
+            assert client.post(url, {'content': 'wow'}, format='json').status_code == 201
+
+        row = NotificationOutbox.objects.get()
+        assert row.event_count == 5
+        assert row.body.startswith('fan0님 외 4명')
+
+
+@pytest.mark.django_db
+class TestDeviceTokenCache:
+    def test_tokens_are_cached_per_user(self, user, fcm_device, locmem_cache):
+        assert get_active_tokens([user.id]) == {user.id: ['test_token_123']}
+
+        with CaptureQueriesContext(connection) as queries:
+            assert get_active_tokens([user.id]) == {user.id: ['test_token_123']}
+        assert len(queries) == 0
+
+    def test_users_without_devices_are_cached(self, user, locmem_cache):
+        assert get_active_tokens([user.id]) == {user.id: []}
+        with CaptureQueriesContext(connection) as queries:
+            get_active_tokens([user.id])
+        assert len(queries) == 0
+
+    def test_register_device_invalidates_cache(self, user, fcm_device, locmem_cache):
+        get_active_tokens([user.id])
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        client.post(reverse('notifications:fcm-device-register'),
+                    {'registration_id': 'new_token', 'type': 'ios'}, format='json')
+
+        assert sorted(get_active_tokens([user.id])[user.id]) == ['new_token', 'test_token_123']
+
+    def test_deactivated_tokens_are_dropped(self, user, fcm_device, locmem_cache):
+        get_active_tokens([user.id])
+        FCMDevice.objects.filter(pk=fcm_device.pk).update(active=False)
+        # 직접 update한 경우는 캐시가 남아 있고, 디스패처는 invalidate_tokens로 비운다
+        invalidate_tokens([user.id])
+
+        assert get_active_tokens([user.id]) == {user.id: []}
+
+    def test_tokens_are_not_cached_without_a_shared_cache(self, user, fcm_device, settings):
+        settings.NOTIFICATION_DEVICE_TOKEN_CACHE = None
+        assert get_active_tokens([user.id]) == {user.id: ['test_token_123']}
+
+        FCMDevice.objects.create(user=user, registration_id='rotated_token', type='android')
+        assert sorted(get_active_tokens([user.id])[user.id]) == ['rotated_token', 'test_token_123']
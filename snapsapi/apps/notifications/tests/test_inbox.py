@@ -0,0 +1,158 @@
+# tests/apps/notifications/test_inbox.py
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.core.reconciliation import reconcile_counters
+from snapsapi.apps.notifications.models import Notification, NotificationOutbox
+from snapsapi.apps.notifications.services import notify
+from snapsapi.apps.posts.models import Post
+
+User = get_user_model()
+
+
+@pytest.fixture
+def actor():
+    return User.objects.create_user(username='actor01', email='actor@example.com', password='pw')
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def notify_comment(recipient, actor, n=1):
+    return [
+        notify(recipient, Notification.TYPE_NEW_COMMENT, '새 댓글 알림', f'comment {i}',
+               data={'post_id': 'p'}, actor=actor)
+        for i in range(n)
+    ]
+
+
+def unread_count(user):
+    user.refresh_from_db()
+    return user.unread_notifications_count
+
+
+@pytest.mark.django_db
+class TestNotificationInbox:
+    def test_notify_stores_inbox_entry_and_queues_push(self, user, actor):
+        notification, = notify_comment(user, actor)
+
+        assert notification.data == {'type': 'new_comment', 'post_id': 'p'}
+        assert unread_count(user) == 1
+        push = NotificationOutbox.objects.get()
+        assert push.data['notification_id'] == str(notification.uid)
+
+    def test_comment_creates_inbox_entry(self, user, actor):
+        post = Post.objects.create(user=user, caption='post')
+        client = APIClient()
+        client.force_authenticate(user=actor)
+
+        client.post(reverse('posts:comments-list-create', kwargs={'uid': post.uid}), {'content': 'hi'}, format='json')
+
+        notification = Notification.objects.get(recipient=user)
+        assert notification.actor == actor
+        assert notification.type == Notification.TYPE_NEW_COMMENT
+        assert unread_count(user) == 1
+
+    def test_list_is_keyset_paginated(self, user, actor, api_client):
+        notify_comment(user, actor, 3)
+        url = reverse('notifications:notification-list')
+
+        response = api_client.get(url, {'page_size': 2})
+        assert response.status_code == 200
+        assert [item['body'] for item in response.data['results']] == ['comment 2', 'comment 1']
+        assert response.data['results'][0]['actor']['username'] == 'actor01'
+
+        response = api_client.get(response.data['next'])
+        assert [item['body'] for item in response.data['results']] == ['comment 0']
+        assert response.data['next'] is None
+
+    def test_list_resolves_actor_follow_state_in_one_query(self, user, actor, api_client):
+        url = reverse('notifications:notification-list')
+        notify_comment(user, actor)
+        with CaptureQueriesContext(connection) as one_row:
+            api_client.get(url)
+
+        for i in range(9):
+            other = User.objects.create_user(username=f'actor1{i}', email=f'actor1{i}@example.com', password='pw')
+            notify_comment(user, other)
+        Follow.objects.create(follower=user, following=actor)
+        with CaptureQueriesContext(connection) as ten_rows:
+            response = api_client.get(url)
+
+        assert len(response.data['results']) == 10
+        assert len(ten_rows) == len(one_row)
+        assert [item['actor']['is_following'] for item in response.data['results']] == [False] * 9 + [True]
+
+    def test_list_only_shows_own_notifications(self, user, actor, api_client):
+        notify_comment(actor, user)
+
+        response = api_client.get(reverse('notifications:notification-list'))
+        assert response.data['results'] == []
+
+    def test_unread_filter(self, user, actor, api_client):
+        first, second = notify_comment(user, actor, 2)
+        Notification.objects.mark_read(user, [first.uid])
+
+        response = api_client.get(reverse('notifications:notification-list'), {'unread': 'true'})
+        assert [item['uid'] for item in response.data['results']] == [str(second.uid)]
+
+    def test_unread_count_reads_counter_without_count_query(self, user, actor):
+        notify_comment(user, actor, 3)
+        user.refresh_from_db()
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('notifications:notification-unread-count'))
+
+        assert response.data == {'unread_count': 3}
+        assert not any('COUNT(' in query['sql'].upper() for query in queries)
+
+    def test_mark_selected_as_read_with_single_update(self, user, actor, api_client):
+        first, second, third = notify_comment(user, actor, 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(reverse('notifications:notification-mark-read'),
+                                       {'uids': [str(first.uid), str(second.uid)]}, format='json')
+
+        assert response.data == {'marked': 2}
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "notifications_notification"')]
+        assert len(updates) == 1
+        assert unread_count(user) == 1
+        first.refresh_from_db()
+        assert first.is_read and first.read_at is not None
+
+    def test_mark_all_and_repeat_does_not_double_decrement(self, user, actor, api_client):
+        notify_comment(user, actor, 3)
+        url = reverse('notifications:notification-mark-read')
+
+        assert api_client.post(url, {}, format='json').data == {'marked': 3}
+        assert api_client.post(url, {}, format='json').data == {'marked': 0}
+        assert unread_count(user) == 0
+
+    def test_cannot_mark_other_users_notifications(self, user, actor, api_client):
+        other, = notify_comment(actor, user)
+
+        response = api_client.post(reverse('notifications:notification-mark-read'),
+                                   {'uids': [str(other.uid)]}, format='json')
+
+        assert response.data == {'marked': 0}
+        other.refresh_from_db()
+        assert other.is_read is False
+
+    def test_unread_counter_is_reconciled(self, user, actor):
+        notify_comment(user, actor, 2)
+        User.objects.filter(pk=user.pk).update(unread_notifications_count=7)
+
+        reconcile_counters(['user.unread_notifications_count'])
+
+        assert unread_count(user) == 2
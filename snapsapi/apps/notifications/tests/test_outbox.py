@@ -0,0 +1,215 @@
+# tests/apps/notifications/test_outbox.py
+from datetime import timedelta
+from types import SimpleNamespace
+
+import firebase_admin
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from firebase_admin import messaging as fcm_messaging
+from rest_framework.test import APIClient
+
+from snapsapi.apps.core import metrics
+from snapsapi.apps.core.metrics import InMemoryMetricsStore
+from snapsapi.apps.notifications.models import FCMDevice, NotificationOutbox
+from snapsapi.apps.notifications.outbox import FCM_MAX_BATCH_SIZE, OutboxDispatcher
+from snapsapi.apps.notifications.services import enqueue_notification
+from snapsapi.apps.posts.models import Post
+
+
+class UnregisteredError(Exception):
+    pass
+
+
+class UnavailableError(Exception):
+    pass
+
+
+class StubMessaging:
+    """firebase_admin.messaging 대역: 메시지 클래스는 그대로 쓰고 전송만 가로챈다."""
+    Message = fcm_messaging.Message
+    Notification = fcm_messaging.Notification
+    WebpushConfig = fcm_messaging.WebpushConfig
+    WebpushNotification = fcm_messaging.WebpushNotification
+    WebpushFCMOptions = fcm_messaging.WebpushFCMOptions
+    UnregisteredError = UnregisteredError
+    SenderIdMismatchError = UnregisteredError
+
+    def __init__(self, failures=None, raise_error=None):
+        # failures: token -> exception
+        self.failures = failures or {}
+        self.raise_error = raise_error
+        self.batches = []
+
+    def send_each(self, messages):
+        self.batches.append(messages)
+        if self.raise_error:
+            raise self.raise_error
+        responses = []
+        for message in messages:
+            error = self.failures.get(message.token)
+            responses.append(SimpleNamespace(success=error is None, exception=error))
+        failure_count = sum(1 for response in responses if not response.success)
+        return SimpleNamespace(responses=responses, success_count=len(responses) - failure_count,
+                               failure_count=failure_count)
+
+
+@pytest.fixture
+def stub_messaging(monkeypatch):
+    stub = StubMessaging()
+    # 워커 커맨드도 같은 스텁을 쓰도록 기본 messaging 모듈을 교체
+    monkeypatch.setattr(firebase_admin, 'messaging', stub)
+    return stub
+
+
+@pytest.mark.django_db
+class TestNotificationOutbox:
+    def test_enqueue_stringifies_data(self, user):
+        notification = enqueue_notification(user.id, 'title', 'body', {'post_id': 1, 'type': 'new_comment'})
+
+        notification.refresh_from_db()
+        assert notification.status == NotificationOutbox.STATUS_PENDING
+        assert notification.data == {'post_id': '1', 'type': 'new_comment'}
+
+    def test_claim_skips_rows_that_are_not_due(self, user):
+        due = NotificationOutbox.objects.enqueue(user.id, 'due', 'body')
+        NotificationOutbox.objects.create(recipient=user, title='later', body='body',
+                                          available_at=timezone.now() + timedelta(minutes=5))
+
+        claimed = NotificationOutbox.objects.claim(batch_size=10, lease_timeout=300)
+
+        assert [row.pk for row in claimed] == [due.pk]
+        assert claimed[0].status == NotificationOutbox.STATUS_SENDING
+        assert claimed[0].attempts == 1
+        assert NotificationOutbox.objects.claim(batch_size=10, lease_timeout=300) == []
+
+    def test_claim_reclaims_expired_lease(self, user):
+        row = NotificationOutbox.objects.create(recipient=user, title='t', body='b',
+                                                status=NotificationOutbox.STATUS_SENDING,
+                                                locked_at=timezone.now() - timedelta(minutes=10), attempts=1)
+
+        claimed = NotificationOutbox.objects.claim(batch_size=10, lease_timeout=300)
+
+        assert [r.pk for r in claimed] == [row.pk]
+        assert claimed[0].attempts == 2
+
+
+@pytest.mark.django_db
+class TestOutboxDispatcher:
+    def test_sends_each_token_and_marks_sent(self, user, fcm_device, stub_messaging):
+        FCMDevice.objects.create(user=user, registration_id='second_token', type='android')
+        row = enqueue_notification(user.id, '새 댓글 알림', 'body', {'type': 'new_comment'})
+
+        processed = OutboxDispatcher(messaging=stub_messaging).dispatch_pending()
+
+        assert processed == 1
+        assert len(stub_messaging.batches) == 1
+        assert {message.token for message in stub_messaging.batches[0]} == {'test_token_123', 'second_token'}
+        row.refresh_from_db()
+        assert row.status == NotificationOutbox.STATUS_SENT
+        assert row.sent_at is not None
+
+    def test_messages_are_batched_up_to_fcm_limit(self, user, stub_messaging):
+        FCMDevice.objects.bulk_create([
+            FCMDevice(user=user, registration_id=f'token_{i}', type='web') for i in range(FCM_MAX_BATCH_SIZE + 1)
+        ])
+        enqueue_notification(user.id, 'title', 'body')
+
+        OutboxDispatcher(messaging=stub_messaging).dispatch_pending()
+
+        assert [len(batch) for batch in stub_messaging.batches] == [FCM_MAX_BATCH_SIZE, 1]
+
+    def test_dead_tokens_are_deactivated_in_bulk(self, user, fcm_device, stub_messaging):
+        stub_messaging.failures = {'test_token_123': UnregisteredError('gone')}
+        row = enqueue_notification(user.id, 'title', 'body')
+
+        OutboxDispatcher(messaging=stub_messaging).dispatch_pending()
+
+        fcm_device.refresh_from_db()
+        row.refresh_from_db()
+        assert fcm_device.active is False
+        assert row.status == NotificationOutbox.STATUS_SENT
+
+    def test_transient_error_is_retried_with_backoff(self, user, fcm_device, stub_messaging, settings):
+        settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 2
+        stub_messaging.failures = {'test_token_123': UnavailableError('try again')}
+        row = enqueue_notification(user.id, 'title', 'body')
+        dispatcher = OutboxDispatcher(messaging=stub_messaging)
+
+        assert dispatcher.dispatch_pending() == 1
+
+        row.refresh_from_db()
+        fcm_device.refresh_from_db()
+        assert row.status == NotificationOutbox.STATUS_PENDING
+        assert row.available_at > timezone.now()
+        assert 'try again' in row.last_error
+        assert fcm_device.active is True
+
+        # backoff가 끝난 뒤 두 번째 실패에서 포기
+        NotificationOutbox.objects.filter(pk=row.pk).update(available_at=timezone.now())
+        dispatcher.dispatch_pending()
+        row.refresh_from_db()
+        assert row.status == NotificationOutbox.STATUS_FAILED
+        assert row.attempts == 2
+
+    def test_send_exception_keeps_rows_for_retry(self, user, fcm_device):
+        stub = StubMessaging(raise_error=UnavailableError('network down'))
+        row = enqueue_notification(user.id, 'title', 'body')
+
+        OutboxDispatcher(messaging=stub).dispatch_pending()
+
+        row.refresh_from_db()
+        assert row.status == NotificationOutbox.STATUS_PENDING
+        assert row.attempts == 1
+
+    def test_push_messages_are_counted_by_outcome(self, user, fcm_device, monkeypatch):
+        store = InMemoryMetricsStore()
+        monkeypatch.setattr(metrics, '_store_cache', {metrics.DEFAULT_STORE: store})
+        FCMDevice.objects.create(user=user, registration_id='dead_token', type='android')
+        enqueue_notification(user.id, 'title', 'body')
+        OutboxDispatcher(messaging=StubMessaging(failures={'dead_token': UnregisteredError('gone')})).dispatch_pending()
+
+        enqueue_notification(user.id, 'title', 'body')
+        OutboxDispatcher(messaging=StubMessaging(raise_error=UnavailableError('network down'))).dispatch_pending()
+
+        text = metrics.registry.render()
+        assert 'snapsapi_push_messages_total{result="success"} 1' in text
+        assert 'snapsapi_push_messages_total{result="failure"} 1' in text
+        assert 'snapsapi_push_messages_total{result="error"} 1' in text
+
+    def test_retry_delay_is_capped(self, settings):
+        settings.NOTIFICATION_OUTBOX_RETRY_BASE_DELAY = 30
+        settings.NOTIFICATION_OUTBOX_RETRY_MAX_DELAY = 100
+        dispatcher = OutboxDispatcher(messaging=StubMessaging())
+
+        assert 15 <= dispatcher.get_retry_delay(1) <= 30
+        assert dispatcher.get_retry_delay(10) <= 100
+
+    def test_worker_command_drains_outbox(self, user, fcm_device, stub_messaging):
+        enqueue_notification(user.id, 'title', 'body')
+        enqueue_notification(user.id, 'title', 'body')
+
+        call_command('send_notifications', '--batch-size', '1', verbosity=0)
+
+        assert NotificationOutbox.objects.filter(status=NotificationOutbox.STATUS_SENT).count() == 2
+        assert len(stub_messaging.batches) == 2
+
+
+@pytest.mark.django_db
+class TestCommentNotification:
+    def test_comment_enqueues_notification_without_sending(self, user, fcm_device, stub_messaging):
+        commenter = user.__class__.objects.create_user(username='commenter', email='c@example.com', password='pw')
+        post = Post.objects.create(user=user, caption='post')
+        client = APIClient()
+        client.force_authenticate(user=commenter)
+
+        response = client.post(reverse('posts:comments-list-create', kwargs={'uid': post.uid}),
+                               {'content': 'hello'}, format='json')
+
+        assert response.status_code == 201
+        assert stub_messaging.batches == []
+        row = NotificationOutbox.objects.get()
+        assert row.recipient_id == user.id
+        assert row.data['type'] == 'new_comment'
+        assert row.data['comment_id'] == response.data['uid']
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from snapsapi.apps.core.metrics import record_cache_lookups
+from snapsapi.apps.notifications.models import FCMDevice
+
+TOKEN_CACHE_KEY = 'notifications:fcm_tokens:{user_id}'
+
+
+def get_token_cache():
+    """Cache of the device tokens, or None when NOTIFICATION_DEVICE_TOKEN_CACHE is unset."""
+    alias = settings.NOTIFICATION_DEVICE_TOKEN_CACHE
+    return caches[alias] if alias else None
+
+
+def load_active_tokens(user_ids):
+    tokens_by_user = {user_id: [] for user_id in user_ids}
+    devices = FCMDevice.objects.filter(user_id__in=user_ids, active=True).values_list('user_id', 'registration_id')
+    for user_id, token in devices:
+        tokens_by_user[user_id].append(token)
+    return tokens_by_user
+
+
+def get_active_tokens(user_ids):
+    """
+    Returns {user_id: [registration_id, ...]} of active devices for the given users.
+    Cached per user (including users without devices) when NOTIFICATION_DEVICE_TOKEN_CACHE is set;
+    cache misses are loaded with one query.
+    :param user_ids: Iterable of user ids
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    cache = get_token_cache()
+    if cache is None:
+        return load_active_tokens(user_ids)
+    keys = {TOKEN_CACHE_KEY.format(user_id=user_id): user_id for user_id in user_ids}
+    cached = cache.get_many(keys.keys())
+    tokens_by_user = {keys[key]: tokens for key, tokens in cached.items()}
+
+    missing = user_ids - tokens_by_user.keys()
+    record_cache_lookups('device_tokens', len(tokens_by_user), len(missing))
+    if missing:
+        loaded = load_active_tokens(missing)
+        cache.set_many(
+            {TOKEN_CACHE_KEY.format(user_id=user_id): tokens for user_id, tokens in loaded.items()},
+            settings.NOTIFICATION_DEVICE_TOKEN_CACHE_TIMEOUT,
+        )
+        tokens_by_user.update(loaded)
+    return tokens_by_user
+
+
+def invalidate_tokens(user_ids):
+    """Drops cached tokens after devices are registered, updated or deactivated."""
+    cache = get_token_cache()
+    if cache is not None:
+        cache.delete_many([TOKEN_CACHE_KEY.format(user_id=user_id) for user_id in set(user_ids)])
@@ -1,7 +1,12 @@
 from django.urls import path
 from rest_framework.urlpatterns import format_suffix_patterns
 
-from snapsapi.apps.notifications.views import register_device
+from snapsapi.apps.notifications.views import (
+    register_device,
+    NotificationListView,
+    NotificationUnreadCountView,
+    NotificationMarkReadView,
+)
 
 app_name = 'notifications'
 
@@ -9,4 +14,7 @@ urlpatterns = []
 
 urlpatterns += [
     path('devices/', register_device, name='fcm-device-register'),
+    path('', NotificationListView.as_view(), name='notification-list'),
+    path('unread-count/', NotificationUnreadCountView.as_view(), name='notification-unread-count'),
+    path('read/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
 ]
\ No newline at end of file
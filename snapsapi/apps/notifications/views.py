@@ -1,9 +1,18 @@
 # notifications/views.py
+from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
+from rest_framework import serializers
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import FCMDevice
+from rest_framework.views import APIView
+
+from snapsapi.apps.core.counters import get_counter_service
+from snapsapi.apps.core.pagination import KeysetCursorPagination
+from .models import FCMDevice, Notification
+from .serializers import NotificationMarkReadSerializer, NotificationSerializer, UnreadCountSerializer
+from .tokens import invalidate_tokens
 
 
 @api_view(['POST'])
@@ -24,9 +33,72 @@ def register_device(request):
             'active': True
         }
     )
+    invalidate_tokens([request.user.id])
 
     return Response({
         'id': device.id,
         'registered': created,
         'active': device.active
     }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class NotificationPagination(KeysetCursorPagination):
+    always_use_cursor = True
+
+
+class NotificationListView(ListAPIView):
+    """
+    In-app notification inbox of the requesting user, newest first.
+    - GET /notifications/?cursor=...&unread=true
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = NotificationSerializer
+    pagination_class = NotificationPagination
+    cursor_ordering = ('-created_at', '-pk')
+
+    @extend_schema(
+        summary="알림함 조회",
+        parameters=[OpenApiParameter('unread', bool, description='true면 읽지 않은 알림만 조회')],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(recipient=self.request.user) \
+            .select_related('actor', 'actor__profile')
+        if self.request.query_params.get('unread') in ('true', '1'):
+            queryset = queryset.filter(is_read=False)
+        return queryset
+
+
+class NotificationUnreadCountView(APIView):
+    """
+    Unread notification count, read from the maintained counter on the user row (no COUNT query).
+    - GET /notifications/unread-count/
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(summary="읽지 않은 알림 수", responses=UnreadCountSerializer)
+    def get(self, request, *args, **kwargs):
+        unread_count = get_counter_service().value(request.user, 'unread_notifications_count')
+        return Response({'unread_count': unread_count})
+
+
+class NotificationMarkReadView(APIView):
+    """
+    Marks notifications as read with a single UPDATE.
+    - POST /notifications/read/ {"uids": [...]}  (all unread notifications when `uids` is omitted)
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="알림 읽음 처리",
+        request=NotificationMarkReadSerializer,
+        responses=inline_serializer(name='NotificationMarkReadResponse',
+                                    fields={'marked': serializers.IntegerField()}),
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        marked = Notification.objects.mark_read(request.user, serializer.validated_data.get('uids'))
+        return Response({'marked': marked})
@@ -1,12 +1,33 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import ImproperlyConfigured
 
 # Register your models here.
 from snapsapi.apps.posts.models import Post, Tag, PostImage
+from snapsapi.apps.core.reconciliation import reconcile_counters
+
+
+@admin.action(description="Reconcile likes/comments counts")
+def reconcile_post_counters(modeladmin, request, queryset):
+    """
+    Action to reconcile likes_count and comments_count of the selected posts.
+    """
+    try:
+        report = reconcile_counters(('post.likes_count', 'post.comments_count'),
+                                    pks=queryset.values_list('pk', flat=True))
+    except ImproperlyConfigured as e:
+        messages.error(request, str(e))
+        return
+    fixed = report.rows_drifted
+    if fixed:
+        messages.success(request, f"Successfully fixed {fixed} post counters.")
+    else:
+        messages.info(request, "No posts needed their counters updated.")
 
 
 class PostImageInline(admin.TabularInline):
     model = PostImage
     extra = 1
+    readonly_fields = ('width', 'height', 'variants', 'processed_at')
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -14,6 +35,7 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'is_deleted', 'is_public', 'created_at')
     search_fields = ('caption', 'user__username')
     inlines = [PostImageInline]
+    actions = [reconcile_post_counters]
 
     def caption_preview(self, obj):
         return obj.caption[:50] + '...' if len(obj.caption) > 50 else obj.caption
@@ -0,0 +1,31 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+
+from snapsapi.apps.core.async_api import async_api_view, get_request_data
+from snapsapi.apps.posts.serializers import PresignedURLRequestSerializer
+from snapsapi.utils.aws import create_presigned_posts, build_posts_image_object_name
+
+
+@async_api_view(['POST'])
+async def post_image_upload_url(request):
+    """
+    Async version of PostImageUploadURLView: presigned S3 POST policies for post images.
+    """
+    serializer = PresignedURLRequestSerializer(data=get_request_data(request))
+    serializer.is_valid(raise_exception=True)
+    file_names = [file_info.get('file_name') for file_info in serializer.validated_data['files']]
+
+    object_names = [build_posts_image_object_name(request.user.uid, file_name) for file_name in file_names]
+    # Signing is offline, but refreshing role credentials is a network call; it needs no
+    # database connection, so it can run outside the request's thread-sensitive executor.
+    presigned_urls = await sync_to_async(create_presigned_posts, thread_sensitive=False)(
+        settings.AWS_S3_MEDIA_BUCKET_NAME,
+        object_names,
+        expiration=settings.AWS_S3_PRESIGNED_URL_POST_EXPIRATION
+    ) or [None] * len(file_names)
+    results = [
+        {"file_name": file_name, "presigned_url": presigned_url}
+        for file_name, presigned_url in zip(file_names, presigned_urls)
+    ]
+    return JsonResponse({"results": results})
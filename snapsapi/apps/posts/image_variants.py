@@ -0,0 +1,236 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from PIL import Image, ImageOps
+
+if TYPE_CHECKING:
+    from snapsapi.apps.posts.models import PostImage
+
+logger = logging.getLogger(__name__)
+
+# EXIF Orientation 값 5~8은 90도 회전이므로 가로/세로가 바뀐다.
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class LocalImageStorage(FileSystemStorage):
+    """
+    Local filesystem stand-in for the S3 media bucket.
+    Object keys are used as relative paths (media/posts/...), exactly as in the bucket.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # S3 overwrites objects with the same key; re-processing an image does the same here.
+        if self.exists(name):
+            self.delete(name)
+        return name
+
+
+def get_image_storage():
+    """Returns the storage holding uploaded post images (settings.POST_IMAGE_STORAGE)."""
+    return import_string(settings.POST_IMAGE_STORAGE)(**settings.POST_IMAGE_STORAGE_OPTIONS)
+
+
+def get_object_key(url: str) -> str:
+    """PostImage.url is the object key with a leading slash."""
+    return url.lstrip('/')
+
+
+def build_variant_key(key: str, name: str, fmt: str) -> str:
+    root, _ = os.path.splitext(key)
+    return f"{root}_{name}.{fmt.lower()}"
+
+
+def pick_variant_url(url: str | None, variants: list[dict[str, Any]] | None, width: int | None = None) -> str | None:
+    """
+    Returns the URL of the smallest variant that is at least `width` pixels wide,
+    or the original URL when the image has no such variant (not processed yet or already small).
+    :param url: Original image URL
+    :param variants: PostImage.variants
+    :param width: Display width in pixels (default: settings.POST_IMAGE_GRID_WIDTH)
+    """
+    width = width or settings.POST_IMAGE_GRID_WIDTH
+    suitable = [variant for variant in variants or [] if variant['width'] >= width]
+    if not suitable:
+        return url
+    return min(suitable, key=lambda variant: variant['width'])['url']
+
+
+class ImageVariantProcessor:
+    """
+    Generates resized WebP variants of uploaded post images.
+
+    Each variant in `settings.POST_IMAGE_VARIANTS` ({name: longest side in pixels}) smaller than
+    the original is written next to it as `<key>_<name>.webp`. Storage reads, decoding, resizing
+    and encoding run in a thread pool (Pillow releases the GIL for the heavy parts); the results
+    are written back with a single bulk_update.
+    """
+
+    def __init__(self, storage=None, variants: dict[str, int] | None = None, max_workers: int | None = None):
+        """
+        :param storage: Django storage holding the originals (default: get_image_storage())
+        :param variants: {name: longest side} (default: settings.POST_IMAGE_VARIANTS)
+        :param max_workers: Size of the worker pool (default: settings.POST_IMAGE_WORKERS)
+        """
+        self.storage = storage or get_image_storage()
+        self.variants = variants or settings.POST_IMAGE_VARIANTS
+        self.max_workers = max_workers or settings.POST_IMAGE_WORKERS
+        self.format = settings.POST_IMAGE_VARIANT_FORMAT
+        self.quality = settings.POST_IMAGE_VARIANT_QUALITY
+
+    def render(self, url: str) -> tuple[int, int, list[dict[str, Any]]] | None:
+        """
+        Creates the variants of one original. Does not touch the database.
+        :param url: PostImage.url of the original
+        :return: (width, height, variants), or None if the original has not been uploaded yet
+        """
+        key = get_object_key(url)
+        if not self.storage.exists(key):
+            return None
+        with self.storage.open(key, 'rb') as f:
+            image = Image.open(f)
+            width, height = image.size
+            if image.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+                width, height = height, width
+            sizes = sorted(
+                ((name, size) for name, size in self.variants.items() if size < max(width, height)),
+                key=lambda item: item[1],
+            )
+            if sizes:
+                # JPEG는 디코딩 단계에서 축소할 수 있으므로 가장 큰 변형 크기 이상으로만 디코딩한다.
+                image.draft('RGB', (sizes[-1][1], sizes[-1][1]))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+            variants = []
+            # 큰 변형부터 만들고, 더 작은 변형은 직전 결과에서 줄인다.
+            source = image
+            for name, size in reversed(sizes):
+                variant = source.copy()
+                variant.thumbnail((size, size), Image.LANCZOS)
+                buffer = io.BytesIO()
+                variant.save(buffer, format=self.format, quality=self.quality, method=4)
+                variant_key = build_variant_key(key, name, self.format)
+                self.storage.save(variant_key, ContentFile(buffer.getvalue()))
+                variants.append({
+                    'name': name,
+                    'url': f'/{variant_key}',
+                    'width': variant.width,
+                    'height': variant.height,
+                    'format': self.format.lower(),
+                })
+                source = variant
+        variants.reverse()
+        return width, height, variants
+
+    def _render(self, url: str):
+        try:
+            return self.render(url)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            logger.warning(f"이미지 변형 생성 실패 ({url}): {e}")
+            # 손상된 이미지는 다시 시도하지 않는다. 원본만 제공된다.
+            return 0, 0, []
+
+    def process(self, images: Iterable['PostImage']) -> int:
+        """
+        Renders the variants of the given images and stores them on the rows.
+        Images whose original is not in the storage yet are left for a later run.
+        :return: Number of images processed
+        """
+        from snapsapi.apps.posts.models import Post, PostImage
+        from snapsapi.apps.posts.representation_cache import get_post_representation_cache
+
+        images = list(images)
+        if not images:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(images)),
+                                thread_name_prefix='post-image-variants') as executor:
+            results = list(executor.map(self._render, [image.url for image in images]))
+
+        now = timezone.now()
+        processed = []
+        for image, result in zip(images, results):
+            if result is None:
+                continue
+            width, height, variants = result
+            image.width, image.height, image.variants = width or None, height or None, variants
+            image.processed_at = now
+            processed.append(image)
+        post_ids = {image.post_id for image in processed}
+        with transaction.atomic():
+            PostImage.objects.bulk_update(processed, ['width', 'height', 'variants', 'processed_at'])
+            # 게시물/프로필/컬렉션 ETag는 게시물의 updated_at으로 만들어지므로 변형이 응답에 반영되도록 갱신한다.
+            Post.objects.filter(pk__in=post_ids).update(updated_at=now)
+        # bulk_update는 시그널을 보내지 않으므로 게시물 표현 캐시를 직접 무효화한다.
+        get_post_representation_cache().invalidate_posts(post_ids)
+        return len(processed)
+
+    def process_pending(self, batch_size: int | None = None) -> int:
+        """
+        Processes every image that has no variants yet, in batches of `batch_size`, oldest first.
+        Images whose original is still missing are skipped until the next run.
+        :return: Number of images processed
+        """
+        from snapsapi.apps.posts.models import PostImage
+
+        batch_size = batch_size or settings.POST_IMAGE_BATCH_SIZE
+        pending = PostImage.objects.filter(processed_at__isnull=True, is_deleted=False).order_by('pk')
+        total, last_pk = 0, 0
+        while images := list(pending.filter(pk__gt=last_pk)[:batch_size]):
+            total += self.process(images)
+            last_pk = images[-1].pk
+        return total
+
+
+def _process_in_background(image_ids: list[int]):
+    from snapsapi.apps.posts.models import PostImage
+
+    close_old_connections()
+    try:
+        ImageVariantProcessor().process(PostImage.objects.filter(pk__in=image_ids, processed_at__isnull=True))
+    except Exception as e:
+        logger.error(f"이미지 변형 생성 실패: {e}", exc_info=True)
+    finally:
+        close_old_connections()
+
+
+def schedule_processing(post) -> None:
+    """
+    Queues variant generation for the unprocessed images of the post once the current
+    transaction commits, if POST_IMAGE_PROCESS_ON_COMMIT is on.
+    """
+    if not settings.POST_IMAGE_PROCESS_ON_COMMIT:
+        return
+    image_ids = list(post.images.filter(processed_at__isnull=True).values_list('pk', flat=True))
+    if image_ids:
+        transaction.on_commit(lambda: process_in_background(image_ids))
+
+
+def process_in_background(image_ids: Iterable[int]) -> None:
+    """
+    Generates variants for the given images on a background thread of this process.
+    Used after commit when POST_IMAGE_PROCESS_ON_COMMIT is on; `process_post_images` picks up
+    anything this misses.
+    """
+    global _executor
+    image_ids = list(image_ids)
+    if not image_ids:
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='post-image-pipeline')
+    _executor.submit(_process_in_background, image_ids)
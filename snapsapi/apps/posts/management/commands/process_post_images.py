@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from snapsapi.apps.posts.image_variants import ImageVariantProcessor
+
+
+class Command(BaseCommand):
+    help = 'Generates resized WebP variants of uploaded post images that have not been processed yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Keep running and look for new images every N seconds. Processes the backlog once when omitted.')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Images processed per round (default: POST_IMAGE_BATCH_SIZE).')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Images processed in parallel (default: POST_IMAGE_WORKERS).')
+
+    def handle(self, *args, **options):
+        processor = ImageVariantProcessor(max_workers=options['workers'])
+        interval = options['interval']
+        while True:
+            processed = processor.process_pending(options['batch_size'])
+            if options['verbosity'] > 1 or not interval:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} images.'))
+            if not interval:
+                return
+            time.sleep(interval)
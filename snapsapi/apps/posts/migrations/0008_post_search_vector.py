@@ -0,0 +1,19 @@
+# Generated by Django 4.2.16 on 2026-10-17 17:58
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_alter_collectionmember_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, help_text='캡션과 태그로 구성된 전문 검색용 tsvector', null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.16 on 2026-10-17 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=list, help_text="[{'name', 'url', 'width', 'height', 'format'}], 작은 것부터"),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
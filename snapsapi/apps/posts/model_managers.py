@@ -21,11 +21,12 @@ class PostManager(models.Manager):
         :param extra_fields: Additional Post fields (e.g., is_deleted, is_active)
         :return: The created Post object
         """
-        from snapsapi.apps.posts.models import PostImage
+        from snapsapi.apps.posts.models import Tag
         post = self.create(user=user, caption=caption, **extra_fields)
-        for idx, url in enumerate(images):
-            PostImage.objects.create(post=post, url=f'/{url}', order=idx)
-        post.update_tags(tags)
+        post.attach_images(images)
+        if tags:
+            # 새 게시물에는 기존 태그가 없으므로 set() 대신 add()로 현재 태그 조회를 생략한다.
+            post.tags.add(*Tag.objects.create_tags(tags))
         return post
 
     def get_posts_by_user(self, user):
@@ -38,8 +39,16 @@ class PostManager(models.Manager):
 
 class TagManager(models.Manager):
     def create_tags(self, tags) -> list['Tag']:
-        tag_objs = []
-        for tag_name in tags:
-            tag_obj, _ = self.get_or_create(name=tag_name)
-            tag_objs.append(tag_obj)
-        return tag_objs
+        """
+        Returns the Tag objects for the given names, creating the missing ones.
+        Always two queries regardless of the number of tags: one INSERT that skips existing
+        names (also safe against concurrent writers) and one SELECT.
+        :param tags: List of tag name strings (duplicates are ignored)
+        :return: Tags in the order of their first occurrence in `tags`
+        """
+        names = list(dict.fromkeys(tags))
+        if not names:
+            return []
+        self.bulk_create([self.model(name=name) for name in names], ignore_conflicts=True)
+        tag_objs = self.in_bulk(names, field_name='name')
+        return [tag_objs[name] for name in names]
@@ -1,4 +1,3 @@
-from django.db.models import F
 from typing import TYPE_CHECKING, Any
 from datetime import datetime, UTC
 
@@ -10,6 +9,7 @@ class PostMixin:
     def update_tags(self: 'Post', tag_names: list[str]) -> None:
         """
         Updates the tags for the post.
+        Tags are resolved in bulk and `set()` only removes and adds the links that differ.
         :param tag_names: A list of tag name strings.
         """
         from snapsapi.apps.posts.models import Tag
@@ -27,7 +27,39 @@ class PostMixin:
             PostImage(post=self, url=f'/{url}', order=idx)
             for idx, url in enumerate(urls)
         ]
-        PostImage.objects.bulk_create(objs)
+        if objs:
+            PostImage.objects.bulk_create(objs)
+
+    def replace_images(self: 'Post', urls) -> None:
+        """
+        Replaces the images of the post with the given URLs, touching only the rows that change.
+        Images whose URL is kept are left in place (with their variants) and only re-ordered;
+        removed ones are deleted and new ones inserted, each with a single query.
+        :param urls: A list of image URLs, in display order.
+        """
+        from snapsapi.apps.posts.models import PostImage
+        existing = {}
+        for image in self.images.order_by('order', 'pk'):
+            existing.setdefault(image.url, []).append(image)
+
+        to_create, to_reorder = [], []
+        for idx, url in enumerate(urls):
+            matches = existing.get(f'/{url}')
+            if matches:
+                image = matches.pop(0)
+                if image.order != idx:
+                    image.order = idx
+                    to_reorder.append(image)
+            else:
+                to_create.append(PostImage(post=self, url=f'/{url}', order=idx))
+        to_delete = [image.pk for images in existing.values() for image in images]
+
+        if to_delete:
+            PostImage.objects.filter(pk__in=to_delete).delete()
+        if to_reorder:
+            PostImage.objects.bulk_update(to_reorder, ['order'])
+        if to_create:
+            PostImage.objects.bulk_create(to_create)
 
     def delete_images(self: 'Post') -> None:
         """
@@ -51,13 +83,9 @@ class PostMixin:
         self.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
 
     def increment_comments_count(self: 'Post'):
-        # self.comments_count = self.comments_count + 1
-        self.comments_count = F('comments_count') + 1
-        self.save(update_fields=['comments_count'])
-        self.refresh_from_db(fields=['comments_count'])
+        from snapsapi.apps.core.counters import get_counter_service
+        get_counter_service().incr(type(self), self.pk, 'comments_count')
 
     def decrement_comments_count(self: 'Post'):
-        if self.comments_count > 0:
-            self.comments_count = F('comments_count') - 1
-            self.save(update_fields=['comments_count'])
-            self.refresh_from_db(fields=['comments_count'])
+        from snapsapi.apps.core.counters import get_counter_service
+        get_counter_service().decr(type(self), self.pk, 'comments_count')
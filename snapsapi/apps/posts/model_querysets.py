@@ -4,11 +4,10 @@ from django.db.models.aggregates import Count
 
 
 class PostQuerySet(models.QuerySet):
-    def get_posts_with_first_image(self):
+    def with_first_image(self):
         """
-        For each post in the QuerySet, returns a list of dictionaries containing
-        key fields of the Post and the URL of its first image.
-        This is highly efficient as it uses a single database query.
+        Annotates each post with the URL (first_image_url) and variants (first_image_variants)
+        of its first image, so listing posts as thumbnails does not query the images per post.
         """
         from snapsapi.apps.posts.models import PostImage
 
@@ -17,12 +16,25 @@ class PostQuerySet(models.QuerySet):
             post=OuterRef('pk')
         ).order_by('order').values('url')[:1]  # Select only the url of the first object after ordering.
 
+        first_image_variants_sq = PostImage.objects.filter(
+            post=OuterRef('pk')
+        ).order_by('order').values('variants')[:1]
+
         # 2. Annotate the main queryset with the subquery result.
-        qs = self.annotate(
-            first_image_url=Subquery(first_image_sq)
+        return self.annotate(
+            first_image_url=Subquery(first_image_sq),
+            first_image_variants=Subquery(first_image_variants_sq),
             # total_posts=Window(expression=Count('pk'))
         )
 
+    def get_posts_with_first_image(self):
+        """
+        For each post in the QuerySet, returns a list of dictionaries containing
+        key fields of the Post and the URL of its first image.
+        This is highly efficient as it uses a single database query.
+        """
+        qs = self.with_first_image()
+
         # 3. Select the required Post fields and the newly annotated field.
         return qs.values(
             'uid',
@@ -31,6 +43,7 @@ class PostQuerySet(models.QuerySet):
             # 'comments_count',
             # 'created_at',
             'first_image_url',  # The field added via annotate.
+            'first_image_variants',
         )
 
     def get_posts_by_user(self, user):
@@ -1,5 +1,6 @@
 import uuid
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from snapsapi.apps.users.models import User
@@ -36,6 +37,12 @@ class PostImage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
     is_deleted = models.BooleanField(default=False)
+    # 원본 크기와 서버에서 생성한 리사이즈/WebP 변형 (snapsapi.apps.posts.image_variants 참고)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    variants = models.JSONField(default=list, blank=True,
+                                help_text="[{'name', 'url', 'width', 'height', 'format'}], 작은 것부터")
+    processed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['order']
@@ -57,6 +64,8 @@ class Post(models.Model, mx.PostMixin):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False,
+                                      help_text="캡션과 태그로 구성된 전문 검색용 tsvector")
 
     objects = mm.PostManager()
 
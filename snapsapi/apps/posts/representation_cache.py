@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from snapsapi.apps.core.metrics import record_cache_lookups
+
+if TYPE_CHECKING:
+    from snapsapi.apps.posts.models import Post
+
+POST_REPRESENTATIONS_CONTEXT_KEY = 'post_representations'
+
+# Bump when the cached representation format changes, so old entries are never read again.
+SCHEMA_VERSION = 2
+POST_VERSION_KEY = 'posts:repr:post-version:{}'
+AUTHOR_VERSION_KEY = 'posts:repr:author-version:{}'
+ENTRY_KEY = 'posts:repr:v{schema}:{uid}:{post_version}:{author_version}'
+
+
+class CacheStats:
+    """Process-local hit/miss counters of the representation cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / total if total else 0.0}
+
+
+stats = CacheStats()
+
+
+class PostRepresentationCache:
+    """
+    Read-through cache for the viewer-independent part of PostReadSerializer
+    (caption, images, tags, author profile, timestamps).
+
+    Entries are keyed by post uid plus a post version and an author version, both kept in
+    the cache. Invalidation bumps a version instead of deleting the entry, so a reader that
+    loaded stale data before the bump can only write it under the old key, which is never
+    read again.
+    Counters and viewer flags (is_liked, is_collected, is_following, is_me) are not cached;
+    the serializer layers them on top at read time.
+
+    Works with any Django cache backend that implements `get_many`/`set_many`/`incr`
+    (locmem, Redis, Memcached). The alias is `settings.POST_REPRESENTATION_CACHE`.
+    """
+
+    def __init__(self, alias: str | None = None, timeout: int | None = None):
+        self.alias = alias or settings.POST_REPRESENTATION_CACHE
+        self.timeout = timeout if timeout is not None else settings.POST_REPRESENTATION_CACHE_TIMEOUT
+        self.version_timeout = max(self.timeout, settings.POST_REPRESENTATION_VERSION_TIMEOUT)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_versions(self, keys: set[str]) -> dict[str, int]:
+        """
+        Returns the current value of each version key, initializing missing ones.
+        Versions start at the current time in nanoseconds rather than 1, so a version key that
+        was evicted never comes back with a value an old entry was stored under.
+        """
+        versions = self.cache.get_many(keys)
+        for key in keys - versions.keys():
+            version = time.time_ns()
+            # add() keeps a version another process initialized in the meantime.
+            if not self.cache.add(key, version, self.version_timeout):
+                version = self.cache.get(key, version)
+            versions[key] = version
+        return versions
+
+    def build_keys(self, posts: Iterable['Post']) -> dict[int, str]:
+        """Returns {post pk: entry key} for the current post and author versions."""
+        posts = list(posts)
+        version_keys = {POST_VERSION_KEY.format(post.pk) for post in posts}
+        version_keys |= {AUTHOR_VERSION_KEY.format(post.user_id) for post in posts}
+        versions = self.get_versions(version_keys)
+        return {
+            post.pk: ENTRY_KEY.format(
+                schema=SCHEMA_VERSION,
+                uid=post.uid,
+                post_version=versions[POST_VERSION_KEY.format(post.pk)],
+                author_version=versions[AUTHOR_VERSION_KEY.format(post.user_id)],
+            )
+            for post in posts
+        }
+
+    def get_many(self, posts: Iterable['Post']) -> tuple[dict[int, dict], dict[int, str]]:
+        """
+        :return: ({post pk: cached representation} for hits, {post pk: entry key} for all posts)
+        """
+        keys = self.build_keys(posts)
+        if not keys:
+            return {}, keys
+        found = self.cache.get_many(keys.values())
+        hits = {pk: found[key] for pk, key in keys.items() if key in found}
+        stats.record(len(hits), len(keys) - len(hits))
+        record_cache_lookups('post_representation', len(hits), len(keys) - len(hits))
+        return hits, keys
+
+    def set_many(self, entries: dict[str, dict]) -> None:
+        if entries:
+            self.cache.set_many(entries, self.timeout)
+
+    def _bump(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                # Not initialized yet: the next read starts from a fresh version anyway.
+                pass
+
+    def invalidate_posts(self, post_ids: Iterable[int]) -> None:
+        """Invalidates the given posts once the current transaction commits."""
+        keys = [POST_VERSION_KEY.format(post_id) for post_id in post_ids]
+        transaction.on_commit(lambda: self._bump(keys))
+
+    def invalidate_authors(self, user_ids: Iterable[int]) -> None:
+        """Invalidates every post of the given authors (profile or username changes)."""
+        keys = [AUTHOR_VERSION_KEY.format(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: self._bump(keys))
+
+
+def get_post_representation_cache() -> PostRepresentationCache:
+    return PostRepresentationCache()
+
+
+def get_post_representations(context: dict) -> dict[int, dict] | None:
+    return context.get(POST_REPRESENTATIONS_CONTEXT_KEY)
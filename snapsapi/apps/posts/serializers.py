@@ -1,12 +1,26 @@
 from typing import Any
 
 from django.contrib.auth import get_user, get_user_model
+from django.db.models import prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from snapsapi.apps.users.serializers import SocialLoginResponseSerializer, UserSerializer
 from snapsapi.apps.posts.models import Post, PostImage, Tag
 from snapsapi.apps.likes.models import PostLike
+from snapsapi.apps.core.counters import get_counter_service
+from snapsapi.apps.core.db_routing import get_read_database
+from snapsapi.apps.posts.image_variants import schedule_processing
+from snapsapi.apps.posts.representation_cache import (
+    POST_REPRESENTATIONS_CONTEXT_KEY,
+    get_post_representation_cache,
+    get_post_representations,
+)
+from snapsapi.apps.posts.viewer_state import (
+    VIEWER_STATE_CONTEXT_KEY,
+    ViewerStateResolver,
+    get_viewer_state,
+)
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError as DjangoValidationError
 
@@ -25,19 +39,118 @@ class PostImageURLInputSerializer(serializers.Serializer):
     url = serializers.CharField()
 
 
-class PostReadSerializer(serializers.ModelSerializer):
+POST_COUNTER_FIELDS = ('likes_count', 'comments_count')
+
+
+def resolve_viewer_state(serializer: serializers.BaseSerializer, posts) -> None:
     """
-    A Serializer used for retrieving posts.
-    It serializes all fields, including the user's 'like' status and 'collection' status.
+    Resolves the viewer state for the given posts once and stores it in the
+    serializer context, where PostReadSerializer and the nested UserSerializer pick it up.
+    """
+    request = serializer.context.get('request')
+    if not request or not request.user.is_authenticated:
+        return
+    state = get_viewer_state(serializer.context)
+    if state is not None and all(state.covers_post(post) for post in posts):
+        return
+    serializer.context[VIEWER_STATE_CONTEXT_KEY] = ViewerStateResolver(request.user).resolve(posts)
+
+
+def resolve_post_representations(serializer: serializers.BaseSerializer, posts) -> None:
+    """
+    Loads the cached viewer-independent representations of the given posts and renders
+    (and caches) the missing ones. Related rows are prefetched for cache misses only.
+    Misses read from a replica are not cached: a lagging replica would store an old row
+    under the current version key.
+    """
+    representations = get_post_representations(serializer.context)
+    if representations is not None and all(post.pk in representations for post in posts):
+        return
+    cache = get_post_representation_cache()
+    found, keys = cache.get_many(posts)
+    misses = [post for post in posts if post.pk not in found]
+    if misses:
+        prefetch_related_objects(misses, 'user__profile', 'images', 'tags')
+        rendered = PostRepresentationSerializer(many=True, context=serializer.context).to_representation(misses)
+        rendered = {post.pk: data for post, data in zip(misses, rendered)}
+        if get_read_database() is None:
+            cache.set_many({keys[pk]: data for pk, data in rendered.items()})
+        found.update(rendered)
+    serializer.context[POST_REPRESENTATIONS_CONTEXT_KEY] = {**(representations or {}), **found}
+
+
+class PostAuthorSerializer(serializers.Serializer):
+    """Viewer-independent part of UserSerializer, cached with the post."""
+    uid = serializers.CharField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    image_url = serializers.CharField(source='profile.image_url', read_only=True, default='/media/users/default/user.png')
+    bio = serializers.CharField(source='profile.bio', read_only=True)
+
+
+class PostRepresentationSerializer(serializers.ModelSerializer):
+    """
+    Viewer-independent part of PostReadSerializer, stored in the post representation cache.
+    Counters and viewer flags are added by PostReadSerializer at read time.
     """
     metadata = serializers.SerializerMethodField(read_only=True)
-    user = UserSerializer(read_only=True)
+    user = PostAuthorSerializer(read_only=True)
     images = serializers.SerializerMethodField()
     tags = serializers.SlugRelatedField(
         many=True,
         read_only=True,
         slug_field='name'
     )
+
+    class Meta:
+        model = Post
+        fields = [
+            'metadata',
+            'uid',
+            'user',
+            'caption',
+            'images',
+            'tags',
+            'is_public',
+            'created_at',
+            'updated_at',
+        ]
+
+    def get_metadata(self, obj):
+        return {"post_uid": obj.uid, "user_uid": obj.user.uid}
+
+    def get_images(self, obj: object) -> list[dict[str, Any]] | list[Any]:
+        return [self.get_image(image) for image in obj.images.all()] if hasattr(obj, 'images') else []
+
+    def get_image(self, image: PostImage) -> dict[str, Any]:
+        # 처리된 이미지에는 원본 크기와 리사이즈/WebP 변형이 함께 내려간다.
+        if not image.processed_at or not image.variants:
+            return {'url': image.url}
+        return {'url': image.url, 'width': image.width, 'height': image.height, 'variants': image.variants}
+
+
+class PostReadListSerializer(serializers.ListSerializer):
+    """
+    List serializer for PostReadSerializer.
+    Resolves the viewer state for the whole page up front, so the number of queries
+    stays flat regardless of the page size.
+    """
+
+    def to_representation(self, data):
+        posts = list(data.all() if hasattr(data, 'all') else data)
+        resolve_viewer_state(self, posts)
+        resolve_post_representations(self, posts)
+        get_counter_service().overlay(posts, POST_COUNTER_FIELDS)
+        return super().to_representation(posts)
+
+
+class PostReadSerializer(PostRepresentationSerializer):
+    """
+    A Serializer used for retrieving posts.
+    It serializes all fields, including the user's 'like' status and 'collection' status.
+    The viewer-independent fields come from the post representation cache
+    (see PostRepresentationSerializer); counters and viewer flags are computed per request.
+    """
+    user = UserSerializer(read_only=True)
     is_liked = serializers.SerializerMethodField()
     is_collected = serializers.SerializerMethodField()
 
@@ -58,28 +171,58 @@ class PostReadSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
+        list_serializer_class = PostReadListSerializer
 
-    def get_metadata(self, obj):
-        return {"post_uid": obj.uid, "user_uid": obj.user.uid}
+    def to_representation(self, instance):
+        if self.parent is None:
+            resolve_viewer_state(self, [instance])
+            get_counter_service().overlay([instance], POST_COUNTER_FIELDS)
+        resolve_post_representations(self, [instance])
+        cached = get_post_representations(self.context)[instance.pk]
+        live = {
+            'user': {**cached['user'], **self.get_author_flags(instance)},
+            'likes_count': instance.likes_count,
+            'comments_count': instance.comments_count,
+            'is_liked': self.get_is_liked(instance),
+            'is_collected': self.get_is_collected(instance),
+        }
+        return {name: live[name] if name in live else cached[name] for name in self.Meta.fields}
 
-    def get_images(self, obj: object) -> list[dict[str, Any]] | list[Any]:
-        return [{'url': image.url} for image in obj.images.all()] if hasattr(obj, 'images') else []
+    def get_author_flags(self, post):
+        """
+        Viewer-dependent fields of the nested UserSerializer ('is_me', 'is_following').
+        Works on post.user_id, so the author row is not loaded when the representation is cached.
+        """
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return {'is_me': False, 'is_following': False}
+        if request.user.pk == post.user_id:
+            return {'is_me': True, 'is_following': False}
+        state = get_viewer_state(self.context)
+        if state is not None and post.user_id in state.user_ids:
+            is_following = post.user_id in state.following_user_ids
+        else:
+            from snapsapi.apps.core.models import Follow
+            is_following = Follow.objects.filter(follower=request.user, following_id=post.user_id).exists()
+        return {'is_me': False, 'is_following': is_following}
 
     def get_is_liked(self, post):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            state = get_viewer_state(self.context)
+            if state is not None and state.covers_post(post):
+                return state.is_liked(post)
             return PostLike.objects.filter(post=post, user=request.user).exists()
         return False
 
     def get_is_collected(self, post):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            from snapsapi.apps.core.models import Collection
-            # Get the user's default collection
-            default_collection = Collection.objects.filter(owner=request.user, name='default').first()
-            if default_collection:
-                # Check if the post is in the default collection
-                return default_collection.posts.filter(pk=post.pk).exists()
+            state = get_viewer_state(self.context)
+            if state is not None and state.covers_post(post):
+                return state.is_collected(post)
+            # Same lookup as the list path, so both agree on deleted/inactive default collections.
+            return post.pk in ViewerStateResolver(request.user).resolve_collected_post_ids({post.pk})
         return False
 
 
@@ -137,6 +280,7 @@ class PostWriteSerializer(serializers.ModelSerializer):
         images = [item['url'] for item in validated_data.get('images', [])]
         tags = validated_data.get('tags', [])
         post = Post.objects.create_post(request.user, caption, images, tags)
+        schedule_processing(post)
         return post
 
     def update(self, instance, validated_data):
@@ -149,8 +293,8 @@ class PostWriteSerializer(serializers.ModelSerializer):
 
         # Update images if provided
         if images_data is not None:
-            instance.delete_images()
-            instance.attach_images([item['url'] for item in images_data])
+            instance.replace_images([item['url'] for item in images_data])
+            schedule_processing(instance)
 
         # Update tags if provided
         if tags_data is not None:
@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
-from snapsapi.apps.posts.models import Post
+from snapsapi.apps.posts.models import Post, PostImage, Tag
+from snapsapi.apps.posts.representation_cache import get_post_representation_cache
+from snapsapi.apps.users.models import Profile
 
 User = get_user_model()
 
@@ -24,3 +26,50 @@ def update_user_posts_count_on_save_or_soft_delete(sender, instance, created, up
             user.decrement_posts_count()
         else:
             user.increment_posts_count()
+
+
+# --- Post representation cache invalidation ---
+
+@receiver(post_save, sender=Post)
+def invalidate_post_representation(sender, instance, created, **kwargs):
+    if not created:
+        get_post_representation_cache().invalidate_posts([instance.pk])
+
+
+@receiver(post_save, sender=PostImage)
+@receiver(post_delete, sender=PostImage)
+def invalidate_post_representation_on_image_change(sender, instance, **kwargs):
+    get_post_representation_cache().invalidate_posts([instance.post_id])
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_representation_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        post_ids = [instance.pk]
+    elif action == 'pre_clear':
+        # 태그 쪽에서 clear()하면 pk_set이 없으므로 연결된 게시물을 직접 조회
+        post_ids = instance.posts.values_list('pk', flat=True)
+    else:
+        post_ids = pk_set
+    get_post_representation_cache().invalidate_posts(post_ids)
+
+
+@receiver(post_save, sender=Tag)
+def invalidate_post_representation_on_tag_rename(sender, instance, created, **kwargs):
+    if not created:
+        get_post_representation_cache().invalidate_posts(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User)
+def invalidate_post_representation_on_user_change(sender, instance, created, update_fields, **kwargs):
+    # 로그인 시 last_login만 갱신되는 경우는 게시물 표현에 영향이 없다.
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    get_post_representation_cache().invalidate_authors([instance.pk])
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_post_representation_on_profile_change(sender, instance, **kwargs):
+    get_post_representation_cache().invalidate_authors([instance.user_id])
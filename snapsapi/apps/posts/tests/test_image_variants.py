@@ -0,0 +1,141 @@
+import io
+
+import pytest
+from django.core.files.base import ContentFile
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+
+from snapsapi.apps.core.models import Collection
+from snapsapi.apps.posts.image_variants import ImageVariantProcessor, LocalImageStorage, pick_variant_url
+from snapsapi.apps.posts.models import Post, PostImage
+
+VARIANTS = [
+    {'name': 'thumb', 'url': '/media/posts/a_thumb.webp', 'width': 320, 'height': 240, 'format': 'webp'},
+    {'name': 'small', 'url': '/media/posts/a_small.webp', 'width': 640, 'height': 480, 'format': 'webp'},
+]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalImageStorage(location=str(tmp_path))
+
+
+def upload_image(storage, key, size=(2000, 1500), fmt='JPEG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, format=fmt)
+    storage.save(key, ContentFile(buffer.getvalue()))
+
+
+class TestPickVariantUrl:
+    """Tests for choosing the grid variant"""
+
+    def test_smallest_variant_at_least_as_wide(self):
+        assert pick_variant_url('/a.jpg', VARIANTS, 300) == '/media/posts/a_thumb.webp'
+        assert pick_variant_url('/a.jpg', VARIANTS, 500) == '/media/posts/a_small.webp'
+
+    def test_falls_back_to_original(self):
+        assert pick_variant_url('/a.jpg', VARIANTS, 1080) == '/a.jpg'
+        assert pick_variant_url('/a.jpg', [], 300) == '/a.jpg'
+        assert pick_variant_url('/a.jpg', None, 300) == '/a.jpg'
+
+
+@pytest.mark.django_db
+class TestImageVariantProcessor:
+    """Tests for generating variants from uploaded originals"""
+
+    def test_creates_webp_variants_smaller_than_original(self, storage, user1):
+        upload_image(storage, 'media/posts/a.jpg')
+        post = Post.objects.create(user=user1, caption='caption')
+        image = PostImage.objects.create(post=post, url='/media/posts/a.jpg', order=0)
+
+        processed = ImageVariantProcessor(storage, variants={'thumb': 320, 'medium': 1080, 'huge': 4096}).process([image])
+
+        image.refresh_from_db()
+        assert processed == 1
+        assert (image.width, image.height) == (2000, 1500)
+        assert image.processed_at is not None
+        assert [(v['name'], v['width'], v['height']) for v in image.variants] == [
+            ('thumb', 320, 240), ('medium', 1080, 810),
+        ]
+        assert image.variants[0]['url'] == '/media/posts/a_thumb.webp'
+        assert storage.exists('media/posts/a_thumb.webp')
+        assert storage.exists('media/posts/a_medium.webp')
+
+    def test_processing_changes_the_post_etag(self, storage, user1, api_client):
+        upload_image(storage, 'media/posts/a.jpg')
+        post = Post.objects.create(user=user1, caption='caption')
+        image = PostImage.objects.create(post=post, url='/media/posts/a.jpg', order=0)
+        url = reverse('posts:posts-detail', kwargs={'uid': post.uid})
+        etag = api_client.get(url)['ETag']
+
+        ImageVariantProcessor(storage, variants={'thumb': 320}).process([image])
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['images'][0]['variants'][0]['name'] == 'thumb'
+
+    def test_missing_original_stays_pending(self, storage, user1):
+        post = Post.objects.create(user=user1, caption='caption')
+        PostImage.objects.create(post=post, url='/media/posts/not-uploaded.jpg', order=0)
+
+        processed = ImageVariantProcessor(storage).process_pending()
+
+        assert processed == 0
+        assert PostImage.objects.filter(processed_at__isnull=True).count() == 1
+
+    def test_broken_original_is_not_retried(self, storage, user1):
+        storage.save('media/posts/broken.jpg', ContentFile(b'not an image'))
+        post = Post.objects.create(user=user1, caption='caption')
+        image = PostImage.objects.create(post=post, url='/media/posts/broken.jpg', order=0)
+
+        processed = ImageVariantProcessor(storage).process_pending()
+
+        image.refresh_from_db()
+        assert processed == 1
+        assert image.processed_at is not None
+        assert image.variants == []
+
+
+@pytest.mark.django_db
+class TestVariantSerialization:
+    """Tests for serving variants instead of originals"""
+
+    @pytest.fixture
+    def processed_post(self, user1):
+        post = Post.objects.create(user=user1, caption='caption')
+        PostImage.objects.create(post=post, url='/media/posts/a.jpg', order=0, width=2000, height=1500,
+                                 variants=VARIANTS, processed_at=post.created_at)
+        return post
+
+    def test_profile_grid_uses_smallest_suitable_variant(self, api_client, user1, processed_post, settings):
+        settings.POST_IMAGE_GRID_WIDTH = 320
+
+        response = api_client.get(reverse('users:user-profile', kwargs={'user_uid': user1.uid}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['images']['feed_images'] == [
+            {'uid': processed_post.uid, 'first_image_url': '/media/posts/a_thumb.webp'},
+        ]
+
+    def test_collection_grid_uses_smallest_suitable_variant(self, jwt_client, user1, processed_post, settings):
+        settings.POST_IMAGE_GRID_WIDTH = 500
+        collection = Collection.objects.create(owner=user1, name='collection')
+        collection.posts.add(processed_post)
+
+        response = jwt_client.get(reverse('collections-detail', kwargs={'uid': collection.uid}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['posts'][0]['first_image'] == '/media/posts/a_small.webp'
+
+    def test_post_detail_includes_variants(self, api_client, processed_post):
+        response = api_client.get(reverse('posts:posts-detail', kwargs={'uid': processed_post.uid}))
+
+        assert response.data['images'] == [
+            {'url': '/media/posts/a.jpg', 'width': 2000, 'height': 1500, 'variants': VARIANTS},
+        ]
+
+    def test_unprocessed_image_keeps_original_shape(self, api_client, post_of_user1):
+        response = api_client.get(reverse('posts:posts-detail', kwargs={'uid': post_of_user1.uid}))
+
+        assert response.data['images'] == [{'url': 'https://example.com/image.png'}]
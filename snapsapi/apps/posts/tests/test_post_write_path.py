@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.posts.models import Post, PostImage, Tag
+
+
+def write_queries(ctx):
+    return [query['sql'] for query in ctx.captured_queries if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+
+
+def create_payload(size):
+    return {
+        'caption': 'caption',
+        'images': [{'url': f'uploads/photo{idx}.jpg'} for idx in range(size)],
+        'tags': [f'tag{idx}' for idx in range(size)],
+    }
+
+
+@pytest.mark.django_db
+class TestCreateTags:
+    """Tests for resolving tags in bulk"""
+
+    def test_creates_missing_and_reuses_existing(self):
+        existing = Tag.objects.create(name='existing')
+
+        with CaptureQueriesContext(connection) as ctx:
+            tags = Tag.objects.create_tags(['new', 'existing', 'new', 'other'])
+
+        assert [tag.name for tag in tags] == ['new', 'existing', 'other']
+        assert tags[1].pk == existing.pk
+        assert all(tag.pk for tag in tags)
+        assert Tag.objects.count() == 3
+        assert len(ctx.captured_queries) == 2
+
+    def test_empty(self):
+        with CaptureQueriesContext(connection) as ctx:
+            assert Tag.objects.create_tags([]) == []
+        assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+class TestPostWritePath:
+    """Tests for the set-based post create/update path"""
+
+    def test_create_query_count_does_not_depend_on_size(self, jwt_client):
+        url = reverse('posts:posts-list-create')
+
+        with CaptureQueriesContext(connection) as small:
+            assert jwt_client.post(url, create_payload(1), format='json').status_code == status.HTTP_201_CREATED
+        with CaptureQueriesContext(connection) as large:
+            assert jwt_client.post(url, create_payload(10), format='json').status_code == status.HTTP_201_CREATED
+
+        assert len(write_queries(large)) == len(write_queries(small))
+        post = Post.objects.order_by('-pk').first()
+        assert list(post.images.values_list('url', flat=True)) == [f'/uploads/photo{idx}.jpg' for idx in range(10)]
+        assert set(post.tags.values_list('name', flat=True)) == {f'tag{idx}' for idx in range(10)}
+
+    def test_update_touches_only_changed_images(self, jwt_client, user1):
+        post = Post.objects.create_post(user1, 'caption', ['a.jpg', 'b.jpg', 'c.jpg'], ['keep', 'drop'])
+        images = {image.url: image for image in post.images.all()}
+        PostImage.objects.filter(pk=images['/b.jpg'].pk).update(variants=[{'name': 'thumb'}])
+
+        response = jwt_client.patch(
+            reverse('posts:posts-detail', kwargs={'uid': post.uid}),
+            {'images': [{'url': 'b.jpg'}, {'url': 'd.jpg'}, {'url': 'a.jpg'}], 'tags': ['keep', 'add']},
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        updated = list(post.images.all())
+        assert [image.url for image in updated] == ['/b.jpg', '/d.jpg', '/a.jpg']
+        # kept rows are the same rows, with their variants
+        assert updated[0].pk == images['/b.jpg'].pk
+        assert updated[0].variants == [{'name': 'thumb'}]
+        assert updated[2].pk == images['/a.jpg'].pk
+        assert not PostImage.objects.filter(pk=images['/c.jpg'].pk).exists()
+        assert set(post.tags.values_list('name', flat=True)) == {'keep', 'add'}
+
+    def test_update_with_same_images_writes_no_image_rows(self, jwt_client, user1):
+        post = Post.objects.create_post(user1, 'caption', ['a.jpg', 'b.jpg'], [])
+
+        with CaptureQueriesContext(connection) as ctx:
+            jwt_client.patch(
+                reverse('posts:posts-detail', kwargs={'uid': post.uid}),
+                {'images': [{'url': 'a.jpg'}, {'url': 'b.jpg'}]},
+                format='json',
+            )
+
+        image_writes = [sql for sql in write_queries(ctx)
+                        if sql.startswith(('INSERT', 'UPDATE', 'DELETE')) and 'posts_postimage' in sql]
+        assert image_writes == []
@@ -0,0 +1,153 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from snapsapi.apps.posts.models import Post, PostImage, Tag
+from snapsapi.apps.posts.representation_cache import PostRepresentationCache, stats
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                   'LOCATION': 'post-representations'}}
+    caches['default'].clear()
+    stats.reset()
+    yield
+    caches['default'].clear()
+
+
+def selects(ctx):
+    return [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('SELECT')]
+
+
+def detail_url(post):
+    return reverse('posts:posts-detail', kwargs={'uid': post.uid})
+
+
+@pytest.mark.django_db
+class TestPostRepresentationCache:
+    """Tests for the post representation cache"""
+
+    def test_second_detail_get_should_be_served_from_cache(self, api_client, post1):
+        first = api_client.get(detail_url(post1))
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = api_client.get(detail_url(post1))
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        # only the post row itself: no user/profile/images/tags queries
+        assert len(selects(ctx)) == 1
+        assert stats.as_dict()['hits'] == 1
+        assert stats.as_dict()['misses'] == 1
+
+    def test_list_should_prefetch_only_cache_misses(self, api_client, user1, tag1):
+        for idx in range(3):
+            post = Post.objects.create(user=user1, caption=f"caption {idx}")
+            post.tags.add(tag1)
+        url = reverse('posts:posts-list-create')
+        with CaptureQueriesContext(connection) as cold:
+            first = api_client.get(url)
+        with CaptureQueriesContext(connection) as warm:
+            second = api_client.get(url)
+
+        assert second.data['results'] == first.data['results']
+        assert len(selects(warm)) == len(selects(cold)) - 4
+
+    def test_counters_should_not_be_cached(self, api_client, post1):
+        api_client.get(detail_url(post1))
+        Post.objects.filter(pk=post1.pk).update(likes_count=5, comments_count=2)
+
+        response = api_client.get(detail_url(post1))
+
+        assert response.data['likes_count'] == 5
+        assert response.data['comments_count'] == 2
+        assert stats.as_dict()['hits'] == 1
+
+    def test_viewer_flags_should_not_be_cached(self, jwt_client, post1):
+        anonymous = APIClient().get(detail_url(post1))
+        owner = jwt_client.get(detail_url(post1))
+
+        assert anonymous.data['user']['is_me'] is False
+        assert owner.data['user']['is_me'] is True
+        assert stats.as_dict()['hits'] == 1
+
+    def test_post_update_should_invalidate(self, api_client, jwt_client, post1, django_capture_on_commit_callbacks):
+        api_client.get(detail_url(post1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            jwt_client.patch(detail_url(post1), {'caption': 'edited'}, format='json')
+
+        assert api_client.get(detail_url(post1)).data['caption'] == 'edited'
+
+    def test_image_and_tag_changes_should_invalidate(self, api_client, post1, django_capture_on_commit_callbacks):
+        api_client.get(detail_url(post1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            PostImage.objects.filter(post=post1).delete()
+            post1.tags.add(Tag.objects.create(name='newtag'))
+
+        response = api_client.get(detail_url(post1))
+        assert response.data['images'] == []
+        assert sorted(response.data['tags']) == ['newtag', 'testtag']
+
+    def test_tag_rename_should_invalidate(self, api_client, post1, tag1, django_capture_on_commit_callbacks):
+        api_client.get(detail_url(post1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            tag1.name = 'renamed'
+            tag1.save()
+
+        assert api_client.get(detail_url(post1)).data['tags'] == ['renamed']
+
+    def test_profile_edit_should_invalidate_author_posts(self, api_client, user1, post1,
+                                                         django_capture_on_commit_callbacks):
+        api_client.get(detail_url(post1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user1.profile.bio = 'new bio'
+            user1.profile.save()
+
+        assert api_client.get(detail_url(post1)).data['user']['bio'] == 'new bio'
+
+    def test_replica_reads_should_not_be_cached(self, api_client, post1, monkeypatch):
+        monkeypatch.setattr('snapsapi.apps.posts.serializers.get_read_database', lambda: 'replica')
+
+        api_client.get(detail_url(post1))
+        response = api_client.get(detail_url(post1))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert stats.as_dict()['hits'] == 0
+        assert stats.as_dict()['misses'] == 2
+
+    def test_stale_write_after_invalidation_should_not_be_read(self, post1):
+        cache = PostRepresentationCache()
+        _, old_keys = cache.get_many([post1])
+
+        cache._bump([f'posts:repr:post-version:{post1.pk}'])
+        cache.set_many({old_keys[post1.pk]: {'caption': 'stale'}})
+
+        hits, new_keys = cache.get_many([post1])
+        assert hits == {}
+        assert new_keys[post1.pk] != old_keys[post1.pk]
+
+    def test_version_keys_should_expire(self, settings, post1):
+        settings.POST_REPRESENTATION_VERSION_TIMEOUT = 60
+        cache = PostRepresentationCache(timeout=5)
+
+        with mock.patch.object(cache.cache, 'add', wraps=cache.cache.add) as add:
+            _, old_keys = cache.get_many([post1])
+        assert {call.args[2] for call in add.call_args_list} == {60}
+
+        # An expired version restarts from the current time, never from a value used before.
+        cache.set_many({old_keys[post1.pk]: {'caption': 'old'}})
+        caches['default'].delete(f'posts:repr:post-version:{post1.pk}')
+        hits, new_keys = cache.get_many([post1])
+        assert hits == {}
+        assert new_keys[post1.pk] != old_keys[post1.pk]
@@ -0,0 +1,114 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.core.models import Collection, Follow
+from snapsapi.apps.likes.models import PostLike
+from snapsapi.apps.posts.models import Post, PostImage
+from snapsapi.apps.posts.viewer_state import ViewerStateResolver
+
+
+@pytest.fixture
+def author():
+    return get_user_model().objects.create_user(email='author@snaps.com', password='mypassword', username='author')
+
+
+def create_posts(user, tag, count):
+    posts = []
+    for idx in range(count):
+        post = Post.objects.create(user=user, caption=f"caption {idx}")
+        post.tags.add(tag)
+        PostImage.objects.create(post=post, url=f"/media/posts/{idx}.png", order=0)
+        posts.append(post)
+    return posts
+
+
+@pytest.mark.django_db
+class TestViewerStateResolver:
+    """Tests for the ViewerStateResolver"""
+
+    def test_resolve_should_use_three_queries(self, user1, author, tag1):
+        posts = create_posts(author, tag1, 5)
+        PostLike.objects.create(user=user1, post=posts[0])
+        Collection.objects.get(owner=user1, name='default').posts.add(posts[1])
+        Follow.objects.create(follower=user1, following=author)
+
+        with CaptureQueriesContext(connection) as ctx:
+            state = ViewerStateResolver(user1).resolve(posts)
+
+        assert len(ctx.captured_queries) == 3
+        assert state.is_liked(posts[0]) is True
+        assert state.is_liked(posts[1]) is False
+        assert state.is_collected(posts[1]) is True
+        assert state.is_collected(posts[0]) is False
+        assert state.is_following(author) is True
+
+    def test_resolve_for_anonymous_viewer_should_not_query(self, author, tag1):
+        from django.contrib.auth.models import AnonymousUser
+        posts = create_posts(author, tag1, 2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            state = ViewerStateResolver(AnonymousUser()).resolve(posts)
+
+        assert len(ctx.captured_queries) == 0
+        assert state.is_liked(posts[0]) is False
+
+
+@pytest.mark.django_db
+class TestPostListViewerState:
+    """Tests for the viewer-dependent flags on /api/posts/"""
+
+    def test_list_posts_should_return_viewer_flags(self, jwt_client, user1, author, tag1):
+        posts = create_posts(author, tag1, 3)
+        PostLike.objects.create(user=user1, post=posts[0])
+        Collection.objects.get(owner=user1, name='default').posts.add(posts[0])
+        Follow.objects.create(follower=user1, following=author)
+
+        url = reverse('posts:posts-list-create')
+        res = jwt_client.get(url)
+        assert res.status_code == status.HTTP_200_OK
+
+        results = {item['uid']: item for item in res.json()['results']}
+        liked = results[str(posts[0].uid)]
+        assert liked['is_liked'] is True
+        assert liked['is_collected'] is True
+        assert liked['user']['is_following'] is True
+        other = results[str(posts[1].uid)]
+        assert other['is_liked'] is False
+        assert other['is_collected'] is False
+
+    def test_list_posts_query_count_should_not_depend_on_page_size(self, jwt_client, user1, author, tag1):
+        posts = create_posts(author, tag1, 20)
+        for post in posts[::2]:
+            PostLike.objects.create(user=user1, post=post)
+        Follow.objects.create(follower=user1, following=author)
+        url = reverse('posts:posts-list-create')
+
+        with CaptureQueriesContext(connection) as small_page:
+            res = jwt_client.get(url, {'page_size': 5})
+        assert len(res.json()['results']) == 5
+
+        with CaptureQueriesContext(connection) as large_page:
+            res = jwt_client.get(url, {'page_size': 20})
+        assert len(res.json()['results']) == 20
+
+        assert len(small_page.captured_queries) == len(large_page.captured_queries)
+
+    def test_list_and_fallback_ignore_a_deleted_default_collection(self, rf, user1, author, tag1):
+        from snapsapi.apps.posts.serializers import PostReadSerializer
+        [post] = create_posts(author, tag1, 1)
+        collection = Collection.objects.get(owner=user1, name='default')
+        collection.posts.add(post)
+        collection.soft_delete()
+
+        request = rf.get('/')
+        request.user = user1
+        state = ViewerStateResolver(user1).resolve([post])
+        # Without a viewer state in the context the serializer falls back to its own lookup.
+        fallback = PostReadSerializer(context={'request': request}).get_is_collected(post)
+
+        assert state.is_collected(post) is False
+        assert fallback is False
@@ -0,0 +1,116 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from snapsapi.apps.posts.models import Post
+    from snapsapi.apps.users.models import User
+
+VIEWER_STATE_CONTEXT_KEY = 'viewer_state'
+
+
+@dataclass
+class ViewerState:
+    """
+    Pre-resolved relationships between the request user (the viewer) and a page of posts.
+
+    Every lookup is a set membership test, so serializers can answer
+    'is_liked', 'is_collected' and 'is_following' without touching the database.
+    """
+    liked_post_ids: set[int] = field(default_factory=set)
+    collected_post_ids: set[int] = field(default_factory=set)
+    following_user_ids: set[int] = field(default_factory=set)
+    post_ids: set[int] = field(default_factory=set)
+    user_ids: set[int] = field(default_factory=set)
+
+    def covers_post(self, post: 'Post') -> bool:
+        return post.pk in self.post_ids
+
+    def covers_user(self, user: 'User') -> bool:
+        return user.pk in self.user_ids
+
+    def is_liked(self, post: 'Post') -> bool:
+        return post.pk in self.liked_post_ids
+
+    def is_collected(self, post: 'Post') -> bool:
+        return post.pk in self.collected_post_ids
+
+    def is_following(self, user: 'User') -> bool:
+        return user.pk in self.following_user_ids
+
+
+class ViewerStateResolver:
+    """
+    Resolves the viewer state for a page of posts with three set-based queries:
+    1. The viewer's likes among the posts on the page.
+    2. The posts on the page that are in the viewer's default collection.
+    3. The viewer's follow edges towards the authors on the page.
+    """
+
+    def __init__(self, viewer: 'User'):
+        self.viewer = viewer
+
+    def resolve(self, posts: Iterable['Post']) -> ViewerState:
+        """
+        :param posts: The posts being serialized (e.g. the current page)
+        :return: A ViewerState covering the given posts and their authors
+        """
+        posts = list(posts)
+        post_ids = {post.pk for post in posts}
+        user_ids = {post.user_id for post in posts}
+        state = ViewerState(post_ids=post_ids, user_ids=user_ids)
+
+        if not post_ids or not self.viewer or not self.viewer.is_authenticated:
+            return state
+
+        state.liked_post_ids = self.resolve_liked_post_ids(post_ids)
+        state.collected_post_ids = self.resolve_collected_post_ids(post_ids)
+        state.following_user_ids = self.resolve_following_user_ids(user_ids)
+        return state
+
+    def resolve_users(self, users: Iterable['User']) -> ViewerState:
+        """
+        Resolves only the follow edges, for pages that list users rather than posts (e.g. comments).
+        :param users: The users being serialized
+        :return: A ViewerState covering the given users
+        """
+        user_ids = {user.pk for user in users}
+        state = ViewerState(user_ids=user_ids)
+        if user_ids and self.viewer and self.viewer.is_authenticated:
+            state.following_user_ids = self.resolve_following_user_ids(user_ids)
+        return state
+
+    def resolve_liked_post_ids(self, post_ids: set[int]) -> set[int]:
+        from snapsapi.apps.likes.models import PostLike
+        return set(
+            PostLike.objects.filter(user=self.viewer, post_id__in=post_ids)
+            .values_list('post_id', flat=True)
+        )
+
+    def resolve_collected_post_ids(self, post_ids: set[int]) -> set[int]:
+        from snapsapi.apps.core.models import Collection
+        # Join through the M2M table so the default collection lookup and the
+        # membership check happen in a single query.
+        return set(
+            Collection.posts.through.objects.filter(
+                collection__owner=self.viewer,
+                collection__name='default',
+                collection__is_deleted=False,
+                collection__is_active=True,
+                post_id__in=post_ids,
+            ).values_list('post_id', flat=True)
+        )
+
+    def resolve_following_user_ids(self, user_ids: set[int]) -> set[int]:
+        from snapsapi.apps.core.models import Follow
+        user_ids = user_ids - {self.viewer.pk}
+        if not user_ids:
+            return set()
+        return set(
+            Follow.objects.filter(follower=self.viewer, following_id__in=user_ids)
+            .values_list('following_id', flat=True)
+        )
+
+
+def get_viewer_state(context: dict) -> ViewerState | None:
+    """Returns the ViewerState stored in a serializer context, if any."""
+    return context.get(VIEWER_STATE_CONTEXT_KEY)
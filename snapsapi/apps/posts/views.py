@@ -1,6 +1,4 @@
 from django.conf import settings
-from django.db import transaction
-from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 from drf_rw_serializers.generics import (
     GenericAPIView,
@@ -27,46 +25,37 @@ from snapsapi.apps.posts.schemas import (
     PRESIGNED_POST_URL_RESPONSE_EXAMPLE,
     PRESIGNED_POST_URL_REQUEST_EXAMPLE,
 )
-from snapsapi.apps.core.pagination import StandardResultsSetPagination
+from snapsapi.apps.core.conditional import ConditionalGetMixin
+from snapsapi.apps.core.counters import get_counter_service
+from snapsapi.apps.core.pagination import KeysetCursorPagination
+from snapsapi.apps.core.transactions import AtomicUnsafeMethodsMixin
 from snapsapi.apps.posts.models import Post, Tag
-from snapsapi.utils.aws import create_presigned_post, build_posts_image_object_name
+from snapsapi.apps.posts.viewer_state import VIEWER_STATE_CONTEXT_KEY, ViewerStateResolver
+from snapsapi.apps.search.backends import get_search_backend
+from snapsapi.utils.aws import create_presigned_posts, build_posts_image_object_name
 
 
-@method_decorator(transaction.atomic, name='dispatch')
-class PostListCreateView(ListCreateAPIView):
+class PostListCreateView(AtomicUnsafeMethodsMixin, ListCreateAPIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ('-created_at', '-pk')
     read_serializer_class = s.PostReadSerializer
     write_serializer_class = s.PostWriteSerializer
 
     def get_queryset(self):
-        queryset = (
-            Post.objects.filter(is_deleted=False)
-            .prefetch_related(
-                'user__profile',
-                'images',
-                'tags'
-            )
-            .order_by('-created_at')
-        )
+        # user/profile/images/tags are prefetched by PostReadSerializer for representation cache misses only
+        queryset = Post.objects.filter(is_deleted=False).order_by('-created_at', '-pk')
 
         tag_query = self.request.query_params.get('tag', None)
         keyword_query = self.request.query_params.get('keyword', None)
+        search_backend = get_search_backend()
 
         # Only one of tag or keyword can be used at a time
-        if tag_query and keyword_query:
+        if tag_query:
             # If both are provided, prioritize tag query
-            queryset = queryset.filter(
-                tags__name__icontains=tag_query
-            ).distinct()
-        elif tag_query:
-            queryset = queryset.filter(
-                tags__name__icontains=tag_query
-            ).distinct()
+            queryset = search_backend.filter_posts_by_tag(queryset, tag_query)
         elif keyword_query:
-            queryset = queryset.filter(
-                caption__icontains=keyword_query
-            ).distinct()
+            queryset = search_backend.search_posts(queryset, keyword_query)
 
         return queryset
 
@@ -98,15 +87,44 @@ class PostListCreateView(ListCreateAPIView):
     #     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-@method_decorator(transaction.atomic, name='dispatch')
-class PostDetailView(RetrieveUpdateDestroyAPIView):
-    queryset = Post.objects.filter(is_deleted=False)
+class PostDetailView(AtomicUnsafeMethodsMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
+    """
+    GET supports conditional requests: the ETag is computed from the post's updated_at,
+    counters, author profile and the viewer's flags, without serializing the post.
+    """
+    queryset = Post.objects.filter(is_deleted=False).select_related('user__profile')
     permission_classes = [IsAuthenticatedOrReadOnly]
     read_serializer_class = s.PostReadSerializer
     write_serializer_class = s.PostWriteSerializer
     lookup_field = 'uid'
 
     http_method_names = ['get', 'patch', 'delete', 'head', 'options']
+    viewer_state = None
+
+    def get_etag_components(self, post):
+        get_counter_service().overlay([post], s.POST_COUNTER_FIELDS)
+        author = post.user
+        profile = getattr(author, 'profile', None)
+        components = [
+            post.uid, post.updated_at, post.likes_count, post.comments_count,
+            author.uid, author.username, profile and profile.image_url, profile and profile.bio,
+        ]
+        if self.request.user.is_authenticated:
+            # Resolved once here and reused by PostReadSerializer when the body is rendered.
+            self.viewer_state = ViewerStateResolver(self.request.user).resolve([post])
+            components += [
+                self.request.user.pk,
+                self.viewer_state.is_liked(post),
+                self.viewer_state.is_collected(post),
+                self.viewer_state.is_following(author),
+            ]
+        return components
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.viewer_state is not None:
+            context[VIEWER_STATE_CONTEXT_KEY] = self.viewer_state
+        return context
 
     # def get_serializer_class(self):
     #     """
@@ -173,18 +191,17 @@ class PostImageUploadURLView(GenericAPIView):
 
         user_uid = request.user.uid
 
-        results = []
-        for file_info in files:
-            file_name = file_info.get('file_name')
-            presigned_url = create_presigned_post(
-                settings.AWS_S3_MEDIA_BUCKET_NAME,
-                build_posts_image_object_name(user_uid, file_name),
-                expiration=settings.AWS_S3_PRESIGNED_URL_POST_EXPIRATION
-            )
-            results.append({
-                "file_name": file_name,
-                "presigned_url": presigned_url,
-            })
+        file_names = [file_info.get('file_name') for file_info in files]
+        # 모든 파일을 한 번에 서명 (S3 클라이언트/자격 증명 설정은 프로세스당 한 번)
+        presigned_urls = create_presigned_posts(
+            settings.AWS_S3_MEDIA_BUCKET_NAME,
+            [build_posts_image_object_name(user_uid, file_name) for file_name in file_names],
+            expiration=settings.AWS_S3_PRESIGNED_URL_POST_EXPIRATION
+        ) or [None] * len(file_names)
+        results = [
+            {"file_name": file_name, "presigned_url": presigned_url}
+            for file_name, presigned_url in zip(file_names, presigned_urls)
+        ]
 
         return Response({"results": results}, status=status.HTTP_200_OK)
 
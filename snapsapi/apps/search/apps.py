@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'snapsapi.apps.search'
+
+    def ready(self):
+        try:
+            import snapsapi.apps.search.signals
+        except ImportError:
+            pass
@@ -0,0 +1,189 @@
+import re
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, QuerySet, Subquery, TextField, Value, When
+from django.utils.module_loading import import_string
+
+if TYPE_CHECKING:
+    from snapsapi.apps.posts.models import Post
+
+# 'simple' keeps tokens as-is, which suits the mixed Korean/English captions better
+# than a language-specific stemmer.
+SEARCH_CONFIG = 'simple'
+
+BACKENDS = {
+    'postgresql': 'snapsapi.apps.search.backends.PostgresSearchBackend',
+}
+DEFAULT_BACKEND = 'snapsapi.apps.search.backends.SimpleSearchBackend'
+
+_backend_cache = {}
+
+
+class BaseSearchBackend:
+    """
+    Interface for search backends.
+    Every method takes and returns a QuerySet, so results can be paginated and
+    further filtered by the caller.
+    """
+
+    def search_posts(self, queryset: QuerySet, keyword: str, ranked: bool = False) -> QuerySet:
+        """
+        Filters posts whose caption or tags match the keyword.
+        :param queryset: Base Post queryset
+        :param keyword: Search term
+        :param ranked: Order by relevance instead of keeping the queryset's ordering
+        """
+        raise NotImplementedError
+
+    def filter_posts_by_tag(self, queryset: QuerySet, tag: str) -> QuerySet:
+        """
+        Filters posts that have a tag whose name contains the given term.
+        Uses a semi-join on the tag table instead of a JOIN + DISTINCT.
+        """
+        from snapsapi.apps.posts.models import Post
+        post_ids = Post.tags.through.objects.filter(tag__name__icontains=tag).values('post_id')
+        return queryset.filter(pk__in=Subquery(post_ids))
+
+    def search_tags(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Filters and ranks tags by name."""
+        raise NotImplementedError
+
+    def search_users(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Filters and ranks users by username."""
+        raise NotImplementedError
+
+    def update_post_index(self, post: 'Post') -> None:
+        """Refreshes the stored search document of a post after it was written."""
+        return None
+
+    def update_post_indexes(self, queryset: QuerySet) -> None:
+        """Rebuilds the stored search documents of many posts, e.g. after a bulk load."""
+        return None
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """
+    Database-agnostic fallback based on icontains lookups.
+    Used with SQLite (tests, local development); ranks exact and prefix matches first.
+    """
+
+    @staticmethod
+    def annotate_match_rank(queryset: QuerySet, field: str, query: str) -> QuerySet:
+        return queryset.annotate(
+            match_rank=Case(
+                When(**{f'{field}__iexact': query}, then=Value(3)),
+                When(**{f'{field}__istartswith': query}, then=Value(2)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        )
+
+    def search_posts(self, queryset, keyword, ranked=False):
+        from snapsapi.apps.posts.models import Post
+
+        tag_match = Post.tags.through.objects.filter(post_id=OuterRef('pk'), tag__name__icontains=keyword)
+        queryset = queryset.filter(Q(caption__icontains=keyword) | Exists(tag_match))
+        if ranked:
+            queryset = queryset.order_by('-created_at', '-pk')
+        return queryset
+
+    def search_tags(self, queryset, query):
+        queryset = queryset.filter(name__icontains=query)
+        return self.annotate_match_rank(queryset, 'name', query).order_by('-match_rank', 'name')
+
+    def search_users(self, queryset, query):
+        queryset = queryset.filter(username__icontains=query)
+        return self.annotate_match_rank(queryset, 'username', query).order_by('-match_rank', 'username')
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL backend.
+    - Posts are matched against the `search_vector` tsvector column (caption weighted 'A',
+      tag names weighted 'B') through a GIN index and ordered by ts_rank.
+    - Tags and usernames use pg_trgm GIN indexes, which serve both `ILIKE '%x%'` and
+      the `%` similarity operator, so fuzzy matches do not scan the table.
+    """
+    trigram_threshold = 0.3
+
+    @staticmethod
+    def build_prefix_query(keyword: str) -> str:
+        """
+        Converts free text into a raw tsquery that prefix-matches every term,
+        e.g. 'hello wor' -> 'hello:* & wor:*'.
+        """
+        terms = re.findall(r'\w+', keyword.lower())
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search_posts(self, queryset, keyword, ranked=False):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        raw_query = self.build_prefix_query(keyword)
+        if not raw_query:
+            return queryset.none()
+        query = SearchQuery(raw_query, config=SEARCH_CONFIG, search_type='raw')
+        queryset = queryset.filter(search_vector=query)
+        if ranked:
+            queryset = queryset.annotate(rank=SearchRank(F('search_vector'), query)).order_by('-rank', '-created_at')
+        return queryset
+
+    def search_tags(self, queryset, query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return (
+            queryset.filter(Q(name__icontains=query) | Q(name__trigram_similar=query))
+            .annotate(similarity=TrigramSimilarity('name', query))
+            .order_by('-similarity', 'name')
+        )
+
+    def search_users(self, queryset, query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return (
+            queryset.filter(Q(username__icontains=query) | Q(username__trigram_similar=query))
+            .annotate(similarity=TrigramSimilarity('username', query))
+            .order_by('-similarity', 'username')
+        )
+
+    def update_post_index(self, post):
+        from django.contrib.postgres.search import SearchVector
+        from snapsapi.apps.posts.models import Post
+
+        tag_names = ' '.join(post.tags.values_list('name', flat=True))
+        Post.objects.filter(pk=post.pk).update(
+            search_vector=(
+                SearchVector('caption', weight='A', config=SEARCH_CONFIG)
+                + SearchVector(Value(tag_names, output_field=TextField()), weight='B', config=SEARCH_CONFIG)
+            )
+        )
+
+    def update_post_indexes(self, queryset):
+        from django.contrib.postgres.aggregates import StringAgg
+        from django.contrib.postgres.search import SearchVector
+        from snapsapi.apps.posts.models import Post
+
+        # One UPDATE with a correlated subquery, like the backfill in search/migrations/0001_initial.py.
+        tag_names = (
+            Post.tags.through.objects.filter(post_id=OuterRef('pk'))
+            .values('post_id').annotate(names=StringAgg('tag__name', ' ')).values('names')
+        )
+        queryset.update(
+            search_vector=(
+                SearchVector('caption', weight='A', config=SEARCH_CONFIG)
+                + SearchVector(Subquery(tag_names, output_field=TextField()), weight='B', config=SEARCH_CONFIG)
+            )
+        )
+
+
+def get_search_backend(using: str = DEFAULT_DB_ALIAS) -> BaseSearchBackend:
+    """
+    Returns the configured search backend.
+    `settings.SEARCH_BACKEND` takes precedence; when it is not set, the backend is
+    chosen from the vendor of the given database connection (default: `default`).
+    """
+    path = getattr(settings, 'SEARCH_BACKEND', None) or BACKENDS.get(connections[using].vendor, DEFAULT_BACKEND)
+    if path not in _backend_cache:
+        _backend_cache[path] = import_string(path)()
+    return _backend_cache[path]
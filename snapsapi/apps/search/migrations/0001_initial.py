@@ -0,0 +1,62 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_CONFIG = 'simple'
+
+
+def create_search_indexes(apps, schema_editor):
+    """
+    Creates the GIN indexes used by PostgresSearchBackend and backfills post search vectors.
+    The indexes are PostgreSQL specific, so other databases (SQLite in tests) skip this step.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    post_table = apps.get_model('posts', 'Post')._meta.db_table
+    tag_model = apps.get_model('posts', 'Tag')
+    tag_table = tag_model._meta.db_table
+    post_tags_table = apps.get_model('posts', 'Post')._meta.get_field('tags').remote_field.through._meta.db_table
+    user_table = apps.get_model('users', 'User')._meta.db_table
+
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS search_post_vector_gin ON {post_table} USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS search_tag_name_trgm ON {tag_table} USING gin (name gin_trgm_ops)'
+    )
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS search_user_username_trgm ON {user_table} USING gin (username gin_trgm_ops)'
+    )
+    schema_editor.execute(f"""
+        UPDATE {post_table} AS p
+        SET search_vector =
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(p.caption, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((
+                SELECT string_agg(t.name, ' ')
+                FROM {tag_table} AS t
+                JOIN {post_tags_table} AS pt ON pt.tag_id = t.id
+                WHERE pt.post_id = p.id
+            ), '')), 'B')
+    """)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in ('search_post_vector_gin', 'search_tag_name_trgm', 'search_user_username_trgm'):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('posts', '0008_post_search_vector'),
+        ('users', '0009_alter_user_username'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from snapsapi.apps.posts.models import Post
+from snapsapi.apps.search.backends import get_search_backend
+
+
+def schedule_post_index_update(post: Post) -> None:
+    """Refreshes the post's search document once the surrounding transaction commits."""
+    transaction.on_commit(lambda: get_search_backend().update_post_index(post))
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_index_on_save(sender, instance, created, update_fields, **kwargs):
+    """
+    게시물이 생성되거나 캡션이 수정되면 검색 인덱스(search_vector)를 갱신합니다.
+    """
+    if created or update_fields is None or 'caption' in update_fields:
+        schedule_post_index_update(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_post_search_index_on_tags_change(sender, instance, action, reverse, **kwargs):
+    """
+    게시물의 태그가 변경되면 검색 인덱스를 갱신합니다.
+    """
+    if reverse or action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    schedule_post_index_update(instance)
@@ -0,0 +1,43 @@
+import pytest
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from snapsapi.apps.posts import models as m
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user1():
+    user_model = get_user_model()
+    return user_model.objects.create_user(email='user1@snaps.com', password='mypassword', username='user1')
+
+
+@pytest.fixture
+def jwt_client(api_client, user1):
+    refresh = RefreshToken.for_user(user1)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return api_client
+
+
+@pytest.fixture
+def search_dataset(user1):
+    """Users, tags and posts with overlapping names to exercise ranking."""
+    user_model = get_user_model()
+    for username in ('sunset', 'sunsetlover', 'mysunset'):
+        user_model.objects.create_user(email=f'{username}@snaps.com', password='mypassword', username=username)
+
+    sunset = m.Tag.objects.create(name='sunset')
+    beach = m.Tag.objects.create(name='beach')
+    m.Tag.objects.create(name='redsunset')
+
+    sunset_post = m.Post.objects.create(user=user1, caption='sunset at the pier')
+    sunset_post.tags.add(sunset)
+    beach_post = m.Post.objects.create(user=user1, caption='a day out')
+    beach_post.tags.add(beach)
+    deleted_post = m.Post.objects.create(user=user1, caption='sunset gone', is_deleted=True)
+    return {'sunset_post': sunset_post, 'beach_post': beach_post, 'deleted_post': deleted_post}
@@ -0,0 +1,88 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.search.backends import (
+    PostgresSearchBackend,
+    SimpleSearchBackend,
+    get_search_backend,
+)
+
+
+@pytest.mark.django_db
+class TestSearchView:
+    """Tests for /search/"""
+
+    def test_search_all_should_return_posts_tags_and_users(self, api_client, search_dataset):
+        res = api_client.get(reverse('search:search'), {'q': 'sunset'})
+        assert res.status_code == status.HTTP_200_OK
+
+        data = res.json()
+        assert [post['uid'] for post in data['posts']] == [str(search_dataset['sunset_post'].uid)]
+        # Exact match first, then prefix match, then substring match
+        assert [tag['name'] for tag in data['tags']] == ['sunset', 'redsunset']
+        assert [user['username'] for user in data['users']] == ['sunset', 'sunsetlover', 'mysunset']
+
+    def test_search_type_should_limit_the_result_groups(self, api_client, search_dataset):
+        data = api_client.get(reverse('search:search'), {'q': 'sunset', 'type': 'tags'}).json()
+        assert data['posts'] == []
+        assert data['users'] == []
+        assert len(data['tags']) == 2
+
+    def test_hash_prefixed_query_should_search_posts_by_tag(self, api_client, search_dataset):
+        data = api_client.get(reverse('search:search'), {'q': '#beach', 'type': 'posts'}).json()
+        assert [post['uid'] for post in data['posts']] == [str(search_dataset['beach_post'].uid)]
+
+    def test_limit_should_cap_each_group(self, api_client, search_dataset):
+        data = api_client.get(reverse('search:search'), {'q': 'sunset', 'limit': 1}).json()
+        assert len(data['tags']) == 1
+        assert len(data['users']) == 1
+
+    def test_empty_query_should_return_empty_groups(self, api_client, search_dataset):
+        data = api_client.get(reverse('search:search'), {'q': ' '}).json()
+        assert data == {'posts': [], 'tags': [], 'users': []}
+
+    def test_invalid_type_should_return_400(self, api_client, search_dataset):
+        res = api_client.get(reverse('search:search'), {'q': 'sunset', 'type': 'comments'})
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_authenticated_user_should_not_find_themselves(self, jwt_client, user1, search_dataset):
+        data = jwt_client.get(reverse('search:search'), {'q': 'user1', 'type': 'users'}).json()
+        assert data['users'] == []
+
+
+@pytest.mark.django_db
+class TestPostListSearch:
+    """Tests for the tag/keyword filters on /posts/, now served by the search backend"""
+
+    def test_tag_filter_should_not_duplicate_posts(self, api_client, search_dataset):
+        from snapsapi.apps.posts.models import Tag
+        search_dataset['sunset_post'].tags.add(Tag.objects.get(name='redsunset'))
+
+        data = api_client.get(reverse('posts:posts-list-create'), {'tag': 'sunset'}).json()
+        assert [post['uid'] for post in data['results']] == [str(search_dataset['sunset_post'].uid)]
+
+    def test_keyword_filter_should_exclude_deleted_posts(self, api_client, search_dataset):
+        data = api_client.get(reverse('posts:posts-list-create'), {'keyword': 'sunset'}).json()
+        assert [post['uid'] for post in data['results']] == [str(search_dataset['sunset_post'].uid)]
+
+    def test_keyword_filter_should_match_tags(self, api_client, search_dataset):
+        data = api_client.get(reverse('posts:posts-list-create'), {'keyword': 'beach'}).json()
+        assert [post['uid'] for post in data['results']] == [str(search_dataset['beach_post'].uid)]
+
+
+class TestSearchBackend:
+    """Tests for backend selection and query building"""
+
+    def test_sqlite_should_use_simple_backend(self):
+        assert isinstance(get_search_backend(), SimpleSearchBackend)
+
+    @override_settings(SEARCH_BACKEND='snapsapi.apps.search.backends.PostgresSearchBackend')
+    def test_setting_should_override_backend(self):
+        assert isinstance(get_search_backend(), PostgresSearchBackend)
+
+    def test_build_prefix_query_should_prefix_match_every_term(self):
+        assert PostgresSearchBackend.build_prefix_query('Hello wor') == 'hello:* & wor:*'
+        assert PostgresSearchBackend.build_prefix_query("it's & | !") == 'it:* & s:*'
+        assert PostgresSearchBackend.build_prefix_query('!!') == ''
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from snapsapi.apps.search import views
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', views.SearchView.as_view(), name='search'),
+]
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from snapsapi.apps.posts.models import Post, Tag
+from snapsapi.apps.posts.serializers import PostReadSerializer, TagSerializer
+from snapsapi.apps.search.backends import get_search_backend
+from snapsapi.apps.users.serializers import UserSerializer
+
+User = get_user_model()
+
+SEARCH_TYPES = ('all', 'posts', 'tags', 'users')
+
+
+class SearchView(APIView):
+    """
+    Unified search over posts, tags and users.
+    - GET /search/?q=term&type=all|posts|tags|users&limit=10
+    A query starting with '#' searches posts by tag instead of by caption.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self) -> int:
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def search_posts(self, backend, query: str, limit: int):
+        queryset = (
+            Post.objects.filter(is_deleted=False)
+            .prefetch_related('user__profile', 'images', 'tags')
+            .order_by('-created_at', '-pk')
+        )
+        if query.startswith('#'):
+            queryset = backend.filter_posts_by_tag(queryset, query.lstrip('#'))
+        else:
+            queryset = backend.search_posts(queryset, query, ranked=True)
+        posts = list(queryset[:limit])
+        return PostReadSerializer(posts, many=True, context={'request': self.request}).data
+
+    def search_tags(self, backend, query: str, limit: int):
+        tags = backend.search_tags(Tag.objects.all(), query.lstrip('#'))[:limit]
+        return TagSerializer(tags, many=True).data
+
+    def search_users(self, backend, query: str, limit: int):
+        queryset = User.objects.filter(is_active=True, is_deleted=False).select_related('profile')
+        if self.request.user.is_authenticated:
+            queryset = queryset.exclude(pk=self.request.user.pk)
+        users = backend.search_users(queryset, query)[:limit]
+        return UserSerializer(users, many=True, context={'request': self.request}).data
+
+    @extend_schema(
+        summary="통합 검색",
+        description="게시물, 태그, 사용자를 한 번에 검색합니다. '#'으로 시작하는 검색어는 태그로 게시물을 검색합니다.",
+        parameters=[
+            OpenApiParameter('q', str, description='검색어'),
+            OpenApiParameter('type', str, enum=list(SEARCH_TYPES), description='검색 대상 (기본값: all)'),
+            OpenApiParameter('limit', int, description='대상별 최대 결과 수 (기본값: 10, 최대: 50)'),
+        ],
+        responses=inline_serializer(
+            name='SearchResponse',
+            fields={
+                'posts': PostReadSerializer(many=True),
+                'tags': TagSerializer(many=True),
+                'users': UserSerializer(many=True),
+            }
+        ),
+    )
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        search_type = request.query_params.get('type', 'all')
+        if search_type not in SEARCH_TYPES:
+            raise serializers.ValidationError({'type': f"Must be one of {', '.join(SEARCH_TYPES)}."})
+
+        results = {'posts': [], 'tags': [], 'users': []}
+        if not query.lstrip('#'):
+            return Response(results)
+
+        backend = get_search_backend()
+        limit = self.get_limit()
+        for name in ('posts', 'tags', 'users'):
+            if search_type in ('all', name):
+                results[name] = getattr(self, f'search_{name}')(backend, query, limit)
+        return Response(results)
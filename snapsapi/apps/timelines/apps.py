@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class TimelinesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'snapsapi.apps.timelines'
+
+    def ready(self):
+        try:
+            import snapsapi.apps.timelines.signals
+        except ImportError:
+            pass
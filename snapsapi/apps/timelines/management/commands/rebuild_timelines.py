@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from snapsapi.apps.timelines.services import rebuild_timeline
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds home timelines from Follow and Post (e.g. after a store flush or a threshold change).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', dest='user_uids', action='append', default=[],
+                            help='uid of a user to rebuild; may be repeated. Defaults to every active user.')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of user ids fetched per query.')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True, is_deleted=False)
+        if options['user_uids']:
+            users = users.filter(uid__in=options['user_uids'])
+            if not users.exists():
+                raise CommandError('No matching users.')
+
+        rebuilt = entries = 0
+        for user_id in users.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=options['chunk_size']):
+            entries += rebuild_timeline(user_id)
+            rebuilt += 1
+            if options['verbosity'] > 1 and rebuilt % options['chunk_size'] == 0:
+                self.stdout.write(f'{rebuilt} timelines rebuilt...')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} timelines ({entries} entries).'))
@@ -0,0 +1,184 @@
+import datetime
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.posts.models import Post
+from snapsapi.apps.timelines.stores import TimelineEntry, get_timeline_store
+
+User = get_user_model()
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+FANOUT_BATCH_SIZE = 1000
+
+
+def to_score(created_at: datetime.datetime) -> int:
+    """Converts a post's created_at into an integer score in epoch microseconds."""
+    return (created_at - EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def from_score(score: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(microseconds=score)
+
+
+def entry_for(post: Post) -> TimelineEntry:
+    return TimelineEntry(score=to_score(post.created_at), post_id=post.pk, author_id=post.user_id)
+
+
+def is_fanout_author(followers_count: int) -> bool:
+    """
+    Authors with more followers than TIMELINE_FANOUT_THRESHOLD are not fanned out on write;
+    their posts are merged into the feed at read time instead.
+    """
+    return followers_count <= settings.TIMELINE_FANOUT_THRESHOLD
+
+
+def get_followers_count(author_id: int) -> int:
+    return User.objects.filter(pk=author_id).values_list('followers_count', flat=True).first() or 0
+
+
+def iter_follower_id_batches(author_id: int, batch_size: int = FANOUT_BATCH_SIZE) -> Iterable[list[int]]:
+    follower_ids = Follow.objects.filter(following_id=author_id).values_list('follower_id', flat=True)
+    batch = []
+    for follower_id in follower_ids.iterator(chunk_size=batch_size):
+        batch.append(follower_id)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def fan_out_post(post: Post) -> None:
+    """
+    Pushes a new post into the timelines of the author and their followers (fan-out-on-write).
+    Follower ids are streamed in batches so each batch is a single store round-trip.
+    """
+    store = get_timeline_store()
+    entry = entry_for(post)
+    store.add([post.user_id], [entry])
+
+    if not is_fanout_author(get_followers_count(post.user_id)):
+        return
+    for follower_ids in iter_follower_id_batches(post.user_id):
+        store.add(follower_ids, [entry])
+
+
+def remove_post(post: Post) -> None:
+    """
+    Removes a (soft-deleted) post from every timeline it may have been pushed to.
+    Posts of authors above the fan-out threshold were only pushed to the author's own timeline;
+    entries left over from before the author crossed it are dropped when the feed is read.
+    """
+    store = get_timeline_store()
+    entry = entry_for(post)
+    store.remove([post.user_id], [entry])
+    if not is_fanout_author(get_followers_count(post.user_id)):
+        return
+    for follower_ids in iter_follower_id_batches(post.user_id):
+        store.remove(follower_ids, [entry])
+
+
+def backfill_author(follower_id: int, author_id: int) -> None:
+    """
+    Copies the author's most recent posts into the follower's timeline right after a follow.
+    Authors above the fan-out threshold are skipped because they are merged on read.
+    """
+    if not is_fanout_author(get_followers_count(author_id)):
+        return
+    posts = Post.objects.filter(user_id=author_id, is_deleted=False) \
+        .order_by('-created_at', '-pk')[:settings.TIMELINE_BACKFILL_SIZE]
+    entries = [
+        TimelineEntry(score=to_score(created_at), post_id=post_id, author_id=author_id)
+        for post_id, created_at in posts.values_list('pk', 'created_at')
+    ]
+    if entries:
+        get_timeline_store().add([follower_id], entries)
+
+
+def remove_author(follower_id: int, author_id: int) -> None:
+    """Removes every post of the author from the follower's timeline after an unfollow."""
+    get_timeline_store().remove_author(follower_id, author_id)
+
+
+def rebuild_timeline(user_id: int) -> int:
+    """
+    Rebuilds a user's timeline from Follow and Post.
+    :param user_id: Owner of the timeline
+    :return: Number of entries written
+    """
+    author_ids = list(
+        Follow.objects.filter(
+            follower_id=user_id,
+            following__followers_count__lte=settings.TIMELINE_FANOUT_THRESHOLD,
+        ).values_list('following_id', flat=True)
+    )
+    author_ids.append(user_id)
+    posts = Post.objects.filter(user_id__in=author_ids, is_deleted=False) \
+        .order_by('-created_at', '-pk')[:get_timeline_store().max_length]
+    entries = [
+        TimelineEntry(score=to_score(created_at), post_id=post_id, author_id=author_id)
+        for post_id, author_id, created_at in posts.values_list('pk', 'user_id', 'created_at')
+    ]
+    get_timeline_store().replace(user_id, entries)
+    return len(entries)
+
+
+def get_pulled_entries(user_id: int, before: tuple[int, int] | None, limit: int) -> list[TimelineEntry]:
+    """
+    Fan-out-on-read half of the hybrid feed: recent posts of followed authors above the
+    fan-out threshold, queried with the same (created_at, pk) keyset as the stored entries.
+    """
+    celebrity_ids = Follow.objects.filter(
+        follower_id=user_id,
+        following__followers_count__gt=settings.TIMELINE_FANOUT_THRESHOLD,
+    ).values('following_id')
+    posts = Post.objects.filter(user_id__in=celebrity_ids, is_deleted=False)
+    if before is not None:
+        created_at = from_score(before[0])
+        posts = posts.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=before[1]))
+    posts = posts.order_by('-created_at', '-pk')[:limit]
+    return [
+        TimelineEntry(score=to_score(created_at), post_id=post_id, author_id=author_id)
+        for post_id, author_id, created_at in posts.values_list('pk', 'user_id', 'created_at')
+    ]
+
+
+def get_home_feed(user_id: int, before: tuple[int, int] | None, limit: int) -> tuple[list[Post], tuple[int, int] | None]:
+    """
+    Returns one page of the home feed.
+    Stored (pushed) entries are merged with pulled posts of high-follower authors, then the
+    page is hydrated with a single `pk IN (...)` query.
+
+    :param user_id: Viewer
+    :param before: Position (score, post_id) of the last entry of the previous page
+    :param limit: Page size
+    :return: A tuple of (posts, position for the next page or None)
+    """
+    store = get_timeline_store()
+    pushed = store.get_entries(user_id, before, limit)
+    if not pushed and before is None:
+        # Cold timeline (e.g. an in-memory store after a restart): rebuild it once from the database.
+        if rebuild_timeline(user_id):
+            pushed = store.get_entries(user_id, before, limit)
+
+    merged = {entry.post_id: entry for entry in get_pulled_entries(user_id, before, limit)}
+    merged.update((entry.post_id, entry) for entry in pushed)
+    entries = sorted(merged.values(), key=lambda entry: entry.position, reverse=True)[:limit]
+
+    posts_by_id = Post.objects.filter(pk__in=[entry.post_id for entry in entries], is_deleted=False) \
+        .select_related('user__profile') \
+        .prefetch_related('images', 'tags') \
+        .in_bulk()
+
+    # Entries whose post disappeared are dropped from the store lazily.
+    stale = [entry for entry in entries if entry.post_id not in posts_by_id]
+    if stale:
+        store.remove([user_id], stale)
+
+    posts = [posts_by_id[entry.post_id] for entry in entries if entry.post_id in posts_by_id]
+    next_position = entries[-1].position if len(entries) == limit else None
+    return posts, next_position
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.posts.models import Post
+from snapsapi.apps.timelines import services
+
+
+@receiver(post_save, sender=Post)
+def update_timelines_on_post_save(sender, instance, created, update_fields, **kwargs):
+    """
+    게시물이 생성되면 팔로워 타임라인에 추가하고, soft-delete 되면 타임라인에서 제거합니다.
+    타임라인 저장소는 DB 트랜잭션 밖에 있으므로 커밋 이후에만 반영합니다.
+    """
+    if created:
+        transaction.on_commit(lambda: services.fan_out_post(instance))
+    elif update_fields and 'is_deleted' in update_fields:
+        if instance.is_deleted:
+            transaction.on_commit(lambda: services.remove_post(instance))
+        else:
+            transaction.on_commit(lambda: services.fan_out_post(instance))
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline_on_follow(sender, instance, created, **kwargs):
+    """
+    팔로우하면 상대방의 최근 게시물을 팔로워의 타임라인에 채워 넣습니다.
+    """
+    if created:
+        follower_id, author_id = instance.follower_id, instance.following_id
+        transaction.on_commit(lambda: services.backfill_author(follower_id, author_id))
+
+
+@receiver(post_delete, sender=Follow)
+def prune_timeline_on_unfollow(sender, instance, **kwargs):
+    """
+    언팔로우하면 팔로워의 타임라인에서 상대방의 게시물을 제거합니다.
+    """
+    follower_id, author_id = instance.follower_id, instance.following_id
+    transaction.on_commit(lambda: services.remove_author(follower_id, author_id))
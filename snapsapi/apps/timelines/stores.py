@@ -0,0 +1,238 @@
+import threading
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from snapsapi.utils.redis import get_redis_client
+
+DEFAULT_STORE = 'snapsapi.apps.timelines.stores.InMemoryTimelineStore'
+
+_store_cache = {}
+
+
+class TimelineEntry(NamedTuple):
+    """
+    A single timeline item.
+    `score` is the post's created_at in epoch microseconds, so entries sort chronologically
+    and the value is still exactly representable as a Redis (double) score.
+    """
+    score: int
+    post_id: int
+    author_id: int
+
+    @property
+    def member(self) -> str:
+        # The author prefix lets a whole author be removed on unfollow.
+        return f'{self.author_id}:{self.post_id}'
+
+    @classmethod
+    def from_member(cls, member: str | bytes, score: float) -> 'TimelineEntry':
+        if isinstance(member, bytes):
+            member = member.decode()
+        author_id, post_id = member.split(':', 1)
+        return cls(score=int(score), post_id=int(post_id), author_id=int(author_id))
+
+    @property
+    def position(self) -> tuple[int, int]:
+        return self.score, self.post_id
+
+
+class BaseTimelineStore:
+    """
+    Interface for per-user timeline stores.
+    Each timeline keeps at most `max_length` of the newest entries.
+    """
+
+    def __init__(self, max_length: int | None = None):
+        self.max_length = max_length or settings.TIMELINE_MAX_LENGTH
+
+    def add(self, user_ids: Iterable[int], entries: list[TimelineEntry]) -> None:
+        """
+        Adds the entries to the timeline of every given user.
+        :param user_ids: Owners of the timelines
+        :param entries: Entries to push
+        """
+        raise NotImplementedError
+
+    def remove(self, user_ids: Iterable[int], entries: list[TimelineEntry]) -> None:
+        """Removes the entries from the timeline of every given user."""
+        raise NotImplementedError
+
+    def remove_author(self, user_id: int, author_id: int) -> None:
+        """Removes every entry of an author from a user's timeline."""
+        raise NotImplementedError
+
+    def get_entries(self, user_id: int, before: tuple[int, int] | None, limit: int) -> list[TimelineEntry]:
+        """
+        Returns up to `limit` entries older than `before`, newest first.
+        :param user_id: Owner of the timeline
+        :param before: (score, post_id) position of the last entry already seen
+        :param limit: Maximum number of entries
+        """
+        raise NotImplementedError
+
+    def replace(self, user_id: int, entries: list[TimelineEntry]) -> None:
+        """Replaces a user's whole timeline (used by the rebuild command)."""
+        raise NotImplementedError
+
+    def clear(self, user_id: int) -> None:
+        raise NotImplementedError
+
+
+class InMemoryTimelineStore(BaseTimelineStore):
+    """
+    Process-local store. Used by tests and local development; timelines are lost on restart
+    and are not shared between worker processes.
+    """
+
+    def __init__(self, max_length: int | None = None):
+        super().__init__(max_length)
+        self._timelines: dict[int, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _trim(self, timeline: dict[str, int]) -> None:
+        overflow = len(timeline) - self.max_length
+        if overflow <= 0:
+            return
+        oldest = sorted(timeline.items(), key=lambda item: (item[1], int(item[0].split(':')[1])))[:overflow]
+        for member, _ in oldest:
+            del timeline[member]
+
+    def add(self, user_ids, entries):
+        with self._lock:
+            for user_id in user_ids:
+                timeline = self._timelines.setdefault(user_id, {})
+                for entry in entries:
+                    timeline[entry.member] = entry.score
+                self._trim(timeline)
+
+    def remove(self, user_ids, entries):
+        with self._lock:
+            for user_id in user_ids:
+                timeline = self._timelines.get(user_id, {})
+                for entry in entries:
+                    timeline.pop(entry.member, None)
+
+    def remove_author(self, user_id, author_id):
+        prefix = f'{author_id}:'
+        with self._lock:
+            timeline = self._timelines.get(user_id, {})
+            for member in [member for member in timeline if member.startswith(prefix)]:
+                del timeline[member]
+
+    def get_entries(self, user_id, before, limit):
+        with self._lock:
+            entries = [
+                TimelineEntry.from_member(member, score)
+                for member, score in self._timelines.get(user_id, {}).items()
+            ]
+        if before is not None:
+            entries = [entry for entry in entries if entry.position < tuple(before)]
+        entries.sort(key=lambda entry: entry.position, reverse=True)
+        return entries[:limit]
+
+    def replace(self, user_id, entries):
+        with self._lock:
+            timeline = {entry.member: entry.score for entry in entries}
+            self._trim(timeline)
+            self._timelines[user_id] = timeline
+
+    def clear(self, user_id):
+        with self._lock:
+            self._timelines.pop(user_id, None)
+
+
+class RedisTimelineStore(BaseTimelineStore):
+    """
+    Redis sorted-set store; one ZSET per user (`timeline:<user_id>`), member `<author_id>:<post_id>`.
+    Writes for many users are batched into a single pipeline round-trip, and every write
+    trims the set with ZREMRANGEBYRANK so memory stays bounded.
+    Works with any Redis-protocol server (Redis, Valkey, KeyDB, ...).
+    """
+    key_prefix = 'timeline'
+    scan_count = 500
+
+    def __init__(self, max_length: int | None = None, url: str | None = None):
+        super().__init__(max_length)
+        url = url or settings.TIMELINE_REDIS_URL
+        if not url:
+            raise ValueError('RedisTimelineStore requires TIMELINE_REDIS_URL.')
+        self.client = get_redis_client(url)
+
+    def key(self, user_id: int) -> str:
+        return f'{self.key_prefix}:{user_id}'
+
+    def add(self, user_ids, entries):
+        if not entries:
+            return
+        mapping = {entry.member: entry.score for entry in entries}
+        pipe = self.client.pipeline(transaction=False)
+        for user_id in user_ids:
+            key = self.key(user_id)
+            pipe.zadd(key, mapping)
+            pipe.zremrangebyrank(key, 0, -self.max_length - 1)
+        pipe.execute()
+
+    def remove(self, user_ids, entries):
+        if not entries:
+            return
+        members = [entry.member for entry in entries]
+        pipe = self.client.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipe.zrem(self.key(user_id), *members)
+        pipe.execute()
+
+    def remove_author(self, user_id, author_id):
+        key = self.key(user_id)
+        members = [
+            member for member, _ in
+            self.client.zscan_iter(key, match=f'{author_id}:*', count=self.scan_count)
+        ]
+        if members:
+            self.client.zrem(key, *members)
+
+    def get_entries(self, user_id, before, limit):
+        key = self.key(user_id)
+        max_score = '+inf' if before is None else before[0]
+        entries = []
+        offset = 0
+        batch_size = limit + 1
+        # Entries sharing the cursor's score are filtered by post_id, so more than `limit`
+        # rows may need to be read. Keep reading until the page is full or the set is exhausted.
+        while True:
+            rows = self.client.zrevrangebyscore(
+                key, max_score, '-inf', start=offset, num=batch_size, withscores=True
+            )
+            for member, score in rows:
+                entry = TimelineEntry.from_member(member, score)
+                if before is None or entry.position < tuple(before):
+                    entries.append(entry)
+            if len(rows) < batch_size or len(entries) >= limit:
+                break
+            offset += batch_size
+        entries.sort(key=lambda entry: entry.position, reverse=True)
+        return entries[:limit]
+
+    def replace(self, user_id, entries):
+        key = self.key(user_id)
+        entries = sorted(entries, key=lambda entry: entry.position, reverse=True)[:self.max_length]
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(key)
+        if entries:
+            pipe.zadd(key, {entry.member: entry.score for entry in entries})
+        pipe.execute()
+
+    def clear(self, user_id):
+        self.client.delete(self.key(user_id))
+
+
+def get_timeline_store() -> BaseTimelineStore:
+    """
+    Returns the configured timeline store (`settings.TIMELINE_STORE`).
+    The instance is shared per dotted path so the in-memory store keeps its state.
+    """
+    path = getattr(settings, 'TIMELINE_STORE', None) or DEFAULT_STORE
+    if path not in _store_cache:
+        _store_cache[path] = import_string(path)()
+    return _store_cache[path]
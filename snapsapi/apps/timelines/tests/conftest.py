@@ -0,0 +1,40 @@
+import pytest
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from snapsapi.apps.timelines import stores
+
+
+@pytest.fixture(autouse=True)
+def timeline_store():
+    """Every test starts with an empty in-memory store."""
+    stores._store_cache.clear()
+    yield stores.get_timeline_store()
+    stores._store_cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def create_user(username):
+    return get_user_model().objects.create_user(email=f'{username}@snaps.com', password='mypassword', username=username)
+
+
+@pytest.fixture
+def user1():
+    return create_user('user1')
+
+
+@pytest.fixture
+def author():
+    return create_user('author')
+
+
+@pytest.fixture
+def jwt_client(api_client, user1):
+    refresh = RefreshToken.for_user(user1)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return api_client
@@ -0,0 +1,167 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.posts.models import Post
+from snapsapi.apps.timelines.stores import InMemoryTimelineStore, TimelineEntry
+
+from .conftest import create_user
+
+
+def timeline_post_ids(store, user):
+    return [entry.post_id for entry in store.get_entries(user.pk, None, 1000)]
+
+
+class TestInMemoryTimelineStore:
+    """Tests for the in-process timeline store"""
+
+    def test_timeline_should_be_trimmed_to_max_length(self):
+        store = InMemoryTimelineStore(max_length=3)
+        store.add([1], [TimelineEntry(score=score, post_id=score, author_id=9) for score in range(5)])
+        assert [entry.post_id for entry in store.get_entries(1, None, 10)] == [4, 3, 2]
+
+    def test_get_entries_should_page_through_equal_scores(self):
+        store = InMemoryTimelineStore(max_length=10)
+        store.add([1], [TimelineEntry(score=100, post_id=post_id, author_id=9) for post_id in range(5)])
+        first = store.get_entries(1, None, 2)
+        second = store.get_entries(1, first[-1].position, 2)
+        third = store.get_entries(1, second[-1].position, 2)
+        assert [entry.post_id for entry in first + second + third] == [4, 3, 2, 1, 0]
+
+    def test_remove_author_should_only_remove_that_author(self):
+        store = InMemoryTimelineStore(max_length=10)
+        store.add([1], [TimelineEntry(1, 1, 7), TimelineEntry(2, 2, 8), TimelineEntry(3, 3, 7)])
+        store.remove_author(1, 7)
+        assert [entry.post_id for entry in store.get_entries(1, None, 10)] == [2]
+
+
+@pytest.mark.django_db
+class TestTimelineFanOut:
+    """Tests for keeping timelines in sync with posts and follows"""
+
+    def test_new_post_should_be_pushed_to_followers(self, timeline_store, user1, author,
+                                                    django_capture_on_commit_callbacks):
+        Follow.objects.create(follower=user1, following=author)
+        with django_capture_on_commit_callbacks(execute=True):
+            post = Post.objects.create(user=author, caption='hello')
+
+        assert timeline_post_ids(timeline_store, user1) == [post.pk]
+        assert timeline_post_ids(timeline_store, author) == [post.pk]
+
+    def test_soft_deleted_post_should_be_removed(self, timeline_store, user1, author,
+                                                 django_capture_on_commit_callbacks):
+        Follow.objects.create(follower=user1, following=author)
+        with django_capture_on_commit_callbacks(execute=True):
+            post = Post.objects.create(user=author, caption='hello')
+        with django_capture_on_commit_callbacks(execute=True):
+            post.soft_delete()
+
+        assert timeline_post_ids(timeline_store, user1) == []
+
+    def test_follow_should_backfill_and_unfollow_should_prune(self, timeline_store, user1, author,
+                                                              django_capture_on_commit_callbacks):
+        posts = [Post.objects.create(user=author, caption=f'post {idx}') for idx in range(3)]
+        with django_capture_on_commit_callbacks(execute=True):
+            Follow.objects.follow(follower=user1, following=author)
+        assert sorted(timeline_post_ids(timeline_store, user1)) == sorted(post.pk for post in posts)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Follow.objects.unfollow(follower=user1, following=author)
+        assert timeline_post_ids(timeline_store, user1) == []
+
+    def test_authors_above_threshold_should_not_be_fanned_out(self, settings, timeline_store, user1, author,
+                                                              django_capture_on_commit_callbacks):
+        settings.TIMELINE_FANOUT_THRESHOLD = 1
+        Follow.objects.create(follower=user1, following=author)
+        Follow.objects.create(follower=create_user('user2'), following=author)
+        with django_capture_on_commit_callbacks(execute=True):
+            Post.objects.create(user=author, caption='hello')
+
+        assert timeline_post_ids(timeline_store, user1) == []
+
+    def test_deleting_a_post_above_threshold_should_only_touch_the_author(self, settings, timeline_store, user1,
+                                                                         author, django_capture_on_commit_callbacks):
+        settings.TIMELINE_FANOUT_THRESHOLD = 1
+        Follow.objects.create(follower=user1, following=author)
+        Follow.objects.create(follower=create_user('user2'), following=author)
+        with django_capture_on_commit_callbacks(execute=True):
+            post = Post.objects.create(user=author, caption='hello')
+
+        with mock.patch.object(timeline_store, 'remove', wraps=timeline_store.remove) as remove:
+            with django_capture_on_commit_callbacks(execute=True):
+                post.soft_delete()
+
+        assert [call.args[0] for call in remove.call_args_list] == [[author.pk]]
+        assert timeline_post_ids(timeline_store, author) == []
+
+
+@pytest.mark.django_db
+class TestHomeFeedView:
+    """Tests for /feed/"""
+
+    def test_feed_should_page_through_pushed_and_pulled_posts(self, settings, jwt_client, user1, author,
+                                                               django_capture_on_commit_callbacks):
+        settings.TIMELINE_FANOUT_THRESHOLD = 1
+        celebrity = create_user('celebrity')
+        Follow.objects.create(follower=create_user('fan1'), following=celebrity)
+        with django_capture_on_commit_callbacks(execute=True):
+            Follow.objects.create(follower=user1, following=author)
+            Follow.objects.create(follower=user1, following=celebrity)
+
+        stranger = create_user('stranger')
+        with django_capture_on_commit_callbacks(execute=True):
+            for idx in range(4):
+                Post.objects.create(user=author, caption=f'author {idx}')
+                Post.objects.create(user=celebrity, caption=f'celebrity {idx}')
+                Post.objects.create(user=stranger, caption=f'stranger {idx}')
+            own = Post.objects.create(user=user1, caption='mine')
+
+        expected = list(
+            Post.objects.filter(user__in=[user1, author, celebrity])
+            .order_by('-created_at', '-pk').values_list('uid', flat=True)
+        )
+        seen = []
+        url = reverse('timelines:home-feed') + '?page_size=3'
+        while url:
+            res = jwt_client.get(url)
+            assert res.status_code == status.HTTP_200_OK
+            seen.extend(item['uid'] for item in res.json()['results'])
+            url = res.json()['next']
+
+        assert seen == [str(uid) for uid in expected]
+        assert str(own.uid) in seen
+
+    def test_cold_timeline_should_be_rebuilt_on_first_read(self, jwt_client, user1, author):
+        Follow.objects.create(follower=user1, following=author)
+        post = Post.objects.create(user=author, caption='before the store existed')
+
+        res = jwt_client.get(reverse('timelines:home-feed'))
+        assert [item['uid'] for item in res.json()['results']] == [str(post.uid)]
+
+    def test_invalid_cursor_should_return_404(self, jwt_client):
+        res = jwt_client.get(reverse('timelines:home-feed'), {'cursor': 'garbage'})
+        assert res.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_feed_should_require_authentication(self, api_client):
+        res = api_client.get(reverse('timelines:home-feed'))
+        assert res.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestRebuildTimelinesCommand:
+    """Tests for the rebuild_timelines management command"""
+
+    def test_command_should_rebuild_from_follows_and_posts(self, timeline_store, user1, author):
+        Follow.objects.create(follower=user1, following=author)
+        posts = [Post.objects.create(user=author, caption=f'post {idx}') for idx in range(3)]
+        Post.objects.filter(pk=posts[0].pk).update(is_deleted=True)
+        timeline_store.add([user1.pk], [TimelineEntry(score=1, post_id=999, author_id=999)])
+
+        call_command('rebuild_timelines', user_uids=[user1.uid], stdout=StringIO())
+
+        assert sorted(timeline_post_ids(timeline_store, user1)) == sorted(post.pk for post in posts[1:])
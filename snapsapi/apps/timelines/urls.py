@@ -0,0 +1,9 @@
+from django.urls import path
+
+from snapsapi.apps.timelines import views
+
+app_name = 'timelines'
+
+urlpatterns = [
+    path('', views.HomeFeedView.as_view(), name='home-feed'),
+]
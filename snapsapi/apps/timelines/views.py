@@ -0,0 +1,65 @@
+from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from snapsapi.apps.core.pagination import decode_cursor, encode_cursor
+from snapsapi.apps.posts.serializers import PostReadSerializer
+from snapsapi.apps.timelines.services import get_home_feed
+
+CURSOR_KIND = 'timeline'
+
+
+class HomeFeedView(APIView):
+    """
+    Home feed built from the precomputed timeline of the requesting user.
+    - GET /feed/?cursor=...&page_size=10
+    """
+    permission_classes = [IsAuthenticated]
+    page_size = 10
+    max_page_size = 100
+
+    def get_page_size(self) -> int:
+        try:
+            page_size = int(self.request.query_params['page_size'])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_position(self) -> tuple[int, int] | None:
+        cursor = self.request.query_params.get('cursor')
+        if not cursor:
+            return None
+        payload = decode_cursor(cursor)
+        position = payload.get('p')
+        if payload.get('k') != CURSOR_KIND or not isinstance(position, list) or len(position) != 2 \
+                or not all(isinstance(value, int) for value in position):
+            raise NotFound('Invalid cursor.')
+        return position[0], position[1]
+
+    @extend_schema(
+        summary="홈 피드 조회",
+        description="팔로우한 사용자와 본인의 게시물을 최신순으로 조회합니다. 다음 페이지는 `next` 링크를 사용합니다.",
+        parameters=[
+            OpenApiParameter('cursor', str, description='이전 응답의 next 링크에 포함된 커서'),
+            OpenApiParameter('page_size', int, description='페이지 크기 (기본값: 10, 최대: 100)'),
+        ],
+        responses=inline_serializer(
+            name='HomeFeedResponse',
+            fields={
+                'next': serializers.URLField(allow_null=True),
+                'results': PostReadSerializer(many=True),
+            }
+        ),
+    )
+    def get(self, request, *args, **kwargs):
+        posts, next_position = get_home_feed(request.user.pk, self.get_position(), self.get_page_size())
+        next_link = None
+        if next_position is not None:
+            cursor = encode_cursor({'k': CURSOR_KIND, 'p': list(next_position)})
+            next_link = replace_query_param(request.build_absolute_uri(), 'cursor', cursor)
+        serializer = PostReadSerializer(posts, many=True, context={'request': request})
+        return Response({'next': next_link, 'results': serializer.data})
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.db.models import Count, F, Case, When, IntegerField, Q
 from django.contrib import messages
+from django.core.exceptions import ImproperlyConfigured
 from django.urls import path
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
@@ -8,6 +9,9 @@ from django.utils.html import format_html
 
 from snapsapi.apps.users.models import User, Profile
 from snapsapi.apps.core.models import Collection
+from snapsapi.apps.core.reconciliation import reconcile_counters
+
+USER_COUNTERS = ('user.posts_count', 'user.followers_count', 'user.following_count')
 
 
 @admin.action(description="Create default collection for selected users")
@@ -39,28 +43,29 @@ def create_default_collection(modeladmin, request, queryset):
         messages.info(request, f"Skipped {skipped_count} users who already have a default collection.")
 
 
-@admin.action(description="Reconcile posts count with actual posts")
-def reconcile_posts_count(modeladmin, request, queryset):
+def report_reconciliation(request, report):
     """
-    Action to reconcile the posts_count field with the actual count of Post objects.
-    This helps maintain data consistency between User.posts_count and the actual number
-    of Post objects that reference the User.
+    Shows the drift report of a counter reconciliation as admin messages.
     """
-    updated_count = 0
-    for user in queryset:
-        # Get the actual count of posts for this user
-        actual_posts_count = user.posts.filter(is_deleted=False).count()
+    for drift in report.counters:
+        if drift.rows_drifted:
+            messages.success(request, f"{drift.counter}: fixed {drift.rows_drifted} rows (total drift {drift.total_drift}).")
+    if not report.rows_drifted:
+        messages.info(request, "No counters needed to be updated.")
 
-        # Update the user's posts_count if it differs from the actual count
-        if user.posts_count != actual_posts_count:
-            user.posts_count = actual_posts_count
-            user.save(update_fields=['posts_count'])
-            updated_count += 1
 
-    if updated_count:
-        messages.success(request, f"Successfully updated posts count for {updated_count} users.")
-    else:
-        messages.info(request, "No users needed their posts count updated.")
+@admin.action(description="Reconcile posts/followers/following counts")
+def reconcile_posts_count(modeladmin, request, queryset):
+    """
+    Action to reconcile posts_count, followers_count and following_count of the selected users.
+    The counters are recomputed with grouped queries and fixed with one UPDATE per counter.
+    """
+    try:
+        report = reconcile_counters(USER_COUNTERS, pks=queryset.values_list('pk', flat=True))
+    except ImproperlyConfigured as e:
+        messages.error(request, str(e))
+        return
+    report_reconciliation(request, report)
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -114,22 +119,10 @@ class UserAdmin(admin.ModelAdmin):
         View to reconcile posts_count for all users.
         """
         if request.method == 'POST':
-            # Get all users
-            users = User.objects.all()
-            updated_count = 0
-
-            for user in users:
-                actual_posts_count = user.posts.filter(is_deleted=False).count()
-                if user.posts_count != actual_posts_count:
-                    user.posts_count = actual_posts_count
-                    user.save(update_fields=['posts_count'])
-                    updated_count += 1
-
-            if updated_count:
-                messages.success(request, f"Successfully updated posts count for {updated_count} users.")
-            else:
-                messages.info(request, "No users needed their posts count updated.")
-
+            try:
+                report_reconciliation(request, reconcile_counters(USER_COUNTERS))
+            except ImproperlyConfigured as e:
+                messages.error(request, str(e))
             return redirect('admin:users_user_changelist')
 
         # If not POST, show confirmation page
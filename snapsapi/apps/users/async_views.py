@@ -0,0 +1,36 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+
+from snapsapi.apps.core.async_api import async_api_view
+from snapsapi.apps.core.counters import get_counter_service
+from snapsapi.apps.core.models import Follow
+from snapsapi.apps.users import serializers as s
+
+User = get_user_model()
+
+
+@async_api_view(['POST'])
+async def follow_toggle(request, user_uid):
+    """
+    Async version of FollowToggleView: follows the user, or unfollows if already following.
+    """
+    follower = request.user
+    following = await User.objects.aget_user_by_uid(uid=user_uid)
+
+    follow, created = await Follow.objects.afollow(follower=follower, following=following)
+
+    if not created:
+        await Follow.objects.aunfollow(follower=follower, following=following)
+
+    # Latest counts from the database plus the deltas still buffered by the counter service
+    following.followers_count, following.following_count = await User.objects.filter(pk=following.pk) \
+        .values_list('followers_count', 'following_count').aget()
+    await sync_to_async(get_counter_service().overlay)([following], ('followers_count', 'following_count'))
+
+    serializer = s.FollowResponseSerializer({
+        'is_following': created,
+        'followers_count': following.followers_count,
+        'following_count': following.following_count
+    })
+    return JsonResponse(serializer.data)
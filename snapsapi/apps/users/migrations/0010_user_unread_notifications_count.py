@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-17 18:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_alter_user_username'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_notifications_count',
+            field=models.PositiveIntegerField(default=0, help_text='읽지 않은 인앱 알림 수'),
+        ),
+    ]
@@ -38,5 +38,12 @@ class UserManager(BaseUserManager):
         except ObjectDoesNotExist:
             raise UserNotExistException()
 
+    async def aget_user_by_uid(self, uid: str):
+        """Async version of get_user_by_uid()."""
+        try:
+            return await self.aget(uid=uid)
+        except ObjectDoesNotExist:
+            raise UserNotExistException()
+
     def get_followers(self, user: 'User'):
         follower_relations = user.followers_count
@@ -60,6 +60,7 @@ class User(AbstractUser, mx.UserMixin):
     posts_count = models.PositiveIntegerField(default=0, db_index=True)
     followers_count = models.PositiveIntegerField(default=0, db_index=True)
     following_count = models.PositiveIntegerField(default=0, db_index=True)
+    unread_notifications_count = models.PositiveIntegerField(default=0, help_text="읽지 않은 인앱 알림 수")
 
     # username = models.CharField(
     #     _("username"),
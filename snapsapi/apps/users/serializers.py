@@ -3,9 +3,29 @@ from rest_framework import serializers
 from dj_rest_auth.registration.serializers import SocialLoginSerializer
 from datetime import timezone, datetime, UTC, timedelta
 
+from snapsapi.apps.posts.image_variants import pick_variant_url
 from snapsapi.apps.posts.models import Post
 from snapsapi.apps.users.models import Profile
 from snapsapi.apps.core.models import Follow
+from snapsapi.apps.core.counters import get_counter_service
+from snapsapi.apps.posts.viewer_state import VIEWER_STATE_CONTEXT_KEY, ViewerStateResolver, get_viewer_state
+
+
+class UserListSerializer(serializers.ListSerializer):
+    """
+    List serializer for UserSerializer.
+    Resolves the viewer's follow edges for the whole page up front, so listing users
+    (followers, search results) does not run one query per row.
+    """
+
+    def to_representation(self, data):
+        users = list(data.all() if hasattr(data, 'all') else data)
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            state = get_viewer_state(self.context)
+            if state is None or not all(state.covers_user(user) for user in users):
+                self.context[VIEWER_STATE_CONTEXT_KEY] = ViewerStateResolver(request.user).resolve_users(users)
+        return super().to_representation(users)
 
 
 class UserSerializer(serializers.Serializer):
@@ -37,8 +57,14 @@ class UserSerializer(serializers.Serializer):
             return False
         if request_user == obj:
             return False
+        state = get_viewer_state(self.context)
+        if state is not None and state.covers_user(obj):
+            return state.is_following(obj)
         return Follow.objects.filter(follower=request_user, following=obj).exists()
 
+    class Meta:
+        list_serializer_class = UserListSerializer
+
 # class UserLoginSerializer(UserSerializer):
 #     email = serializers.EmailField(read_only=True)
 #     first_name = serializers.CharField(read_only=True)
@@ -89,6 +115,9 @@ class UserLoginSerializer(serializers.Serializer):
 
 
 
+PROFILE_COUNTER_FIELDS = ('posts_count', 'followers_count', 'following_count')
+
+
 class UserProfileSerializer(serializers.Serializer):
     """
     User profile information for display purposes.
@@ -112,14 +141,26 @@ class UserProfileSerializer(serializers.Serializer):
             'images',
         )
 
+    def to_representation(self, instance):
+        # Include counter deltas that are still buffered by the counter service.
+        get_counter_service().overlay([instance], PROFILE_COUNTER_FIELDS)
+        return super().to_representation(instance)
+
     def get_metadata(self, obj):
         return {
             'user_uid': obj.uid
         }
 
     def get_images(self, obj):
+        # 그리드에는 원본 대신 셀 크기에 맞는 가장 작은 변형을 내려준다.
         return {
-            "feed_images": Post.objects.get_posts_by_user(obj)
+            "feed_images": [
+                {
+                    'uid': post['uid'],
+                    'first_image_url': pick_variant_url(post['first_image_url'], post['first_image_variants']),
+                }
+                for post in Post.objects.get_posts_by_user(obj)
+            ]
         }
 
 
@@ -8,6 +8,7 @@ from dj_rest_auth.registration.views import (
     SocialConnectView as _SocialConnectView
 )
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiResponse, extend_schema_view, inline_serializer
 from rest_framework import status
@@ -34,6 +35,12 @@ from snapsapi.apps.users.serializers import (
 #     UsernameUpdateSerializer, UserProfileSerializer, UserProfileImageFileInfoSerializer,
 #     UserProfileUpdateSerializer
 )
+from snapsapi.apps.core.conditional import ConditionalGetMixin
+from snapsapi.apps.core.counters import get_counter_service
+from snapsapi.apps.core.pagination import OptionalKeysetCursorPagination
+from snapsapi.apps.posts.models import Post
+from snapsapi.apps.posts.viewer_state import VIEWER_STATE_CONTEXT_KEY, ViewerStateResolver
+from snapsapi.apps.search.backends import get_search_backend
 from snapsapi.utils.aws import create_presigned_post, build_user_profile_image_object_name
 
 User = get_user_model()
@@ -142,8 +149,10 @@ class FollowToggleView(APIView):
                 following=following
             )
 
-        # Refresh the object to get the latest count information from the database
-        following.refresh_from_db()
+        # Refresh the object to get the latest count information from the database,
+        # then add any deltas still buffered by the counter service.
+        following.refresh_from_db(fields=['followers_count', 'following_count'])
+        get_counter_service().overlay([following], ('followers_count', 'following_count'))
 
         serializer = s.FollowResponseSerializer({
             'is_following': created,  # True if created (follow successful), False if not (unfollow successful)
@@ -154,12 +163,38 @@ class FollowToggleView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserProfileView(RetrieveAPIView):
-    queryset = User.objects.filter(is_active=True, is_deleted=False)
+class UserProfileView(ConditionalGetMixin, RetrieveAPIView):
+    """
+    Supports conditional requests: the ETag covers the profile, the counters, the latest
+    change among the user's posts and the viewer's follow state.
+    """
+    queryset = User.objects.filter(is_active=True, is_deleted=False).select_related('profile')
     serializer_class = s.UserProfileSerializer
 
     lookup_field = 'uid'
     lookup_url_kwarg = 'user_uid'
+    viewer_state = None
+
+    def get_etag_components(self, user):
+        get_counter_service().overlay([user], s.PROFILE_COUNTER_FIELDS)
+        profile = getattr(user, 'profile', None)
+        # Soft deletes also bump updated_at, so max/count over all posts covers the feed images.
+        posts = Post.objects.filter(user=user).aggregate(last_updated=Max('updated_at'), total=Count('pk'))
+        components = [
+            user.uid, user.username, profile and profile.image_url, profile and profile.bio,
+            user.posts_count, user.followers_count, user.following_count,
+            posts['last_updated'], posts['total'],
+        ]
+        if self.request.user.is_authenticated:
+            self.viewer_state = ViewerStateResolver(self.request.user).resolve_users([user])
+            components += [self.request.user.pk, self.viewer_state.is_following(user)]
+        return components
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.viewer_state is not None:
+            context[VIEWER_STATE_CONTEXT_KEY] = self.viewer_state
+        return context
 
 
 class UsernameUpdateView(UpdateAPIView):
@@ -222,17 +257,17 @@ class UserSearchView(ListAPIView):
 
     def get_queryset(self):
         """
-        If the 'username' query parameter exists, searches for all users
-        whose usernames contain the search term (case-insensitive) using the username__icontains filter.
+        If the 'username' query parameter exists, searches for users whose usernames
+        match the search term through the configured search backend (trigram index on PostgreSQL).
         """
         username_query = self.request.query_params.get('username', None)
 
         if username_query:
-            # Find users whose username field contains the search term (icontains)
             # Exclude the current user from search results using exclude(pk=self.request.user.pk)
-            return User.objects.filter(
-                username__icontains=username_query
-            ).exclude(pk=self.request.user.pk)
+            queryset = User.objects.filter(is_active=True, is_deleted=False) \
+                .exclude(pk=self.request.user.pk) \
+                .select_related('profile')
+            return get_search_backend().search_users(queryset, username_query)
 
         # Return an empty queryset if there's no search term
         return User.objects.none()
@@ -255,6 +290,8 @@ class UserFollowListView(ListAPIView):
     """
     serializer_class = s.UserSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = OptionalKeysetCursorPagination
+    cursor_ordering = ('-date_joined', '-pk')
 
     def get_queryset(self):
         """
@@ -273,10 +310,10 @@ class UserFollowListView(ListAPIView):
         if connection_type == 'followers':
             # Get users who follow the specified user
             follower_relations = Follow.objects.filter(following=user)
-            return User.objects.filter(id__in=follower_relations.values('follower_id'))
+            return User.objects.filter(id__in=follower_relations.values('follower_id')).select_related('profile')
         elif connection_type == 'following':
             # Get users the specified user is following
             following_relations = Follow.objects.filter(follower=user)
-            return User.objects.filter(id__in=following_relations.values('following_id'))
+            return User.objects.filter(id__in=following_relations.values('following_id')).select_related('profile')
         else:
             return User.objects.none()
@@ -0,0 +1,73 @@
+import os
+from dataclasses import dataclass
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from snapsapi.apps.core.models import Collection
+from snapsapi.apps.core.seeding import DatasetSeeder, SeedConfig
+from snapsapi.apps.posts.models import Post
+from snapsapi.apps.users.models import User
+from snapsapi.benchmarks.harness import BenchmarkReport
+
+# The benchmarks commit and flush seeded data and have latency budgets, so a plain `pytest` skips them.
+if not os.getenv('SNAPSAPI_BENCHMARKS'):
+    collect_ignore_glob = ['test_*.py']
+
+# Dataset sizes (number of users) each endpoint is measured on, e.g. SNAPSAPI_BENCHMARK_SIZES=100,1000.
+SIZES = [int(size) for size in os.getenv('SNAPSAPI_BENCHMARK_SIZES', '10,40').split(',')]
+# Timed requests per measurement.
+ROUNDS = int(os.getenv('SNAPSAPI_BENCHMARK_ROUNDS', 5))
+# Multiplier for the latency budgets on slower machines; 0 disables them (query and memory budgets still apply).
+TIME_FACTOR = float(os.getenv('SNAPSAPI_BENCHMARK_TIME_FACTOR', 1))
+# When set, the measurements are written to this file as JSON.
+JSON_PATH = os.getenv('SNAPSAPI_BENCHMARK_JSON')
+
+
+@dataclass
+class Dataset:
+    size: int
+    viewer: User
+    post: Post
+    author: User
+    collection: Collection
+
+    def client(self, authenticated: bool = True) -> APIClient:
+        client = APIClient()
+        if authenticated:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.viewer).access_token}')
+        return client
+
+
+@pytest.fixture(scope='session')
+def benchmark_report():
+    report = BenchmarkReport()
+    yield report
+    if JSON_PATH:
+        report.write(JSON_PATH)
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=lambda size: f'users={size}')
+def dataset(request, django_db_setup, django_db_blocker):
+    """
+    Seeds a dataset of the given size once per module. The rows are committed so every benchmark
+    of the module reads them, and flushed afterwards so the regular tests start from an empty database.
+    """
+    size = request.param
+    with django_db_blocker.unblock():
+        DatasetSeeder(SeedConfig(users=size, posts_per_user=3, follows_per_user=5, likes_per_post=5,
+                                 comments_per_post=4, collections_per_user=0.5, posts_per_collection=8,
+                                 seed=size)).run()
+        # collections are private to their owner, so the owner of the largest one is the viewer
+        collection = Collection.objects.annotate(n=Count('posts')).order_by('-n', 'pk').select_related('owner').first()
+        yield Dataset(
+            size=size,
+            viewer=collection.owner,
+            post=Post.objects.order_by('-comments_count', 'pk').first(),
+            author=User.objects.exclude(pk=collection.owner_id).order_by('-followers_count', 'pk').first(),
+            collection=collection,
+        )
+        call_command('flush', interactive=False, verbosity=0)
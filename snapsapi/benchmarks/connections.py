@@ -0,0 +1,142 @@
+"""
+Request latency with a new database connection per request versus persistent connections.
+
+Requests go through the WSGI handler in-process, so Django opens and closes connections exactly as
+it does behind gunicorn (the test client would keep them open). Each mode is applied to the
+`default` connection settings before its requests:
+
+- per-request: CONN_MAX_AGE=0, a connection (TCP, TLS, authentication) for every request
+- persistent: CONN_MAX_AGE=600, one connection reused by all requests
+- persistent+health-checks: as above, with CONN_HEALTH_CHECKS pinging the reused connection
+
+    DJANGO_SETTINGS_MODULE=snapsapi.config.settings.local python -m snapsapi.benchmarks.connections
+    python -m snapsapi.benchmarks.connections --path /posts/ --requests 1000 --json connections.json
+
+Point DB_HOST/DB_PORT at pgbouncer (with SNAPSAPI_DB_PGBOUNCER=true) to measure the per-request mode
+against a pooler as well.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from wsgiref.util import setup_testing_defaults
+
+from snapsapi.benchmarks.loadtest import percentile
+
+MODES = {
+    'per-request': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': False},
+    'persistent+health-checks': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+}
+DEFAULT_PATH = '/posts/'
+
+
+@dataclass
+class ConnectionResult:
+    mode: str
+    requests: int
+    errors: int
+    connections_opened: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def request(application, path: str) -> int:
+    """Sends one GET request through the WSGI application and returns its status code."""
+    path, _, query_string = path.partition('?')
+    environ = {'PATH_INFO': path, 'QUERY_STRING': query_string, 'REQUEST_METHOD': 'GET'}
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in response:
+            pass
+    finally:
+        # Sends request_finished, which closes or keeps the connection.
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+def run_mode(application, mode: str, path: str, requests: int, alias: str = 'default') -> ConnectionResult:
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection = connections[alias]
+    connection.close()
+    connection.settings_dict.update(MODES[mode])
+
+    opened = 0
+
+    def count(sender, connection, **kwargs):
+        nonlocal opened
+        if connection.alias == alias:
+            opened += 1
+
+    connection_created.connect(count, weak=False)
+    latencies, errors = [], 0
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            if request(application, path) >= 400:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        connection_created.disconnect(count)
+        connection.close()
+
+    return ConnectionResult(
+        mode=mode,
+        requests=requests,
+        errors=errors,
+        connections_opened=opened,
+        mean_ms=round(statistics.fmean(latencies), 2),
+        p50_ms=round(statistics.median(latencies), 2),
+        p95_ms=round(percentile(latencies, 0.95), 2),
+        p99_ms=round(percentile(latencies, 0.99), 2),
+    )
+
+
+def print_table(results: list[ConnectionResult]) -> None:
+    width = max(len('mode'), *(len(r.mode) for r in results))
+    header = (f"{'mode':<{width}} {'requests':>8} {'opened':>7} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'errors':>7}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f'{r.mode:<{width}} {r.requests:>8} {r.connections_opened:>7} {r.mean_ms:>8} {r.p50_ms:>8} '
+              f'{r.p95_ms:>8} {r.p99_ms:>8} {r.errors:>7}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default=DEFAULT_PATH, help=f'Path requested (default: {DEFAULT_PATH})')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per mode (default: 500)')
+    parser.add_argument('--modes', default=','.join(MODES), help=f'Comma separated modes (default: {",".join(MODES)})')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'snapsapi.config.settings.local')
+    from django.core.wsgi import get_wsgi_application
+    application = get_wsgi_application()
+
+    modes = args.modes.split(',')
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        sys.exit(f'Unknown modes: {", ".join(sorted(unknown))}')
+    for mode in modes:
+        run_mode(application, mode, args.path, min(args.requests, 20))  # warm-up
+    results = [run_mode(application, mode, args.path, args.requests) for mode in modes]
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
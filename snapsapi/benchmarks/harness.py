@@ -0,0 +1,134 @@
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Any, Callable
+
+import django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Transaction bookkeeping of atomic blocks is not a query the endpoint chose to make.
+IGNORED_STATEMENTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    Upper limits for one endpoint, whatever the dataset size.
+    The query budget does not grow with the data, so an N+1 regression fails on the larger datasets.
+    """
+    queries: int
+    ms: float
+    kib: float
+
+
+@dataclass
+class Measurement:
+    endpoint: str
+    size: int
+    status: int
+    queries: int
+    times_ms: list[float]
+    peak_kib: float
+    allocated_kib: float
+    sql: list[str] = field(default_factory=list, repr=False)
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.times_ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'endpoint': self.endpoint,
+            'size': self.size,
+            'status': self.status,
+            'queries': self.queries,
+            'median_ms': round(self.median_ms, 3),
+            'min_ms': round(min(self.times_ms), 3),
+            'max_ms': round(max(self.times_ms), 3),
+            'rounds': len(self.times_ms),
+            'peak_kib': round(self.peak_kib, 1),
+            'allocated_kib': round(self.allocated_kib, 1),
+        }
+
+
+def measure(endpoint: str, size: int, call: Callable[[], Any], rounds: int = 5, warmup: int = 1) -> Measurement:
+    """
+    Calls `call` (one request) `warmup` times, then records:
+    - the queries of one request (CaptureQueriesContext),
+    - the wall time of `rounds` requests without query capturing,
+    - the peak and net memory allocated by one request (tracemalloc).
+    Each is measured in its own pass so the instruments do not skew each other.
+    """
+    for _ in range(warmup):
+        call()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = call()
+    sql = [query['sql'] for query in ctx.captured_queries if not query['sql'].startswith(IGNORED_STATEMENTS)]
+
+    times_ms = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        call()
+        times_ms.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        call()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        endpoint=endpoint,
+        size=size,
+        status=response.status_code,
+        queries=len(sql),
+        times_ms=times_ms,
+        peak_kib=(peak - before) / 1024,
+        allocated_kib=(after - before) / 1024,
+        sql=sql,
+    )
+
+
+def check_budget(measurement: Measurement, budget: Budget, time_factor: float = 1.0) -> list[str]:
+    """Returns a description of every exceeded limit (empty when the endpoint is within budget)."""
+    violations = []
+    if measurement.queries > budget.queries:
+        violations.append(f'{measurement.queries} queries > budget {budget.queries}:\n  ' + '\n  '.join(measurement.sql))
+    if time_factor and measurement.median_ms > budget.ms * time_factor:
+        violations.append(f'median {measurement.median_ms:.1f}ms > budget {budget.ms * time_factor:.1f}ms')
+    if measurement.peak_kib > budget.kib:
+        violations.append(f'peak memory {measurement.peak_kib:.0f}KiB > budget {budget.kib:.0f}KiB')
+    return violations
+
+
+class BenchmarkReport:
+    """Collects the measurements of a run and writes them as JSON for comparison across runs."""
+
+    def __init__(self):
+        self.measurements: list[Measurement] = []
+
+    def add(self, measurement: Measurement) -> None:
+        self.measurements.append(measurement)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'created_at': datetime.now(UTC).isoformat(),
+            'git_revision': os.getenv('GIT_COMMIT') or os.getenv('GITHUB_SHA'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'results': [measurement.as_dict() for measurement in self.measurements],
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
@@ -0,0 +1,257 @@
+"""
+Throughput of the gunicorn worker profiles (gunicorn.conf.py) on I/O-bound requests.
+
+For each profile a gunicorn server is started with snapsapi.benchmarks.loadtest_app, loaded by
+`--concurrency` clients for `--duration` seconds, and stopped. The default path waits 200ms per
+request like a view that sends an FCM push or exchanges an OAuth code; use --path to load any other
+endpoint of the app as well.
+
+With --async-endpoints the endpoints that have a native async version (snapsapi.config.async_urls)
+are loaded instead, as a seeded user (`python manage.py seed_dataset`): WSGI profiles get the DRF
+paths, the uvicorn profile (ASGI) gets the /async/ paths.
+
+    python -m snapsapi.benchmarks.loadtest --profiles sync,gthread,gevent --concurrency 64
+    python -m snapsapi.benchmarks.loadtest --url http://localhost:8080/posts/ --concurrency 32
+    python -m snapsapi.benchmarks.loadtest --profiles gthread,uvicorn --async-endpoints --concurrency 256
+
+Only the standard library is used on the client side; the gevent and uvicorn profiles need
+`gevent` and `uvicorn` installed.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+DEFAULT_PATH = '/__loadtest/io/?ms=200'
+WSGI_APP = 'snapsapi.benchmarks.loadtest_app:application'
+ASGI_APP = 'snapsapi.benchmarks.loadtest_app:asgi_application'
+ASGI_PROFILES = {'uvicorn'}
+
+
+@dataclass
+class LoadResult:
+    target: str
+    concurrency: int
+    duration_s: float
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+@dataclass
+class Endpoint:
+    """An endpoint with a DRF path and the path of its native async version."""
+    name: str
+    method: str
+    sync_path: str
+    async_path: str
+    body: dict | None = None
+
+
+def run_load(url: str, concurrency: int, duration: float, timeout: float = 30.0, target: str | None = None,
+             method: str = 'GET', body: dict | None = None, headers: dict | None = None) -> LoadResult:
+    """Sends requests to `url` from `concurrency` threads for `duration` seconds."""
+    deadline = time.perf_counter() + duration
+    headers = dict(headers or {})
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+        headers['Content-Type'] = 'application/json'
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def client():
+        nonlocal errors
+        local_latencies, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                request = urllib.request.Request(url, data=data, headers=headers, method=method)
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                local_latencies.append((time.perf_counter() - started) * 1000)
+            except (urllib.error.URLError, OSError):
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    elapsed = time.perf_counter() - started
+
+    return LoadResult(
+        target=target or url,
+        concurrency=concurrency,
+        duration_s=round(elapsed, 2),
+        requests=len(latencies),
+        errors=errors,
+        throughput_rps=round(len(latencies) / elapsed, 1),
+        p50_ms=round(statistics.median(latencies), 1) if latencies else 0.0,
+        p95_ms=round(percentile(latencies, 0.95), 1),
+        p99_ms=round(percentile(latencies, 0.99), 1),
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'{base_url}/core/health/', timeout=1):
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not answer on {base_url} within {timeout}s')
+
+
+@contextmanager
+def gunicorn_server(profile: str, workers: int | None):
+    """Starts gunicorn with the given profile and yields its base URL."""
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    env = {**os.environ, 'GUNICORN_PROFILE': profile, 'GUNICORN_BIND': f'127.0.0.1:{port}',
+           'GUNICORN_ACCESSLOG': '', 'GUNICORN_LOGLEVEL': 'warning'}
+    if workers:
+        env['GUNICORN_WORKERS'] = str(workers)
+    app = ASGI_APP if profile in ASGI_PROFILES else WSGI_APP
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', app], env=env)
+    try:
+        wait_until_ready(base_url, process)
+        yield base_url
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_profile(profile: str, path: str, concurrency: int, duration: float, workers: int | None) -> LoadResult:
+    """Starts gunicorn with the given profile, loads it and stops it."""
+    with gunicorn_server(profile, workers) as base_url:
+        run_load(base_url + path, concurrency, min(duration, 2.0))  # warm-up
+        return run_load(base_url + path, concurrency, duration, target=profile)
+
+
+def get_async_endpoints() -> tuple[dict, list[Endpoint]]:
+    """
+    Authorization header of the first seeded user, and the endpoints of snapsapi.config.async_urls
+    pointed at a post and a user of someone else.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'snapsapi.config.settings.local')
+    import django
+    django.setup()
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import AccessToken
+    from snapsapi.apps.posts.models import Post
+
+    viewer = get_user_model().objects.filter(is_active=True, is_deleted=False).order_by('pk').first()
+    post = viewer and Post.objects.filter(is_deleted=False).exclude(user=viewer).select_related('user').first()
+    if post is None:
+        raise SystemExit('--async-endpoints needs a seeded database: python manage.py seed_dataset')
+
+    endpoints = [
+        Endpoint('health', 'GET', '/core/health/', '/async/core/health/'),
+        Endpoint('like', 'POST', f'/posts/{post.uid}/likes/', f'/async/posts/{post.uid}/likes/'),
+        Endpoint('follow', 'POST', f'/users/{post.user.uid}/follow/', f'/async/users/{post.user.uid}/follow/'),
+        Endpoint('device', 'POST', '/notifications/devices/', '/async/notifications/devices/',
+                 {'registration_id': 'loadtest-device', 'type': 'web'}),
+        Endpoint('presigned', 'POST', '/posts/presigned-url/', '/async/posts/presigned-url/',
+                 {'files': [{'file_name': 'loadtest.jpg', 'file_type': 'image/jpeg'}]}),
+    ]
+    return {'Authorization': f'Bearer {AccessToken.for_user(viewer)}'}, endpoints
+
+
+def run_endpoints(profile: str, endpoints: list[Endpoint], headers: dict, concurrency: int, duration: float,
+                  workers: int | None) -> list[LoadResult]:
+    """Loads every endpoint on one gunicorn server: async paths under ASGI, DRF paths under WSGI."""
+    results = []
+    with gunicorn_server(profile, workers) as base_url:
+        for endpoint in endpoints:
+            path = endpoint.async_path if profile in ASGI_PROFILES else endpoint.sync_path
+            options = {'method': endpoint.method, 'body': endpoint.body, 'headers': headers}
+            run_load(base_url + path, concurrency, min(duration, 2.0), **options)  # warm-up
+            results.append(run_load(base_url + path, concurrency, duration, target=f'{endpoint.name} {profile}',
+                                    **options))
+    return results
+
+
+def print_table(results: list[LoadResult]) -> None:
+    width = max(len('target'), *(len(r.target) for r in results))
+    header = f"{'target':<{width}} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f'{r.target:<{width}} {r.concurrency:>5} {r.throughput_rps:>9} {r.p50_ms:>9} {r.p95_ms:>9} '
+              f'{r.p99_ms:>9} {r.errors:>7}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', default='sync,gthread,gevent',
+                        help='Comma separated GUNICORN_PROFILE values to compare (default: sync,gthread,gevent)')
+    parser.add_argument('--url', help='Load an already running server instead of starting gunicorn')
+    parser.add_argument('--path', default=DEFAULT_PATH, help=f'Path requested on each server (default: {DEFAULT_PATH})')
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent clients (default: 64)')
+    parser.add_argument('--duration', type=float, default=15, help='Seconds of load per target (default: 15)')
+    parser.add_argument('--workers', type=int, help='Same number of workers for every profile (GUNICORN_WORKERS)')
+    parser.add_argument('--async-endpoints', action='store_true',
+                        help='Compare the endpoints that have a native async version instead of --path')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        results = [run_load(args.url, args.concurrency, args.duration)]
+    elif args.async_endpoints:
+        headers, endpoints = get_async_endpoints()
+        results = [
+            result
+            for profile in args.profiles.split(',')
+            for result in run_endpoints(profile, endpoints, headers, args.concurrency, args.duration, args.workers)
+        ]
+        results.sort(key=lambda result: result.target)
+    else:
+        results = [
+            run_profile(profile, args.path, args.concurrency, args.duration, args.workers)
+            for profile in args.profiles.split(',')
+        ]
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
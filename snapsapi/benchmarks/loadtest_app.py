@@ -0,0 +1,64 @@
+"""
+WSGI (`application`) and ASGI (`asgi_application`) applications used by
+`python -m snapsapi.benchmarks.loadtest`.
+
+They serve the regular API plus `/__loadtest/io/?ms=<n>`, which waits `n` milliseconds the
+way a view waits on an outgoing call (FCM push, OAuth token exchange) and then runs one
+query, so worker models can be compared on I/O-bound requests without calling external
+services. The ASGI version waits with asyncio.sleep. Never deploy them.
+"""
+import asyncio
+import os
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'snapsapi.config.settings.local')
+
+IO_PATH = '/__loadtest/io/'
+
+django_application = get_wsgi_application()
+django_asgi_application = get_asgi_application()
+
+
+def get_delay_ms(query_string: str) -> int:
+    return int(parse_qs(query_string).get('ms', ['100'])[0])
+
+
+def run_query():
+    from django.db import close_old_connections, connection
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    finally:
+        close_old_connections()
+
+
+def io_bound(environ, start_response):
+    # time.sleep is cooperative under gevent once the worker has patched the standard library.
+    time.sleep(get_delay_ms(environ.get('QUERY_STRING', '')) / 1000)
+    run_query()
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [b'{"status": "ok"}']
+
+
+def application(environ, start_response):
+    if environ.get('PATH_INFO') == IO_PATH:
+        return io_bound(environ, start_response)
+    return django_application(environ, start_response)
+
+
+async def asgi_application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == IO_PATH:
+        await asyncio.sleep(get_delay_ms(scope['query_string'].decode()) / 1000)
+        # Outside Django's request handling there is no per-request thread; any pool thread will do.
+        await sync_to_async(run_query, thread_sensitive=False)()
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': b'{"status": "ok"}'})
+        return
+    await django_asgi_application(scope, receive, send)
@@ -0,0 +1,49 @@
+import pytest
+from django.urls import reverse
+
+from snapsapi.benchmarks.conftest import ROUNDS, TIME_FACTOR
+from snapsapi.benchmarks.harness import Budget, check_budget, measure
+
+# name: (method, url(dataset), authenticated, budget)
+# Query budgets are exact upper bounds that must not grow with the dataset size; a higher count
+# usually means an N+1. Latency (median, in ms) and memory (peak KiB) budgets leave room for
+# slower machines, see SNAPSAPI_BENCHMARK_TIME_FACTOR.
+ENDPOINTS = {
+    'post_list': ('get', lambda d: reverse('posts:posts-list-create'), True,
+                  Budget(queries=10, ms=150, kib=1024)),
+    'post_list_anonymous': ('get', lambda d: reverse('posts:posts-list-create'), False,
+                            Budget(queries=6, ms=150, kib=1024)),
+    'post_detail': ('get', lambda d: reverse('posts:posts-detail', kwargs={'uid': d.post.uid}), True,
+                    Budget(queries=7, ms=100, kib=512)),
+    'post_comments': ('get', lambda d: reverse('posts:comments-list-create', kwargs={'uid': d.post.uid})
+                      + '?pagination=cursor', True,
+                      Budget(queries=5, ms=150, kib=1024)),
+    # 커서 없이 요청하면 기존 클라이언트를 위해 전체 목록을 반환하므로 댓글 수에 비례한다.
+    'post_comments_unpaginated': ('get', lambda d: reverse('posts:comments-list-create', kwargs={'uid': d.post.uid}),
+                                  True, Budget(queries=5, ms=1000, kib=8192)),
+    'collection_detail': ('get', lambda d: reverse('collections-detail', kwargs={'uid': d.collection.uid}), True,
+                          Budget(queries=7, ms=150, kib=512)),
+    'profile': ('get', lambda d: reverse('users:user-profile', kwargs={'user_uid': d.author.uid}), True,
+                Budget(queries=5, ms=100, kib=512)),
+    'follower_list': ('get', lambda d: reverse('users:user-connections', kwargs={'user_uid': d.author.uid}), True,
+                      Budget(queries=4, ms=100, kib=512)),
+    'like_toggle': ('post', lambda d: reverse('posts:like-toggle', kwargs={'uid': d.post.uid}), True,
+                    Budget(queries=6, ms=100, kib=256)),
+    'follow_toggle': ('post', lambda d: reverse('users:user-follow-toggle', kwargs={'user_uid': d.author.uid}), True,
+                      Budget(queries=8, ms=100, kib=256)),
+}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ENDPOINTS)
+def test_endpoint_within_budget(name, dataset, benchmark_report):
+    method, url, authenticated, budget = ENDPOINTS[name]
+    client = dataset.client(authenticated)
+    path = url(dataset)
+
+    measurement = measure(name, dataset.size, lambda: getattr(client, method)(path), rounds=ROUNDS)
+    benchmark_report.add(measurement)
+
+    assert measurement.status < 400, f'{name} returned {measurement.status}'
+    violations = check_budget(measurement, budget, TIME_FACTOR)
+    assert not violations, f'{name} (users={dataset.size}) exceeded its budget:\n' + '\n'.join(violations)
@@ -0,0 +1,131 @@
+"""
+List endpoint throughput with every request in a transaction versus only the unsafe ones.
+
+Requests go through the WSGI handler in-process (see benchmarks/connections.py). Each policy is
+applied to the views using AtomicUnsafeMethodsMixin before its requests:
+
+- blanket: every method in transaction.atomic(), like the former
+  `@method_decorator(transaction.atomic, name='dispatch')`
+- unsafe-only: POST/PUT/PATCH/DELETE in transaction.atomic(), reads in autocommit
+
+    DJANGO_SETTINGS_MODULE=snapsapi.config.settings.local python -m snapsapi.benchmarks.transactions
+    python -m snapsapi.benchmarks.transactions --path /collections/ --requests 2000 --threads 8
+
+With several threads each one uses its own connection, as the gthread workers do. The difference
+per request is the BEGIN/COMMIT round trips, so run it against PostgreSQL (or through pgbouncer).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from snapsapi.benchmarks.connections import request
+from snapsapi.benchmarks.loadtest import percentile
+
+POLICIES = {
+    'blanket': frozenset({'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}),
+    'unsafe-only': frozenset({'POST', 'PUT', 'PATCH', 'DELETE'}),
+}
+DEFAULT_PATH = '/posts/'
+
+
+@dataclass
+class PolicyResult:
+    policy: str
+    requests: int
+    threads: int
+    errors: int
+    requests_per_second: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def run_policy(application, policy: str, path: str, requests: int, threads: int = 1) -> PolicyResult:
+    from django.db import connection
+    from snapsapi.apps.core.transactions import AtomicUnsafeMethodsMixin
+
+    default_methods = AtomicUnsafeMethodsMixin.atomic_methods
+    AtomicUnsafeMethodsMixin.atomic_methods = POLICIES[policy]
+
+    def worker(count: int) -> tuple[list[float], int]:
+        latencies, errors = [], 0
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                if request(application, path) >= 400:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+        return latencies, errors
+
+    shares = [requests // threads + (i < requests % threads) for i in range(threads)]
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            outcomes = list(executor.map(worker, shares))
+        elapsed = time.perf_counter() - started
+    finally:
+        AtomicUnsafeMethodsMixin.atomic_methods = default_methods
+
+    latencies = [latency for worker_latencies, _ in outcomes for latency in worker_latencies]
+    return PolicyResult(
+        policy=policy,
+        requests=requests,
+        threads=threads,
+        errors=sum(errors for _, errors in outcomes),
+        requests_per_second=round(requests / elapsed, 1),
+        mean_ms=round(statistics.fmean(latencies), 2),
+        p50_ms=round(statistics.median(latencies), 2),
+        p95_ms=round(percentile(latencies, 0.95), 2),
+        p99_ms=round(percentile(latencies, 0.99), 2),
+    )
+
+
+def print_table(results: list[PolicyResult]) -> None:
+    width = max(len('policy'), *(len(r.policy) for r in results))
+    header = (f"{'policy':<{width}} {'requests':>8} {'threads':>7} {'req/s':>8} {'mean ms':>8} {'p50 ms':>8} "
+              f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f'{r.policy:<{width}} {r.requests:>8} {r.threads:>7} {r.requests_per_second:>8} {r.mean_ms:>8} '
+              f'{r.p50_ms:>8} {r.p95_ms:>8} {r.p99_ms:>8} {r.errors:>7}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default=DEFAULT_PATH, help=f'Path requested (default: {DEFAULT_PATH})')
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per policy (default: 1000)')
+    parser.add_argument('--threads', type=int, default=1, help='Concurrent clients (default: 1)')
+    parser.add_argument('--policies', default=','.join(POLICIES),
+                        help=f'Comma separated policies (default: {",".join(POLICIES)})')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'snapsapi.config.settings.local')
+    from django.core.wsgi import get_wsgi_application
+    application = get_wsgi_application()
+
+    policies = args.policies.split(',')
+    unknown = set(policies) - set(POLICIES)
+    if unknown:
+        sys.exit(f'Unknown policies: {", ".join(sorted(unknown))}')
+    for policy in policies:
+        run_policy(application, policy, args.path, min(args.requests, 20), args.threads)  # warm-up
+    results = [run_policy(application, policy, args.path, args.requests, args.threads) for policy in policies]
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""
+Native async versions of I/O-bound endpoints, mounted under /async/ with the names of their
+sync counterparts (e.g. `async:like-toggle`). They run on the event loop under ASGI
+(snapsapi.config.asgi); under WSGI Django runs them in a per-request event loop instead.
+"""
+from django.urls import path
+
+from snapsapi.apps.core.async_views import health_check
+from snapsapi.apps.likes.async_views import post_like_toggle
+from snapsapi.apps.notifications.async_views import register_device
+from snapsapi.apps.posts.async_views import post_image_upload_url
+from snapsapi.apps.users.async_views import follow_toggle
+
+app_name = 'async'
+
+urlpatterns = [
+    path('core/health/', health_check, name='health_check'),
+    path('posts/<uuid:uid>/likes/', post_like_toggle, name='like-toggle'),
+    path('posts/presigned-url/', post_image_upload_url, name='posts-presigned-url'),
+    path('users/<str:user_uid>/follow/', follow_toggle, name='user-follow-toggle'),
+    path('notifications/devices/', register_device, name='fcm-device-register'),
+]
@@ -39,6 +39,7 @@ DJANGO_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
 ]
 
 PROJECT_APPS = [
@@ -48,6 +49,8 @@ PROJECT_APPS = [
     'snapsapi.apps.likes',
     'snapsapi.apps.notifications',
     'snapsapi.apps.posts',
+    'snapsapi.apps.search',
+    'snapsapi.apps.timelines',
     'snapsapi.apps.users',
 ]
 
@@ -72,6 +75,9 @@ INSTALLED_APPS = DJANGO_APPS + PROJECT_APPS + THIRD_PARTY_APPS
 SITE_ID = 1
 
 MIDDLEWARE = [
+    'snapsapi.apps.core.metrics.MetricsMiddleware',
+    'snapsapi.apps.core.instrumentation.RequestInstrumentationMiddleware',
+    'snapsapi.apps.core.db_routing.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -123,6 +129,72 @@ AUTHENTICATION_BACKENDS = [
 
 WSGI_APPLICATION = 'snapsapi.config.wsgi.application'
 
+# Database connections. local/docker/prod build their PostgreSQL entry with postgres_database().
+# DB_CONN_MAX_AGE: seconds a worker thread keeps its connection open for the following requests, which
+#   saves the TCP/TLS handshake and authentication on every request. 0 opens a connection per request;
+#   gunicorn.conf.py defaults it to 0 for the gevent and uvicorn profiles, where every greenlet or
+#   request thread would otherwise keep a connection of its own.
+# DB_CONN_HEALTH_CHECKS: a reused connection is checked before the first query of a request and
+#   replaced if the server, a failover or a pooler has closed it, instead of failing the request.
+# DB_PGBOUNCER: connect through pgbouncer in transaction pooling mode, where consecutive transactions
+#   may run on different server connections. Server-side cursors (QuerySet.iterator()) are disabled.
+#   Only the POST/PUT/PATCH/DELETE requests of views using AtomicUnsafeMethodsMixin run in one
+#   transaction and so keep all of their queries on one server connection; GETs run in autocommit,
+#   where every query may go to a different one. Session state must not be set outside a transaction,
+#   so the database's timezone has to be UTC (Django then never issues SET TIME ZONE).
+DB_CONN_MAX_AGE = int(os.getenv('SNAPSAPI_DB_CONN_MAX_AGE', 60))
+DB_CONN_HEALTH_CHECKS = os.getenv('SNAPSAPI_DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true'
+DB_PGBOUNCER = os.getenv('SNAPSAPI_DB_PGBOUNCER', 'false').lower() == 'true'
+DB_CONNECT_TIMEOUT = int(os.getenv('SNAPSAPI_DB_CONNECT_TIMEOUT', 5))
+
+
+def postgres_database(**overrides) -> dict:
+    """DATABASES entry for PostgreSQL from the DB_* environment variables and the settings above."""
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'HOST': os.environ.get('DB_HOST'),
+        'PORT': os.environ.get('DB_PORT'),
+        'NAME': os.environ.get('DB_NAME'),
+        'USER': os.environ.get('DB_USER'),
+        'PASSWORD': os.environ.get('DB_PASSWORD'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {
+            'connect_timeout': DB_CONNECT_TIMEOUT,
+            # Shown in pg_stat_activity and in pgbouncer's SHOW CLIENTS.
+            'application_name': 'snapsapi',
+        },
+    }
+    database.update(overrides)
+    return database
+
+
+def postgres_replicas() -> dict:
+    """
+    DATABASES entries (replica_1, replica_2, ...) for the comma separated `host[:port]` list in
+    SNAPSAPI_DB_REPLICA_HOSTS; name and credentials are those of the primary.
+    """
+    replicas = {}
+    hosts = [host.strip() for host in os.getenv('SNAPSAPI_DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+    for number, host in enumerate(hosts, start=1):
+        host, _, port = host.partition(':')
+        replicas[f'replica_{number}'] = postgres_database(
+            HOST=host, PORT=port or os.environ.get('DB_PORT'), TEST={'MIRROR': 'default'},
+        )
+    return replicas
+
+
+# Read replicas (snapsapi.apps.core.db_routing). DATABASE_REPLICAS lists the DATABASES aliases that serve
+# the reads of safe (GET/HEAD/OPTIONS) requests; writes and every other read use `default`.
+# After a successful unsafe request the client reads from the primary for REPLICA_PIN_SECONDS (set it
+# above the replication lag), tracked by the REPLICA_PIN_COOKIE signed cookie and, for JWT clients,
+# by an entry in the REPLICA_PIN_CACHE cache (see below).
+DATABASE_ROUTERS = ['snapsapi.apps.core.db_routing.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = int(os.getenv('SNAPSAPI_REPLICA_PIN_SECONDS', 5))
+REPLICA_PIN_COOKIE = 'snapsapi_primary'
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -236,17 +308,58 @@ REST_AUTH = {
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        # Instrumentation records are already JSON; one record per line.
+        'message': {
+            'format': '%(message)s',
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
         },
+        'instrumentation': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
     },
     'root': {
         'handlers': ['console'],
         'level': 'INFO',
     },
+    'loggers': {
+        'snapsapi.instrumentation': {
+            'handlers': ['instrumentation'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
+# Request instrumentation (snapsapi.apps.core.instrumentation.RequestInstrumentationMiddleware).
+# A sampled request records its queries, DB time, serializer time and response size, logs them as
+# one JSON line (`snapsapi.instrumentation` logger) and, with INSTRUMENTATION_SERVER_TIMING,
+# returns them in a Server-Timing header. 0 disables sampling, 1 samples every request.
+INSTRUMENTATION_SAMPLE_RATE = float(os.getenv('SNAPSAPI_INSTRUMENTATION_SAMPLE_RATE', 0.01))
+INSTRUMENTATION_SERVER_TIMING = os.getenv('SNAPSAPI_INSTRUMENTATION_SERVER_TIMING', 'true').lower() == 'true'
+# Number of slowest statements logged per request.
+INSTRUMENTATION_SLOW_QUERIES = 3
+# Statements with the same fingerprint executed at least this many times are logged as repeated.
+INSTRUMENTATION_REPEATED_QUERY_THRESHOLD = 5
+
+# Prometheus metrics served at /core/metrics/ (snapsapi.apps.core.metrics).
+# METRICS_STORE is a dotted path to a store class:
+# - snapsapi.apps.core.metrics.InMemoryMetricsStore (default, single process)
+# - snapsapi.apps.core.metrics.DirectoryMetricsStore (gunicorn workers; each worker writes its values to
+#   METRICS_MULTIPROCESS_DIR every METRICS_FLUSH_INTERVAL seconds and a scrape sums them)
+METRICS_STORE = os.getenv('SNAPSAPI_METRICS_STORE', 'snapsapi.apps.core.metrics.InMemoryMetricsStore')
+METRICS_MULTIPROCESS_DIR = os.getenv('SNAPSAPI_METRICS_MULTIPROCESS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.getenv('SNAPSAPI_METRICS_FLUSH_INTERVAL', 5))
+# When set, scrapes must send `Authorization: Bearer <METRICS_TOKEN>`.
+METRICS_TOKEN = os.getenv('SNAPSAPI_METRICS_TOKEN')
+# Without METRICS_TOKEN the endpoint is open only when this is on; prod turns it off.
+METRICS_ALLOW_ANONYMOUS = True
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Snaps-API",
     "DESCRIPTION": "A detailed description of Snaps-API",
@@ -307,6 +420,22 @@ AWS_S3_STATIC_BUCKET_NAME = os.getenv('AWS_S3_STATIC_BUCKET_NAME')
 AWS_S3_MEDIA_BUCKET_NAME = os.getenv('AWS_S3_MEDIA_BUCKET_NAME')
 AWS_S3_PRESIGNED_URL_POST_EXPIRATION = 300
 
+# Post image variants (snapsapi.apps.posts.image_variants).
+# Uploaded originals are read from POST_IMAGE_STORAGE and resized WebP copies are written next to them.
+# Images are processed by `python manage.py process_post_images --interval <seconds>`; with
+# POST_IMAGE_PROCESS_ON_COMMIT the web process also processes them right after the post is saved.
+POST_IMAGE_STORAGE = os.getenv('SNAPSAPI_POST_IMAGE_STORAGE', 'snapsapi.apps.posts.image_variants.LocalImageStorage')
+POST_IMAGE_STORAGE_OPTIONS = {'location': os.getenv('SNAPSAPI_POST_IMAGE_ROOT', str(BASE_DIR / 'uploads'))}
+POST_IMAGE_PROCESS_ON_COMMIT = os.getenv('SNAPSAPI_POST_IMAGE_PROCESS_ON_COMMIT', 'false').lower() == 'true'
+# {variant name: longest side in pixels}. Only variants smaller than the original are created.
+POST_IMAGE_VARIANTS = {'thumb': 320, 'small': 640, 'medium': 1080}
+POST_IMAGE_VARIANT_FORMAT = 'WEBP'
+POST_IMAGE_VARIANT_QUALITY = 80
+POST_IMAGE_WORKERS = int(os.getenv('SNAPSAPI_POST_IMAGE_WORKERS', 4))
+POST_IMAGE_BATCH_SIZE = 50
+# Width in pixels of a grid cell; grids use the smallest variant at least this wide.
+POST_IMAGE_GRID_WIDTH = 320
+
 AWS_REGION = os.getenv('AWS_S3_REGION_NAME')
 SOCIALACCOUNT_ADAPTER = 'snapsapi.apps.users.adapters.CustomSocialAccountAdapter'
 
@@ -319,6 +448,101 @@ AWS_S3_REGION_NAME = os.getenv('AWS_S3_REGION_NAME')
 # AWS_S3_CUSTOM_DOMAIN    = 'storage.snaps.show'       # CloudFront 커스텀 도메인
 
 
+# Caches. Process-local memory by default; set SNAPSAPI_REDIS_CACHE_URL to share the cache
+# between processes (Django's RedisCache, requires the `redis` package).
+REDIS_CACHE_URL = os.getenv('SNAPSAPI_REDIS_CACHE_URL')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'snapsapi',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'snapsapi',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Cache alias for the replica pins of JWT clients. A pin in a process-local cache would only be seen
+# by the worker that set it, so without a shared cache requests with a bearer token never read from
+# a replica.
+REPLICA_PIN_CACHE = 'default' if REDIS_CACHE_URL else None
+
+# Cache alias and timeout (seconds) for the viewer-independent post representations
+# (see snapsapi.apps.posts.representation_cache). Edits only invalidate the cache of the process
+# that handled them, so without a shared cache entries are kept for a few seconds only.
+POST_REPRESENTATION_CACHE = 'default'
+POST_REPRESENTATION_CACHE_TIMEOUT = int(os.getenv('SNAPSAPI_POST_REPRESENTATION_CACHE_TIMEOUT',
+                                                  3600 if REDIS_CACHE_URL else 5))
+# Post/author version keys only need to outlive the entries stored under them; an expired
+# version restarts from the current time, so old entries are never read again.
+POST_REPRESENTATION_VERSION_TIMEOUT = 24 * 3600
+
+# Conditional GET (ETag / Last-Modified): seconds a shared cache (nginx proxy_cache) may keep
+# anonymous responses before revalidating them. Authenticated responses are always private.
+CONDITIONAL_GET_SHARED_MAX_AGE = int(os.getenv('SNAPSAPI_CONDITIONAL_GET_SHARED_MAX_AGE', 5))
+
+# Search backend (dotted path). When unset, the backend is chosen from the database vendor:
+# PostgreSQL -> PostgresSearchBackend (tsvector + pg_trgm), others -> SimpleSearchBackend.
+SEARCH_BACKEND = os.getenv('SNAPSAPI_SEARCH_BACKEND')
+
+# Home timelines (fan-out-on-write). TIMELINE_STORE is a dotted path to a store class:
+# - snapsapi.apps.timelines.stores.InMemoryTimelineStore (process-local, the default without
+#   TIMELINE_REDIS_URL; every worker process would keep timelines of its own)
+# - snapsapi.apps.timelines.stores.RedisTimelineStore (the default when TIMELINE_REDIS_URL is set)
+TIMELINE_REDIS_URL = os.getenv('SNAPSAPI_TIMELINE_REDIS_URL')
+TIMELINE_STORE = os.getenv('SNAPSAPI_TIMELINE_STORE', 'snapsapi.apps.timelines.stores.RedisTimelineStore'
+                           if TIMELINE_REDIS_URL else 'snapsapi.apps.timelines.stores.InMemoryTimelineStore')
+TIMELINE_MAX_LENGTH = int(os.getenv('SNAPSAPI_TIMELINE_MAX_LENGTH', 800))
+# Authors with more followers than this are merged into feeds at read time instead of being fanned out.
+TIMELINE_FANOUT_THRESHOLD = int(os.getenv('SNAPSAPI_TIMELINE_FANOUT_THRESHOLD', 10000))
+# Number of recent posts copied into a timeline when a user follows someone.
+TIMELINE_BACKFILL_SIZE = 50
+
+# Denormalized counters (likes/comments/posts/follows).
+# With COUNTERS_WRITE_BEHIND, deltas are buffered in COUNTERS_STORE and applied in batches:
+# the in-memory store is flushed by a background thread every COUNTERS_FLUSH_INTERVAL seconds,
+# the Redis store by `python manage.py flush_counters --interval <seconds>`.
+# reconcile_counters refuses to repair with the in-memory store: the deltas still buffered by the web
+# workers would be applied on top of the recomputed values.
+COUNTERS_WRITE_BEHIND = os.getenv('SNAPSAPI_COUNTERS_WRITE_BEHIND', 'false').lower() == 'true'
+COUNTERS_STORE = os.getenv('SNAPSAPI_COUNTERS_STORE', 'snapsapi.apps.core.counters.InMemoryCounterStore')
+COUNTERS_REDIS_URL = os.getenv('SNAPSAPI_COUNTERS_REDIS_URL', 'redis://localhost:6379/0')
+COUNTERS_SHARDS = 16
+COUNTERS_FLUSH_INTERVAL = float(os.getenv('SNAPSAPI_COUNTERS_FLUSH_INTERVAL', 5))
+# Seconds a Redis store flush may hold its cross-process lock (and others wait for it).
+COUNTERS_FLUSH_LOCK_TIMEOUT = 60
+
+# Comment threads: nesting depth embedded in comment responses and replies embedded per comment.
+# Deeper or additional replies are loaded through /comments/<uid>/replies/.
+COMMENT_TREE_MAX_DEPTH = 3
+COMMENT_TREE_REPLIES_PER_NODE = 10
+
+# Notification outbox. Rows are sent by `python manage.py send_notifications --interval <seconds>`;
+# with NOTIFICATION_OUTBOX_EAGER_DISPATCH the web process also sends them right after commit.
+NOTIFICATION_OUTBOX_EAGER_DISPATCH = os.getenv('SNAPSAPI_NOTIFICATION_OUTBOX_EAGER_DISPATCH', 'false').lower() == 'true'
+NOTIFICATION_OUTBOX_BATCH_SIZE = int(os.getenv('SNAPSAPI_NOTIFICATION_OUTBOX_BATCH_SIZE', 100))
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 5
+# Retry backoff in seconds: base * 2 ** (attempts - 1), capped at the max delay.
+NOTIFICATION_OUTBOX_RETRY_BASE_DELAY = 30
+NOTIFICATION_OUTBOX_RETRY_MAX_DELAY = 3600
+# Rows claimed by a worker that died are claimed again after this many seconds.
+NOTIFICATION_OUTBOX_LEASE_TIMEOUT = 300
+# Events with the same coalesce key (e.g. comments on one post) are merged into one push:
+# sent COALESCE_WINDOW seconds after the last event, at most COALESCE_MAX_DELAY seconds after the first.
+NOTIFICATION_COALESCE_WINDOW = int(os.getenv('SNAPSAPI_NOTIFICATION_COALESCE_WINDOW', 30))
+NOTIFICATION_COALESCE_MAX_DELAY = int(os.getenv('SNAPSAPI_NOTIFICATION_COALESCE_MAX_DELAY', 300))
+# Cache alias and timeout (seconds) for each user's active FCM device tokens. The web process
+# invalidates them and the send_notifications worker reads them, so they are only cached in a
+# cache shared between processes; None reads them from the database for every push.
+NOTIFICATION_DEVICE_TOKEN_CACHE = 'default' if REDIS_CACHE_URL else None
+NOTIFICATION_DEVICE_TOKEN_CACHE_TIMEOUT = 300
+
 # Firebase configure
 FIREBASE_CREDENTIALS = {
     "type": os.environ.get("FIREBASE_TYPE"),
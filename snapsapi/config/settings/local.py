@@ -64,13 +64,13 @@ MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/media/"
 STATICFILES_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 
+REPLICA_DATABASES = postgres_replicas()
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'HOST': os.environ.get('DB_HOST'),
-        'PORT': os.environ.get('DB_PORT'),
-        'NAME': os.environ.get('DB_NAME'),
-        'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASSWORD'),
-    }
+    'default': postgres_database(),
+    **REPLICA_DATABASES,
 }
+DATABASE_REPLICAS = list(REPLICA_DATABASES)
+
+# Post image variants are read from and written to the media bucket.
+POST_IMAGE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+POST_IMAGE_STORAGE_OPTIONS = {'bucket_name': AWS_S3_MEDIA_BUCKET_NAME, 'file_overwrite': True}
@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 ALLOWED_HOSTS = ['*']
@@ -30,13 +32,23 @@ MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/media/"
 STATICFILES_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 
+REPLICA_DATABASES = postgres_replicas()
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'HOST': os.environ.get('DB_HOST'),
-        'PORT': os.environ.get('DB_PORT'),
-        'NAME': os.environ.get('DB_NAME'),
-        'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASSWORD'),
-    }
+    'default': postgres_database(),
+    **REPLICA_DATABASES,
 }
+DATABASE_REPLICAS = list(REPLICA_DATABASES)
+
+# Post image variants are read from and written to the media bucket.
+POST_IMAGE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+POST_IMAGE_STORAGE_OPTIONS = {'bucket_name': AWS_S3_MEDIA_BUCKET_NAME, 'file_overwrite': True}
+
+# Server-Timing would tell every client the query count and DB time of sampled responses.
+INSTRUMENTATION_SERVER_TIMING = os.getenv('SNAPSAPI_INSTRUMENTATION_SERVER_TIMING', 'false').lower() == 'true'
+
+# /core/metrics/ is reachable through nginx, so it answers 403 unless SNAPSAPI_METRICS_TOKEN is set.
+METRICS_ALLOW_ANONYMOUS = False
+
+# Under several gunicorn workers a process-local store gives each worker its own home timelines.
+if TIMELINE_STORE == 'snapsapi.apps.timelines.stores.InMemoryTimelineStore':
+    raise ImproperlyConfigured('Set SNAPSAPI_TIMELINE_REDIS_URL (or a shared SNAPSAPI_TIMELINE_STORE) in production.')
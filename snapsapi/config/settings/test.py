@@ -17,7 +17,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # 읽기 복제본 라우팅 테스트용 별칭. DATABASE_REPLICAS는 해당 테스트에서만 켠다.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 # TEST_RUNNER = django.test.runner.DiscoverRunner
 
@@ -32,3 +38,6 @@ CACHES = {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
 }
+
+# 요청 계측은 테스트에서 필요한 경우에만 켠다.
+INSTRUMENTATION_SAMPLE_RATE = 0
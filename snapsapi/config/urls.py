@@ -41,6 +41,9 @@ urlpatterns = [
     path('users/', include('snapsapi.apps.users.urls')),
     path('users/', include('allauth.urls')),
     path('notifications/', include('snapsapi.apps.notifications.urls')),
+    path('search/', include('snapsapi.apps.search.urls')),
+    path('feed/', include('snapsapi.apps.timelines.urls')),
+    path('async/', include('snapsapi.config.async_urls')),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/docs/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
@@ -1,9 +1,17 @@
+import base64
+import hashlib
+import hmac
+import json
 import logging
+import re
+import threading
+from typing import Iterable
+
 import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, NoCredentialsError
 from django.conf import settings
 import uuid
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 import os
 
 
@@ -23,6 +31,155 @@ def build_user_profile_image_object_name(user_uid: str, file_name: str) -> str:
     return f"media/users/user_{user_uid}/{uuid.uuid4()}.{ext}"
 
 
+class S3PostPolicySigner:
+    """
+    Signs S3 browser-upload (POST) policies with AWS Signature Version 4, entirely offline.
+
+    Produces the same fields as `boto3.client('s3').generate_presigned_post`, but derives the
+    SigV4 signing key once per batch and then only needs one HMAC per object key, so a request
+    with many files is signed in a single pass without any client or network setup.
+    `clock` can be replaced to sign with a fixed time (tests).
+    """
+    algorithm = 'AWS4-HMAC-SHA256'
+    service = 's3'
+    # Bucket names botocore addresses virtual-hosted style; for the others (dots, upper case,
+    # underscores, ...) it switches to region-specific path-style URLs, which are not mirrored here.
+    virtual_host_bucket_pattern = re.compile(r'^[a-z0-9][a-z0-9-]{1,61}[a-z0-9]$')
+
+    def __init__(self, access_key: str, secret_key: str, region: str, session_token: str | None = None,
+                 clock=None):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.session_token = session_token
+        self.clock = clock or (lambda: datetime.now(UTC))
+
+    def get_signing_key(self, date_stamp: str) -> bytes:
+        key = ('AWS4' + self.secret_key).encode('utf-8')
+        for part in (date_stamp, self.region, self.service, 'aws4_request'):
+            key = hmac.new(key, part.encode('utf-8'), hashlib.sha256).digest()
+        return key
+
+    def get_bucket_url(self, bucket_name: str) -> str:
+        # Same virtual-hosted URL botocore returns for DNS compatible bucket names.
+        if not self.virtual_host_bucket_pattern.match(bucket_name):
+            raise ValueError(f'Bucket name {bucket_name!r} cannot be addressed virtual-hosted style.')
+        return f"https://{bucket_name}.s3.amazonaws.com/"
+
+    def sign_many(self, bucket_name: str, object_names: Iterable[str], fields: dict | None = None,
+                  conditions: list | None = None, expiration: int = 3600) -> list[dict]:
+        """
+        :param bucket_name: Target bucket
+        :param object_names: Object keys to sign (a key ending in '${filename}' allows any file name)
+        :param fields: Prefilled form fields shared by every upload
+        :param conditions: Extra policy conditions shared by every upload
+        :param expiration: Seconds the upload forms stay valid
+        :return: One {'url': ..., 'fields': {...}} dictionary per object key, in order
+        """
+        now = self.clock()
+        timestamp = now.strftime('%Y%m%dT%H%M%SZ')
+        date_stamp = now.strftime('%Y%m%d')
+        credential = f"{self.access_key}/{date_stamp}/{self.region}/{self.service}/aws4_request"
+        signing_key = self.get_signing_key(date_stamp)
+        expires_at = (now + timedelta(seconds=expiration)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        url = self.get_bucket_url(bucket_name)
+
+        signed_fields = [
+            ('x-amz-algorithm', self.algorithm),
+            ('x-amz-credential', credential),
+            ('x-amz-date', timestamp),
+        ]
+        if self.session_token is not None:
+            signed_fields.append(('x-amz-security-token', self.session_token))
+
+        results = []
+        for object_name in object_names:
+            if object_name.endswith('${filename}'):
+                key_condition = ['starts-with', '$key', object_name[:-len('${filename}')]]
+            else:
+                key_condition = {'key': object_name}
+            policy = {
+                'expiration': expires_at,
+                'conditions': [
+                    *(conditions or []),
+                    {'bucket': bucket_name},
+                    key_condition,
+                    *({name: value} for name, value in signed_fields),
+                ],
+            }
+            encoded_policy = base64.b64encode(json.dumps(policy).encode('utf-8')).decode('utf-8')
+            signature = hmac.new(signing_key, encoded_policy.encode('utf-8'), hashlib.sha256).hexdigest()
+            results.append({
+                'url': url,
+                'fields': {
+                    **(fields or {}),
+                    'key': object_name,
+                    **dict(signed_fields),
+                    'policy': encoded_policy,
+                    'x-amz-signature': signature,
+                },
+            })
+        return results
+
+
+_session_lock = threading.Lock()
+_session_cache = {}
+
+
+def get_boto3_session() -> boto3.session.Session:
+    """
+    Returns the process-wide boto3 session for the configured credentials, created on first use.
+    boto3 sessions are not thread-safe to create concurrently, so creation is serialized.
+    """
+    key = (settings.AWS_ACCESS_KEY_ID, settings.AWS_REGION)
+    session = _session_cache.get(key)
+    if session is None:
+        with _session_lock:
+            session = _session_cache.get(key)
+            if session is None:
+                session = boto3.session.Session(
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_REGION,
+                )
+                _session_cache[key] = session
+    return session
+
+
+def get_post_policy_signer() -> S3PostPolicySigner:
+    """
+    Returns an offline POST policy signer for the current credentials.
+    Refreshable credentials (e.g. an instance role) are refreshed by botocore when needed.
+    """
+    session = get_boto3_session()
+    credentials = session.get_credentials()
+    if credentials is None:
+        raise NoCredentialsError()
+    frozen = credentials.get_frozen_credentials()
+    return S3PostPolicySigner(frozen.access_key, frozen.secret_key, session.region_name, frozen.token)
+
+
+def create_presigned_posts(
+        bucket_name: str, object_names: Iterable[str], fields=None, conditions=None, expiration=3600
+) -> list[dict] | None:
+    """Generate presigned S3 POST requests for many objects in one pass
+
+    :param bucket_name: string
+    :param object_names: Object keys to upload
+    :param fields: Dictionary of prefilled form fields
+    :param conditions: List of conditions to include in the policy
+    :param expiration: Time in seconds for the presigned URLs to remain valid
+    :return: List of dictionaries (url, fields), in the order of object_names
+    :return: None if error.
+    """
+    try:
+        signer = get_post_policy_signer()
+    except BotoCoreError as e:
+        logging.error(e)
+        return None
+    return signer.sign_many(bucket_name, object_names, fields=fields, conditions=conditions, expiration=expiration)
+
+
 # https://boto3.amazonaws.com/v1/documentation/api/latest/guide/s3-presigned-urls.html
 def create_presigned_post(
         bucket_name: str, object_name: str, fields=None, conditions=None, expiration=3600
@@ -39,25 +196,5 @@ def create_presigned_post(
         fields: Dictionary of form fields and values to submit with the POST
     :return: None if error.
     """
-
-    # Generate a presigned S3 POST URL
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION,
-    )
-    try:
-        response = s3_client.generate_presigned_post(
-            bucket_name,
-            object_name,
-            Fields=fields,
-            Conditions=conditions,
-            ExpiresIn=expiration,
-        )
-    except ClientError as e:
-        logging.error(e)
-        return None
-
-    # The response contains the presigned URL and required fields
-    return response
+    results = create_presigned_posts(bucket_name, [object_name], fields, conditions, expiration)
+    return results[0] if results else None
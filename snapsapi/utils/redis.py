@@ -0,0 +1,25 @@
+import threading
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_redis_client(url: str):
+    """
+    Returns a shared redis client for the given URL.
+    The `redis` package is optional and only imported when a Redis-backed store is configured.
+    :param url: Redis connection URL (e.g. redis://localhost:6379/0)
+    """
+    client = _clients.get(url)
+    if client is not None:
+        return client
+
+    try:
+        import redis
+    except ImportError as e:
+        raise ImportError("The 'redis' package is required for Redis-backed stores. Install it with `pip install redis`.") from e
+
+    with _lock:
+        if url not in _clients:
+            _clients[url] = redis.Redis.from_url(url)
+        return _clients[url]